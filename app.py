@@ -6,24 +6,24 @@ A sophisticated RAG system providing spiritual guidance through Krishna's teachi
 
 import streamlit as st
 from pathlib import Path
+import os
 import sys
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.query_handler import QueryHandler
-from src.core.embedding_manager import EmbeddingManager
-from src.core.data_processor import DataProcessor
+from src.core.conversation_context import ConversationContext
+from src.core.gemini_client import get_usage, reset_usage
+from src.core.telemetry import configure_telemetry
 from src.ui.base_components import load_css, render_header
 from src.features.feature_registry import FeatureRegistry
-from src.features.export_handler import ExportHandler
-from src.features.chapter_navigator import ChapterNavigator
-from src.features.conversational_memory import ConversationalMemory
-from src.features.voice_handler import VoiceHandler
-from config.settings import APP_TITLE, APP_ICON, LANGUAGES, RESPONSE_TONES, SEARCH_MODES
-import tempfile
-from pathlib import Path
-import os
+from src.features.message_store import MessageStore
+from config.settings import (
+    APP_TITLE, APP_ICON, LANGUAGES, RESPONSE_TONES, SEARCH_MODES,
+    CHAT_HISTORY_TURNS, CHAT_HISTORY_PAGE_TURNS
+)
+import uuid
 
 
 # Page configuration
@@ -37,38 +37,94 @@ st.set_page_config(
 # Load custom CSS
 load_css()
 
+# Record traces and metrics when TELEMETRY_ENABLED is set (once per process)
+configure_telemetry()
+
 
 
 def initialize_session_state():
     """Initialize session state variables."""
     if 'messages' not in st.session_state:
-        st.session_state.messages = []
+        # Bounded in memory; older turns spill to a per-session segment
+        st.session_state.messages = MessageStore()
+    
+    if 'history_turns' not in st.session_state:
+        st.session_state.history_turns = CHAT_HISTORY_TURNS
+    
+    if 'rendered_messages' not in st.session_state:
+        st.session_state.rendered_messages = 0
+    
+    if 'user_id' not in st.session_state:
+        # Keep the id in the URL so a reload reopens the same journey
+        user_id = st.query_params.get('uid')
+        if not user_id:
+            user_id = uuid.uuid4().hex
+            st.query_params['uid'] = user_id
+        st.session_state.user_id = user_id
     
     if 'query_handler' not in st.session_state:
-        st.session_state.query_handler = QueryHandler()
+        # One pipeline (Gemini client, ChromaDB collection) for every session
+        st.session_state.query_handler = QueryHandler.shared()
     
     if 'embedding_manager' not in st.session_state:
         # Use ChromaDB to load pushed embeddings from GitHub
-        st.session_state.embedding_manager = EmbeddingManager()
-        st.session_state.embedding_manager.initialize_collection()
-    
-    if 'data_processor' not in st.session_state:
-        st.session_state.data_processor = DataProcessor()
+        st.session_state.embedding_manager = st.session_state.query_handler.context_engineer.embedding_manager
     
     if 'feature_registry' not in st.session_state:
         st.session_state.feature_registry = FeatureRegistry()
     
-    if 'export_handler' not in st.session_state:
-        st.session_state.export_handler = ExportHandler()
+    # Feature modules (and their heavy dependencies) are imported only
+    # when enabled; disabled features stay None. Export, voice and the
+    # chapter navigator wait for first use (see get_feature)
+    registry = st.session_state.feature_registry
     
-    if 'chapter_navigator' not in st.session_state:
-        st.session_state.chapter_navigator = ChapterNavigator(st.session_state.data_processor)
+    if 'request_profiler' not in st.session_state:
+        # Wraps the shared pipeline once; nothing is installed when disabled
+        RequestProfiler = registry.load('profiling')
+        st.session_state.request_profiler = RequestProfiler(
+            registry.get_config('profiling').get('settings', {})
+        ).install(st.session_state.query_handler) if RequestProfiler else None
+    
+    if 'cache_warmer' not in st.session_state:
+        # Started once per process, by the first session
+        CacheWarmer = registry.load('cache_warming')
+        st.session_state.cache_warmer = CacheWarmer.for_handler(
+            st.session_state.query_handler,
+            registry.get_config('cache_warming').get('settings', {})
+        ) if CacheWarmer else None
+    
+    if 'export_jobs' not in st.session_state:
+        st.session_state.export_jobs = {}
     
     if 'memory' not in st.session_state:
-        st.session_state.memory = ConversationalMemory()
+        ConversationalMemory = registry.load('conversational_memory')
+        if ConversationalMemory:
+            memory_settings = registry.get_config('conversational_memory').get('settings', {})
+            st.session_state.memory = ConversationalMemory.for_user(
+                st.session_state.user_id,
+                max_conversations=memory_settings.get('max_queries_stored')
+            )
+        else:
+            st.session_state.memory = None
     
-    if 'voice_handler' not in st.session_state:
-        st.session_state.voice_handler = VoiceHandler()
+    if 'conversation_index' not in st.session_state:
+        ConversationIndex = registry.load('conversation_index')
+        st.session_state.conversation_index = ConversationIndex(
+            st.session_state.memory,
+            st.session_state.query_handler.gemini_client
+        ) if ConversationIndex else None
+    
+    if 'conversation_context' not in st.session_state:
+        st.session_state.conversation_context = ConversationContext(
+            st.session_state.query_handler.gemini_client
+        )
+        if st.session_state.feature_registry.is_enabled('conversational_memory'):
+            st.session_state.conversation_context.seed([
+                (conv['query'], conv['response'])
+                for conv in st.session_state.memory.get_recent_conversations(
+                    st.session_state.conversation_context.recent_turns
+                )
+            ])
     
     if 'tone' not in st.session_state:
         st.session_state.tone = 'modern'
@@ -86,8 +142,74 @@ def initialize_session_state():
         st.session_state.enable_voice = False
 
 
-def render_sidebar():
-    """Render sidebar with controls."""
+def _new_chapter_navigator(ChapterNavigator):
+    """Create the chapter navigator over the verse CSV."""
+    from src.core.data_processor import DataProcessor
+    return ChapterNavigator(DataProcessor())
+
+
+# Features created per session on first use: session key and factory
+SESSION_FEATURES = {
+    'export': ('export_handler', lambda ExportHandler: ExportHandler()),
+    'voice': ('voice_handler', lambda VoiceHandler: VoiceHandler()),
+    'chapter_navigator': ('chapter_navigator', _new_chapter_navigator)
+}
+
+
+def get_feature(feature_name: str):
+    """
+    Get this session's instance of a feature, creating it on first use.
+    
+    Importing a feature pulls in its dependencies (reportlab and
+    python-docx for export, TTS backends for voice), so nothing is loaded
+    until a page actually needs it.
+    
+    Args:
+        feature_name: Key of SESSION_FEATURES
+        
+    Returns:
+        The feature instance, or None if the feature is disabled
+    """
+    session_key, create = SESSION_FEATURES[feature_name]
+    if session_key not in st.session_state:
+        feature_class = st.session_state.feature_registry.load(feature_name)
+        st.session_state[session_key] = create(feature_class) if feature_class else None
+    return st.session_state[session_key]
+
+
+def current_count(name: str) -> int:
+    """Get a session count: 'questions' or a journey summary key."""
+    if name == 'questions':
+        return len(st.session_state.messages) // 2
+    return st.session_state.memory.get_journey_summary()[name]
+
+
+def count_metric(name: str, label: str):
+    """
+    Show a count in a placeholder that refresh_counts can update.
+    
+    Args:
+        name: Count to show (see current_count)
+        label: Metric label
+    """
+    placeholder = st.empty()
+    st.session_state.count_placeholders.append((placeholder, name, label))
+    placeholder.metric(label, current_count(name))
+
+
+def refresh_counts():
+    """Update every count shown in this run, e.g. after the live chat added a turn."""
+    for placeholder, name, label in st.session_state.count_placeholders:
+        placeholder.metric(label, current_count(name))
+
+
+def render_sidebar(stats: dict):
+    """
+    Render sidebar with controls.
+    
+    Args:
+        stats: Collection statistics (see EmbeddingManager.get_stats)
+    """
     with st.sidebar:
         st.title(f"{APP_ICON} Drishti AI")
         st.markdown("*Divine Wisdom from Bhagavad Gita*")
@@ -131,10 +253,28 @@ def render_sidebar():
         st.markdown("---")
         
         # Stats
-        stats = st.session_state.embedding_manager.get_stats()
         st.subheader("📊 Statistics")
         st.metric("Total Verses", stats['total_verses'])
-        st.metric("Questions Asked", len(st.session_state.messages) // 2)
+        count_metric('questions', "Questions Asked")
+        
+        if st.session_state.cache_warmer is not None:
+            warmup = st.session_state.cache_warmer.progress()
+            if warmup['status'] in ('mining', 'warming'):
+                st.progress(
+                    warmup['done'] / warmup['total'] if warmup['total'] else 0.0,
+                    text=f"🔥 Warming caches: {warmup['done']}/{warmup['total']} frequent questions"
+                )
+            elif warmup['status'] == 'done' and warmup['total']:
+                st.caption(f"🔥 Caches warmed with {warmup['done']} frequent questions")
+        
+        # Verse of the day, shown only when precomputed (no API call here)
+        answer_cache = st.session_state.query_handler.answer_cache
+        daily = answer_cache.get_daily()
+        if daily:
+            answer = answer_cache.get(daily['query'], st.session_state.tone, st.session_state.language, 'gita')
+            if answer:
+                with st.expander(f"🌅 Verse of the Day: {daily['verse_id']}"):
+                    st.markdown(answer)
         
         st.markdown("---")
         
@@ -151,10 +291,16 @@ def render_sidebar():
         if st.session_state.feature_registry.is_enabled('conversational_memory'):
             st.markdown("---")
             st.subheader("🌟 Your Journey")
-            journey = st.session_state.memory.get_journey_summary()
-            st.metric("Conversations", journey['total_conversations'])
-            st.metric("Themes Explored", journey['themes_explored'])
-            st.metric("Favorites", journey['favorite_verses'])
+            count_metric('total_conversations', "Conversations")
+            count_metric('themes_explored', "Themes Explored")
+            count_metric('favorite_verses', "Favorites")
+        
+        # Import cost of each feature loaded so far in this process
+        import_profile = st.session_state.feature_registry.import_profile()
+        if import_profile:
+            with st.expander("⏱️ Feature Load Times"):
+                for feature_name, seconds in sorted(import_profile.items(), key=lambda item: -item[1]):
+                    st.caption(f"{feature_name}: {seconds * 1000:.0f} ms")
         
         # About
         with st.expander("ℹ️ About Drishti AI"):
@@ -174,21 +320,70 @@ def render_sidebar():
             """)
 
 
+def render_message(message: dict, voice_enabled: bool = False):
+    """Render one chat message, with an audio player for answers."""
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+        
+        # Voice output for assistant messages
+        if message["role"] == "assistant" and voice_enabled:
+            get_feature('voice').render_audio_player(
+                message["content"],
+                st.session_state.language
+            )
+
+
+def show_earlier_messages():
+    """Expand the chat history by one page."""
+    st.session_state.history_turns += CHAT_HISTORY_PAGE_TURNS
+
+
 def render_chat():
     """Render chat interface."""
-    # Display chat messages
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-            
-            # Voice output for assistant messages
-            if (message["role"] == "assistant" and 
-                st.session_state.enable_voice and 
-                st.session_state.feature_registry.is_enabled('voice')):
-                st.session_state.voice_handler.render_audio_player(
-                    message["content"],
-                    st.session_state.language
-                )
+    voice_enabled = (st.session_state.enable_voice and
+                     st.session_state.feature_registry.is_enabled('voice'))
+    
+    messages = st.session_state.messages
+    total = len(messages)
+    visible = min(total, st.session_state.history_turns * 2)
+    window_start = total - visible
+    
+    # Older pages are only rendered on request
+    if window_start > 0:
+        st.button(
+            f"⬆️ Show earlier messages ({window_start // 2} more questions)",
+            on_click=show_earlier_messages,
+            use_container_width=True
+        )
+    
+    # Display chat messages; audio only for the recent window
+    recent_start = total - min(total, CHAT_HISTORY_TURNS * 2)
+    for i, message in enumerate(messages[window_start:], start=window_start):
+        render_message(message, voice_enabled and i >= recent_start)
+    
+    # Messages added from here on belong to the live fragment
+    st.session_state.rendered_messages = total
+    render_live_chat()
+
+
+@st.fragment
+def render_live_chat():
+    """
+    Render the chat input and the answers given since the last full run.
+    
+    Runs as a fragment, so asking a question reruns only this part of the
+    page instead of repainting the whole history. Counts shown elsewhere
+    are updated through their placeholders.
+    """
+    voice_enabled = (st.session_state.enable_voice and
+                     st.session_state.feature_registry.is_enabled('voice'))
+    
+    # Drop audio prefetched by a run that was interrupted before playing it
+    if st.session_state.get('voice_handler') is not None:
+        st.session_state.voice_handler.cancel_pending()
+    
+    for message in st.session_state.messages[st.session_state.rendered_messages:]:
+        render_message(message, voice_enabled)
     
     # Chat input
     if prompt := st.chat_input("🎤 Ask Krishna for divine wisdom..."):
@@ -197,76 +392,152 @@ def render_chat():
         with st.chat_message("user"):
             st.markdown(prompt)
         
+        memory_enabled = st.session_state.feature_registry.is_enabled('conversational_memory')
+        # Earlier turns, including ones seeded from past sessions
+        history = st.session_state.conversation_context.render()
+        # Only questions after one asked in this session depend on earlier turns
+        follow_up = st.session_state.conversation_context.turns_asked > 0
+        
         # Generate response
         with st.chat_message("assistant"):
             with st.spinner("🕉️ Krishna is contemplating..."):
-                response = st.session_state.query_handler.process_query(
-                    query=prompt,
-                    tone=st.session_state.tone,
-                    language=st.session_state.language,
-                    search_mode=st.session_state.search_mode
-                )
+                # Count API errors of this turn; GeminiClient reports them in the text
+                reset_usage()
+                
+                # Serve a previous answer to the same question if there is one;
+                # mid-conversation the same words can mean something else
+                response = None
+                if memory_enabled and not follow_up:
+                    response = st.session_state.conversation_index.find_answer(
+                        prompt,
+                        tone=st.session_state.tone,
+                        language=st.session_state.language,
+                        search_mode=st.session_state.search_mode
+                    )
+                    if response:
+                        st.caption("🌟 Recalled from your earlier conversation")
+                
+                if response is None:
+                    response = st.session_state.query_handler.process_query(
+                        query=prompt,
+                        tone=st.session_state.tone,
+                        language=st.session_state.language,
+                        search_mode=st.session_state.search_mode,
+                        history=history,
+                        follow_up=follow_up
+                    )
+                
+                # Start speech while the text renders
+                if voice_enabled:
+                    get_feature('voice').prefetch(response, st.session_state.language)
+                
                 st.markdown(response)
                 
                 # Voice output
-                if (st.session_state.enable_voice and 
-                    st.session_state.feature_registry.is_enabled('voice')):
-                    st.session_state.voice_handler.render_audio_player(
+                if voice_enabled:
+                    get_feature('voice').render_audio_player(
                         response,
                         st.session_state.language
                     )
         
         # Add assistant message
         st.session_state.messages.append({"role": "assistant", "content": response})
+        st.session_state.conversation_context.add_turn(prompt, response)
         
         # Save to memory
-        if st.session_state.feature_registry.is_enabled('conversational_memory'):
-            st.session_state.memory.add_conversation(prompt, response)
+        if memory_enabled:
+            ordinal = st.session_state.memory.add_conversation(prompt, response, metadata={
+                'tone': st.session_state.tone,
+                'language': st.session_state.language,
+                'search_mode': st.session_state.search_mode,
+                'follow_up': follow_up,
+                'error': get_usage()['errors'] > 0
+            })
+            st.session_state.conversation_index.add(ordinal, prompt)
+        
+        # The sidebar and Journey counts live outside this fragment
+        refresh_counts()
     
-    # Export button
+    render_export()
+
+
+def render_export():
+    """Render export buttons."""
     if st.session_state.messages and st.session_state.feature_registry.is_enabled('export'):
         st.markdown("---")
         col1, col2 = st.columns(2)
         
         with col1:
             if st.button("📄 Export to PDF", use_container_width=True):
-                # Combine all messages
-                content = "\n\n".join([
-                    f"**{m['role'].title()}:** {m['content']}" 
-                    for m in st.session_state.messages
-                ])
-                
-                # Export
-                temp_file = Path(tempfile.gettempdir()) / "drishti_conversation.pdf"
-                st.session_state.export_handler.export_to_pdf(content, str(temp_file))
-                
-                with open(temp_file, 'rb') as f:
-                    st.download_button(
-                        "⬇️ Download PDF",
-                        f.read(),
-                        file_name="drishti_conversation.pdf",
-                        mime="application/pdf"
-                    )
+                # Built in the background; unchanged conversations come from cache
+                st.session_state.export_jobs['pdf'] = get_feature('export').submit(
+                    st.session_state.messages, 'pdf'
+                )
         
         with col2:
             if st.button("📝 Export to DOCX", use_container_width=True):
-                # Combine all messages
-                content = "\n\n".join([
-                    f"**{m['role'].title()}:** {m['content']}" 
-                    for m in st.session_state.messages
-                ])
-                
-                # Export
-                temp_file = Path(tempfile.gettempdir()) / "drishti_conversation.docx"
-                st.session_state.export_handler.export_to_docx(content, str(temp_file))
-                
-                with open(temp_file, 'rb') as f:
-                    st.download_button(
-                        "⬇️ Download DOCX",
-                        f.read(),
-                        file_name="drishti_conversation.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                    )
+                st.session_state.export_jobs['docx'] = get_feature('export').submit(
+                    st.session_state.messages, 'docx'
+                )
+        
+        pending = False
+        for fmt, key in list(st.session_state.export_jobs.items()):
+            try:
+                pending = pending or get_feature('export').get_export(key) is None
+            except KeyError:
+                # Evicted after newer exports; ask again to rebuild it
+                del st.session_state.export_jobs[fmt]
+            except Exception as e:
+                st.error(f"{fmt.upper()} export failed: {e}")
+                del st.session_state.export_jobs[fmt]
+        
+        # Poll only while a build is running
+        if st.session_state.export_jobs:
+            st.fragment(render_export_downloads, run_every=1.0 if pending else None)()
+
+
+def render_export_downloads():
+    """Render download buttons for finished exports."""
+    export_handler = get_feature('export')
+    labels = {'pdf': "⬇️ Download PDF", 'docx': "⬇️ Download DOCX"}
+    
+    still_pending = False
+    for fmt, key in list(st.session_state.export_jobs.items()):
+        try:
+            path = export_handler.get_export(key)
+        except KeyError:
+            del st.session_state.export_jobs[fmt]
+            continue
+        except Exception as e:
+            st.error(f"{fmt.upper()} export failed: {e}")
+            del st.session_state.export_jobs[fmt]
+            continue
+        
+        if path is None:
+            still_pending = True
+            st.caption(f"⏳ Preparing {fmt.upper()}...")
+            continue
+        
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Deleted by eviction since the build finished
+            del st.session_state.export_jobs[fmt]
+            continue
+        st.download_button(
+            labels[fmt],
+            data,
+            file_name=f"drishti_conversation.{fmt}",
+            mime=export_handler.FORMATS[fmt],
+            key=f"download_{fmt}"
+        )
+    
+    # Stop polling once every build has finished
+    if st.session_state.get('export_polling') and not still_pending:
+        st.session_state.export_polling = False
+        st.rerun()
+    st.session_state.export_polling = still_pending
 
 
 def main():
@@ -274,20 +545,30 @@ def main():
     # Initialize
     initialize_session_state()
     
+    # Count placeholders drawn by this run (see count_metric)
+    st.session_state.count_placeholders = []
+    
+    # Collection statistics are cached process-wide; read them once per rerun
+    stats = st.session_state.embedding_manager.get_stats()
+    
     # Render sidebar
-    render_sidebar()
+    render_sidebar(stats)
     
     # Main content - use custom header
     render_header()
     
-    # Check if embeddings exist
-    stats = st.session_state.embedding_manager.get_stats()
-    if stats['total_verses'] == 0:
+    # Check the embeddings (verified once per process, not on every rerun)
+    readiness = st.session_state.embedding_manager.readiness()
+    if not readiness['ready']:
         st.error("⚠️ **Embeddings not loaded!**")
         st.write("The embeddings should be automatically available from the repository.")
         st.write("If you see this message, there may be an issue with the deployment.")
         
         with st.expander("🔍 Troubleshooting"):
+            st.write("**Problems found:**")
+            for problem in readiness['problems']:
+                st.write(f"- {problem}")
+            st.write("")
             st.write("**Possible issues:**")
             st.write("1. ChromaDB files not properly deployed from GitHub")
             st.write("2. File permissions issue on Streamlit Cloud")
@@ -297,7 +578,6 @@ def main():
             st.write(f"**Collection:** `{stats.get('collection_name', 'unknown')}`")
             
             # Check if chromadb folder exists
-            import os
             chromadb_exists = os.path.exists('chromadb_storage')
             st.write(f"**ChromaDB folder exists:** `{chromadb_exists}`")
             
@@ -328,6 +608,7 @@ def main():
         with tab_objects[1]:
             st.subheader("📖 Explore Bhagavad Gita")
             
+            chapter_navigator = get_feature('chapter_navigator')
             view_mode = st.radio(
                 "Browse by:",
                 ["Chapters", "Themes"],
@@ -335,31 +616,29 @@ def main():
             )
             
             if view_mode == "Chapters":
-                st.session_state.chapter_navigator.render_chapter_grid()
+                chapter_navigator.render_chapter_grid()
                 
                 # Show chapter detail if selected
                 if 'selected_chapter' in st.session_state:
-                    st.session_state.chapter_navigator.render_verse_browser(
+                    chapter_navigator.render_verse_browser(
                         st.session_state.selected_chapter
                     )
             else:
-                st.session_state.chapter_navigator.render_theme_view()
+                chapter_navigator.render_theme_view()
     
     # Journey tab
     if st.session_state.feature_registry.is_enabled('conversational_memory') and len(tab_objects) > 2:
         with tab_objects[-1]:
             st.subheader("🌟 Your Spiritual Journey")
             
-            journey = st.session_state.memory.get_journey_summary()
-            
             # Stats
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Total Conversations", journey['total_conversations'])
+                count_metric('total_conversations', "Total Conversations")
             with col2:
-                st.metric("Themes Explored", journey['themes_explored'])
+                count_metric('themes_explored', "Themes Explored")
             with col3:
-                st.metric("Favorite Verses", journey['favorite_verses'])
+                count_metric('favorite_verses', "Favorite Verses")
             
             # Recent conversations
             st.markdown("### Recent Conversations")
@@ -370,6 +649,22 @@ def main():
                     st.markdown(f"**Response:** {conv['response'][:200]}...")
                     st.caption(f"Time: {conv['timestamp']}")
             
+            # Search past conversations
+            st.markdown("### 🔍 Search Your Conversations")
+            search_query = st.text_input(
+                "What did Krishna tell you about...",
+                key='journey_search'
+            )
+            if search_query:
+                matches = st.session_state.conversation_index.search(search_query, top_k=5)
+                if not matches:
+                    st.info("No matching conversations yet")
+                for conv in matches:
+                    with st.expander(f"Q: {conv['query'][:50]}... ({conv['score']:.0%} match)"):
+                        st.markdown(f"**Query:** {conv['query']}")
+                        st.markdown(f"**Response:** {conv['response']}")
+                        st.caption(f"Time: {conv['timestamp']}")
+            
             # Favorite verses
             favorites = st.session_state.memory.get_favorite_verses()
             if favorites:
@@ -0,0 +1,272 @@
+"""
+Measure retrieval quality against latency for retrieval variants.
+
+Runs every combination of backend (ChromaDB or in-memory), k, hybrid
+retrieval (dense plus BM25 keyword search, fused by reciprocal rank) and
+query-embedding cache (cold or warm) over a labeled question set, and
+reports recall@k, MRR, retrieval latency and prompt size for each.
+    python -m benchmarks.eval_retrieval                    # real embeddings from chromadb_storage
+    python -m benchmarks.eval_retrieval --client fake      # offline, lexical stand-in embeddings
+    python -m benchmarks.eval_retrieval --k 3 5 10 --output eval.json
+    
+Labels are JSON Lines of {"query": ..., "relevant": ["2.47", ...]} and refer
+to verse ids of the real CSV.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import CHROMADB_PATH, DATA_DIR, TOP_K_RESULTS
+from benchmarks.fake_gemini import estimate_tokens
+from benchmarks.run_benchmarks import percentile
+
+
+LABELS_PATH = Path(__file__).parent / 'data' / 'retrieval_eval.jsonl'
+
+# Candidates taken from each retriever before fusion
+HYBRID_DEPTH = 20
+# Standard reciprocal rank fusion constant
+RRF_K = 60
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def load_labels(path: Path) -> List[Dict]:
+    """Read labeled questions."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class KeywordIndex:
+    """Okapi BM25 over verse documents."""
+    
+    def __init__(self, ids: List[str], documents: List[str], metadatas: List[Dict], k1: float = 1.5, b: float = 0.75):
+        """
+        Build index.
+        
+        Args:
+            ids: Verse ids
+            documents: Verse texts
+            metadatas: Verse metadata, returned with results
+            k1: Term frequency saturation
+            b: Length normalization
+        """
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.k1 = k1
+        self.b = b
+        
+        self.term_counts = [Counter(TOKEN_PATTERN.findall(doc.lower())) for doc in documents]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.avg_length = sum(self.lengths) / max(len(self.lengths), 1)
+        
+        self.postings: Dict[str, List[int]] = {}
+        for i, counts in enumerate(self.term_counts):
+            for term in counts:
+                self.postings.setdefault(term, []).append(i)
+        n = len(documents)
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+    
+    def search(self, query: str, top_k: int = 10) -> List[Dict]:
+        """Rank verses by BM25 score, in the embedding managers' result format."""
+        scores: Dict[int, float] = {}
+        for term in set(TOKEN_PATTERN.findall(query.lower())):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i in self.postings[term]:
+                tf = self.term_counts[i][term]
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / self.avg_length)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:top_k]
+        return [
+            {'id': self.ids[i], 'text': self.documents[i], 'metadata': self.metadatas[i], 'distance': -score}
+            for i, score in ranked
+        ]
+
+
+def reciprocal_rank_fusion(rankings: List[List[Dict]], top_k: int) -> List[Dict]:
+    """Merge ranked result lists by summed 1 / (RRF_K + rank)."""
+    scores: Dict[str, float] = {}
+    results: Dict[str, Dict] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            scores[result['id']] = scores.get(result['id'], 0.0) + 1.0 / (RRF_K + rank)
+            results.setdefault(result['id'], result)
+    best = sorted(scores, key=lambda verse_id: -scores[verse_id])[:top_k]
+    return [results[verse_id] for verse_id in best]
+
+
+def load_backends(client, csv_path: Path, chromadb_path: Path, build: bool) -> Dict:
+    """
+    Open both embedding managers over the same stored embeddings.
+    
+    The in-memory manager is filled from the Chroma collection, so both
+    backends rank identical vectors and verses are embedded at most once.
+    """
+    from src.core.data_processor import DataProcessor
+    from src.core.embedding_manager import EmbeddingManager
+    from src.core.inmemory_embedding_manager import InMemoryEmbeddingManager
+    
+    chroma = EmbeddingManager(
+        gemini_client=client,
+        chromadb_path=chromadb_path,
+        data_processor=DataProcessor(csv_path)
+    )
+    chroma.initialize_collection()
+    if chroma.collection.count() == 0:
+        if not build:
+            raise SystemExit(f"No embeddings in {chromadb_path}. Run `python setup.py` first.")
+        print(f"Embedding {csv_path.name} with the fake client...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            chroma.create_embeddings()
+    
+    stored = chroma.collection.get(include=['embeddings', 'documents', 'metadatas'])
+    memory = InMemoryEmbeddingManager(gemini_client=client)
+    memory.embeddings_data = {
+        'ids': list(stored['ids']),
+        'embeddings': list(stored['embeddings']),
+        'documents': list(stored['documents']),
+        'metadatas': list(stored['metadatas'])
+    }
+    keyword = KeywordIndex(stored['ids'], stored['documents'], stored['metadatas'])
+    return {'chroma': chroma, 'memory': memory}, keyword
+
+
+def evaluate(manager, keyword: KeywordIndex, labels: List[Dict], k: int, hybrid: bool, cached: bool, context_engineer) -> Dict:
+    """
+    Run one retrieval variant over the labeled set.
+    
+    Returns:
+        recall@k, MRR, retrieval latency and prompt size
+    """
+    from config.prompts import create_query_prompt
+    from src.core.gemini_client import clear_query_embedding_cache
+    
+    def retrieve(query: str) -> List[Dict]:
+        if not hybrid:
+            return manager.search(query, top_k=k)
+        depth = max(k, HYBRID_DEPTH)
+        return reciprocal_rank_fusion([manager.search(query, top_k=depth), keyword.search(query, depth)], k)
+    
+    recalls, reciprocal_ranks, latencies, prompt_tokens = [], [], [], []
+    for item in labels:
+        clear_query_embedding_cache()
+        if cached:
+            retrieve(item['query'])
+        
+        start = time.perf_counter()
+        results = retrieve(item['query'])
+        latencies.append((time.perf_counter() - start) * 1000)
+        
+        relevant = set(item['relevant'])
+        retrieved = [result['id'] for result in results]
+        recalls.append(len(relevant.intersection(retrieved)) / len(relevant))
+        rank = next((i for i, verse_id in enumerate(retrieved, start=1) if verse_id in relevant), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+        
+        context = context_engineer.format_context(results)
+        prompt_tokens.append(estimate_tokens(create_query_prompt(item['query'], context, 'modern', 'english')))
+    
+    return {
+        'recall': round(sum(recalls) / len(recalls), 4),
+        'mrr': round(sum(reciprocal_ranks) / len(reciprocal_ranks), 4),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'prompt_tokens': round(sum(prompt_tokens) / len(prompt_tokens))
+    }
+
+
+def main():
+    """Run the evaluation."""
+    parser = argparse.ArgumentParser(description="Retrieval quality vs latency for retrieval variants")
+    parser.add_argument('--labels', type=Path, default=LABELS_PATH, help="Labeled questions (.jsonl)")
+    parser.add_argument('--client', choices=['gemini', 'fake'], default='gemini',
+                        help="Real Gemini embeddings, or the offline fake (lexical, for plumbing checks)")
+    parser.add_argument('--csv', type=Path, default=DATA_DIR / 'bhagavad_gita.csv', help="Verses for the fake client")
+    parser.add_argument('--chromadb', type=Path, help="Embeddings to evaluate (default: CHROMADB_PATH; a temp dir with --client fake)")
+    parser.add_argument('--backends', nargs='+', default=['chroma', 'memory'], choices=['chroma', 'memory'])
+    parser.add_argument('--k', nargs='+', type=int, default=sorted({3, 5, TOP_K_RESULTS}))
+    parser.add_argument('--embed-latency', type=float, default=0.05,
+                        help="Fake seconds per query embedding, so cache variants are realistic")
+    parser.add_argument('--output', type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🕉️  Drishti AI - Retrieval Evaluation")
+    print("=" * 60)
+    print()
+    
+    labels = load_labels(args.labels)
+    with tempfile.TemporaryDirectory(prefix='drishti_eval_') as workdir:
+        if args.client == 'fake':
+            from benchmarks.fake_gemini import FakeGeminiClient
+            if not args.csv.exists():
+                raise SystemExit(f"CSV not found: {args.csv}")
+            client = FakeGeminiClient(cache_queries=True)
+            chromadb_path = args.chromadb or Path(workdir)
+        else:
+            from src.core.gemini_client import GeminiClient
+            client = GeminiClient()
+            chromadb_path = args.chromadb or Path(CHROMADB_PATH)
+        
+        from src.core.context_engineer import ContextEngineer
+        backends, keyword = load_backends(client, args.csv, chromadb_path, build=(args.client == 'fake'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            context_engineer = ContextEngineer(gemini_client=client, embedding_manager=backends['chroma'])
+        if args.client == 'fake':
+            # Indexing ran at full speed; queries pay a realistic embedding latency
+            client.embed_latency = args.embed_latency
+        
+        print(f"{len(labels)} labeled questions, {len(keyword.ids)} verses, {args.client} embeddings")
+        print()
+        print(f"{'backend':8s} {'k':>3s} {'hybrid':>7s} {'cache':>6s} {'recall@k':>9s} {'MRR':>6s} "
+              f"{'p50 ms':>8s} {'p95 ms':>8s} {'tokens':>7s}")
+        
+        rows = []
+        for backend, k, hybrid, cached in product(args.backends, sorted(args.k), [False, True], [False, True]):
+            metrics = evaluate(backends[backend], keyword, labels, k, hybrid, cached, context_engineer)
+            rows.append({'backend': backend, 'k': k, 'hybrid': hybrid, 'cache': cached, **metrics})
+            print(f"{backend:8s} {k:3d} {'yes' if hybrid else 'no':>7s} {'warm' if cached else 'cold':>6s} "
+                  f"{metrics['recall']:9.3f} {metrics['mrr']:6.3f} {metrics['p50_ms']:8.2f} "
+                  f"{metrics['p95_ms']:8.2f} {metrics['prompt_tokens']:7d}")
+    
+    print()
+    print("Prompt tokens are estimated at four characters per token.")
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'client': args.client,
+                'labels': str(args.labels),
+                'questions': len(labels)
+            },
+            'results': rows
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
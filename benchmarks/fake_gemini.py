@@ -0,0 +1,200 @@
+"""
+Deterministic offline stand-in for GeminiClient.
+
+Embeddings are hashed bags of words: every word maps to a fixed random
+vector (seeded), and a text embeds as the normalized sum of its words, so
+texts that share words are close and results are stable across runs.
+Latency, generation throughput and 429 errors are configurable.
+"""
+
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+# Cache and lock are read through the module, so benchmarks can swap in instrumented locks
+from src.core import gemini_client
+from src.core.gemini_client import _record_usage, _wait_for_quota, normalize_query
+from src.core.telemetry import record_cache
+
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Error text returned for an injected 429, as GeminiClient formats API errors
+QUOTA_ERROR = "429 Resource has been exhausted (e.g. check quota)."
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class FakeGeminiClient:
+    """
+    Drop-in replacement for GeminiClient that never touches the network.
+    
+    Implements create_embedding, create_query_embedding, generate and
+    generate_stream with the same return conventions (empty embedding or
+    an apology text on failure) and records usage like the real client.
+    """
+    
+    def __init__(
+        self,
+        dimension: int = 768,
+        seed: int = 0,
+        embed_latency: float = 0.0,
+        generate_latency: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+        output_tokens: int = 300,
+        error_rate: float = 0.0,
+        rate_limited: bool = False,
+        cache_queries: bool = False
+    ):
+        """
+        Initialize fake client.
+        
+        Args:
+            dimension: Embedding size
+            seed: Seed for word vectors, generated text and injected errors
+            embed_latency: Seconds per embedding call
+            generate_latency: Seconds before the first generated token
+            tokens_per_second: Generation throughput (None generates instantly)
+            output_tokens: Approximate length of each generated answer
+            error_rate: Fraction of calls failing with a 429
+            rate_limited: Wait on the shared Gemini rate limiter like the real client
+            cache_queries: Cache query embeddings in the real client's shared cache
+        """
+        self.dimension = dimension
+        self.seed = seed
+        self.embed_latency = embed_latency
+        self.generate_latency = generate_latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.rate_limited = rate_limited
+        self.cache_queries = cache_queries
+        
+        self._word_vectors: Dict[str, np.ndarray] = {}
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self.stats = {'embed_calls': 0, 'generate_calls': 0, 'errors': 0}
+    
+    # Helpers
+    
+    def _word_vector(self, word: str) -> np.ndarray:
+        """Fixed random vector for a word."""
+        vector = self._word_vectors.get(word)
+        if vector is None:
+            rng = np.random.default_rng([self.seed, zlib.crc32(word.encode('utf-8'))])
+            vector = rng.standard_normal(self.dimension)
+            self._word_vectors[word] = vector
+        return vector
+    
+    def _call(self, kind: str) -> bool:
+        """
+        Account for one API call.
+        
+        Returns:
+            False if this call should fail with an injected 429
+        """
+        if self.rate_limited:
+            _wait_for_quota(kind)
+        with self._lock:
+            self.stats[f'{kind}_calls'] += 1
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.stats['errors'] += 1
+        if failed:
+            _record_usage(error=True, kind=kind)
+        return not failed
+    
+    def embed(self, text: str) -> List[float]:
+        """Hashed bag-of-words embedding, without latency or accounting."""
+        vector = np.zeros(self.dimension)
+        for word in WORD_PATTERN.findall(text.lower()):
+            vector += self._word_vector(word)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            vector[0] = 1.0
+            norm = 1.0
+        return (vector / norm).tolist()
+    
+    def _answer_chunks(self, prompt: str, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """Deterministic answer text for a prompt, paced by tokens_per_second."""
+        if self.generate_latency:
+            time.sleep(self.generate_latency)
+        
+        words = WORD_PATTERN.findall(prompt.lower())[-200:] or ['dharma']
+        rng = np.random.default_rng([self.seed, zlib.crc32(prompt.encode('utf-8'))])
+        count = max(1, int(self.output_tokens * 0.75))
+        words = [words[i] for i in rng.integers(0, len(words), count)]
+        
+        output_tokens = 0
+        for i in range(0, len(words), 20):
+            chunk = " ".join(words[i:i + 20]) + " "
+            tokens = estimate_tokens(chunk)
+            if max_tokens and output_tokens + tokens > max_tokens:
+                break
+            output_tokens += tokens
+            if self.tokens_per_second:
+                time.sleep(tokens / self.tokens_per_second)
+            yield chunk
+        
+        _record_usage(SimpleNamespace(
+            prompt_token_count=estimate_tokens(prompt),
+            candidates_token_count=output_tokens
+        ))
+    
+    # GeminiClient interface
+    
+    def create_embedding(self, text: str) -> List[float]:
+        """Create a document embedding."""
+        if not self._call('embed'):
+            return []
+        if self.embed_latency:
+            time.sleep(self.embed_latency)
+        # Like the real client, embeddings report no token usage
+        _record_usage(kind='embed')
+        return self.embed(text)
+    
+    def create_query_embedding(self, query: str) -> List[float]:
+        """Create a query embedding, cached only when cache_queries is set."""
+        if not self.cache_queries:
+            return self.create_embedding(query)
+        
+        cache_key = normalize_query(query)
+        with gemini_client._query_embedding_lock:
+            cached = gemini_client._query_embedding_cache.get(cache_key)
+        record_cache('query_embedding', cached is not None)
+        if cached is not None:
+            return cached
+        
+        embedding = self.create_embedding(query)
+        if embedding:
+            with gemini_client._query_embedding_lock:
+                gemini_client._query_embedding_cache[cache_key] = embedding
+        return embedding
+    
+    def generate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Generate a deterministic answer."""
+        if not self._call('generate'):
+            return f"I apologize, but I encountered an error: {QUOTA_ERROR}"
+        return "".join(self._answer_chunks(prompt, max_tokens))
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """Generate a deterministic answer in chunks."""
+        if not self._call('generate'):
+            yield f"Error: {QUOTA_ERROR}"
+            return
+        yield from self._answer_chunks(prompt)
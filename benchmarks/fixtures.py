@@ -0,0 +1,137 @@
+"""
+Synthetic corpus and offline pipelines for benchmarks.
+
+The real CSV is not needed: write_synthetic_csv produces a file in the
+same format (18 chapters by default), whose English text draws on a small
+Gita vocabulary so that searches have meaningful neighbours.
+"""
+
+import csv
+import random
+from pathlib import Path
+from typing import Dict, List
+
+
+# Vocabulary for synthetic translations
+THEMES = [
+    'duty', 'action', 'fear', 'mind', 'self', 'soul', 'devotion', 'knowledge',
+    'desire', 'anger', 'peace', 'yoga', 'wisdom', 'attachment', 'fruit', 'karma',
+    'dharma', 'death', 'body', 'eternal', 'surrender', 'meditation', 'senses',
+    'ignorance', 'faith', 'sacrifice', 'detachment', 'grief', 'battle', 'equanimity'
+]
+FILLER = ['the', 'one', 'who', 'is', 'of', 'in', 'and', 'to', 'without', 'with', 'always', 'never']
+SANSKRIT = ['धर्मक्षेत्रे कुरुक्षेत्रे', 'कर्मण्येवाधिकारस्ते', 'योगस्थः कुरु कर्माणि', 'सर्वधर्मान्परित्यज्य']
+HINDI = ['कर्म करो', 'मन को शांत रखो', 'आत्मा अमर है', 'भक्ति से मुक्ति']
+
+# Queries used by search and pipeline benchmarks
+BENCHMARK_QUERIES = [
+    "How do I overcome fear of failure?",
+    "What is my duty when action feels pointless?",
+    "How can I control anger and desire?",
+    "What happens to the soul after death?",
+    "How do I find peace of mind through meditation?",
+    "What does detachment from the fruit of action mean?",
+    "How should I deal with grief?",
+    "What is the path of devotion and surrender?"
+]
+
+# A sample conversation for export benchmarks
+SAMPLE_REPLY = (
+    "Dear seeker, as I told Arjuna in Bhagavad Gita 2.47, you have a right to "
+    "your actions but never to their fruits. Act with steady mind, O Partha. "
+)
+
+
+def write_synthetic_csv(
+    path: Path,
+    chapters: int = 18,
+    verses_per_chapter: int = 40,
+    seed: int = 0
+) -> Path:
+    """
+    Write a CSV in the format of data/bhagavad_gita.csv.
+    
+    Args:
+        path: Output file
+        chapters: Number of chapters
+        verses_per_chapter: Verses in each chapter
+        seed: Random seed for the text
+        
+    Returns:
+        Path of the CSV
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            'verse_number', 'verse_in_sanskrit', 'verse_in_hindi', 'verse_in_english',
+            'translation_in_hindi', 'translation_in_english'
+        ])
+        for chapter in range(1, chapters + 1):
+            for verse in range(1, verses_per_chapter + 1):
+                themes = rng.sample(THEMES, 3)
+                words = [rng.choice(themes if rng.random() < 0.4 else FILLER) for _ in range(rng.randint(20, 40))]
+                writer.writerow([
+                    f"Chapter {chapter}, Verse {verse}",
+                    rng.choice(SANSKRIT),
+                    rng.choice(HINDI),
+                    f"{' '.join(themes)} yoga",
+                    rng.choice(HINDI),
+                    " ".join(words).capitalize() + "."
+                ])
+    return path
+
+
+def sample_messages(turns: int = 20) -> List[Dict]:
+    """A conversation of alternating user and assistant messages."""
+    messages = []
+    for i in range(turns):
+        messages.append({'role': 'user', 'content': BENCHMARK_QUERIES[i % len(BENCHMARK_QUERIES)]})
+        messages.append({'role': 'assistant', 'content': SAMPLE_REPLY * 6})
+    return messages
+
+
+def build_pipeline(
+    gemini_client,
+    csv_path: Path,
+    storage_dir: Path = None,
+    in_memory: bool = False
+):
+    """
+    Build a QueryHandler over a CSV, with embeddings from gemini_client.
+    
+    Args:
+        gemini_client: Real or fake Gemini client
+        csv_path: Verses to index
+        storage_dir: ChromaDB directory (required unless in_memory)
+        in_memory: Use InMemoryEmbeddingManager instead of ChromaDB
+        
+    Returns:
+        QueryHandler with its embeddings created
+    """
+    from src.core.answer_cache import AnswerCache
+    from src.core.context_engineer import ContextEngineer
+    from src.core.data_processor import DataProcessor
+    from src.core.query_handler import QueryHandler
+    
+    processor = DataProcessor(csv_path)
+    if in_memory:
+        from src.core.inmemory_embedding_manager import InMemoryEmbeddingManager
+        manager = InMemoryEmbeddingManager(gemini_client=gemini_client, data_processor=processor)
+    else:
+        from src.core.embedding_manager import EmbeddingManager
+        manager = EmbeddingManager(
+            gemini_client=gemini_client,
+            chromadb_path=storage_dir,
+            data_processor=processor
+        )
+    manager.initialize_collection()
+    manager.create_embeddings()
+    
+    context_engineer = ContextEngineer(gemini_client=gemini_client, embedding_manager=manager)
+    # An empty answer cache, so every query runs the pipeline
+    answer_cache = AnswerCache(cache_path=Path(csv_path).with_name('answer_cache.json'))
+    return QueryHandler(context_engineer=context_engineer, gemini_client=gemini_client, answer_cache=answer_cache)
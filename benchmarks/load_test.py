@@ -0,0 +1,403 @@
+"""
+Load-test one instance with many concurrent sessions.
+
+Each simulated seeker runs a realistic query mix through the shared
+QueryHandler, with its own ConversationContext and ConversationalMemory
+log, exactly as app.py wires a Streamlit session. Gemini is replaced by
+FakeGeminiClient with API-like latency. Every concurrency level reports
+throughput, tail latency, error rate and contention on the shared locks;
+together the levels form a saturation curve.
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --sessions 1 4 16 64 --duration 20 --output load.json
+    python -m benchmarks.load_test --shared-memory --rate-limited
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_gemini import FakeGeminiClient
+from benchmarks.fixtures import BENCHMARK_QUERIES, build_pipeline, write_synthetic_csv
+from benchmarks.run_benchmarks import percentile
+
+
+# (weight, search mode, query) kinds of traffic
+QUERY_MIX = [
+    (70, 'gita', None),             # Fresh question from BENCHMARK_QUERIES
+    (10, 'gita', 'repeat'),         # Same question again (query-embedding cache hit)
+    (10, 'universal', None),        # Universal mode, no retrieval
+    (10, 'gita', 'off_topic')       # Caught by guardrails, no API call
+]
+OFF_TOPIC_QUERIES = ["What's the weather tomorrow?", "Tell me a joke", "Which stocks should I buy?"]
+ERROR_PREFIXES = ("I apologize, but I encountered an error", "Error:")
+
+
+class InstrumentedLock:
+    """
+    Lock wrapper that counts contended acquisitions and time spent waiting.
+    
+    An acquisition is contended when a non-blocking attempt fails; only
+    then is the blocking wait timed. Works for Lock, RLock and FileLock.
+    """
+    
+    def __init__(self, name: str, lock):
+        """
+        Wrap a lock.
+        
+        Args:
+            name: Name in the report
+            lock: Lock to wrap
+        """
+        self.name = name
+        self._lock = lock
+        self._stats_lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Clear the counters."""
+        with self._stats_lock:
+            self.acquisitions = 0
+            self.contended = 0
+            self.wait_seconds = 0.0
+            self.max_wait = 0.0
+    
+    def _try_acquire(self) -> bool:
+        try:
+            return bool(self._lock.acquire(blocking=False))
+        except Exception:
+            # FileLock raises Timeout instead of returning False
+            return False
+    
+    def acquire(self, blocking: bool = True, timeout: float = -1):
+        """Acquire, recording any wait."""
+        if self._try_acquire():
+            with self._stats_lock:
+                self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        
+        start = time.perf_counter()
+        acquired = self._lock.acquire() if timeout == -1 else self._lock.acquire(timeout=timeout)
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self.acquisitions += 1
+            self.contended += 1
+            self.wait_seconds += waited
+            self.max_wait = max(self.max_wait, waited)
+        return acquired
+    
+    def release(self):
+        """Release the wrapped lock."""
+        self._lock.release()
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+    
+    def report(self) -> Dict:
+        """Counters since the last reset."""
+        with self._stats_lock:
+            return {
+                'acquisitions': self.acquisitions,
+                'contended': self.contended,
+                'contended_pct': round(100 * self.contended / max(self.acquisitions, 1), 2),
+                'wait_ms': round(self.wait_seconds * 1000, 2),
+                'max_wait_ms': round(self.max_wait * 1000, 3)
+            }
+
+
+class LockPool:
+    """Instrumented locks grouped by name (e.g. one per memory instance)."""
+    
+    def __init__(self):
+        self.locks: Dict[str, List[InstrumentedLock]] = {}
+    
+    def wrap(self, name: str, lock) -> InstrumentedLock:
+        """Wrap a lock, or return it unchanged if already wrapped."""
+        if isinstance(lock, InstrumentedLock):
+            return lock
+        wrapped = InstrumentedLock(name, lock)
+        self.locks.setdefault(name, []).append(wrapped)
+        return wrapped
+    
+    def reset(self):
+        for locks in self.locks.values():
+            for lock in locks:
+                lock.reset()
+    
+    def report(self) -> Dict:
+        """Counters summed per lock name."""
+        report = {}
+        for name, locks in self.locks.items():
+            reports = [lock.report() for lock in locks]
+            acquisitions = sum(r['acquisitions'] for r in reports)
+            contended = sum(r['contended'] for r in reports)
+            report[name] = {
+                'acquisitions': acquisitions,
+                'contended': contended,
+                'contended_pct': round(100 * contended / max(acquisitions, 1), 2),
+                'wait_ms': round(sum(r['wait_ms'] for r in reports), 2),
+                'max_wait_ms': max((r['max_wait_ms'] for r in reports), default=0.0)
+            }
+        return report
+
+
+def instrument_shared_locks(pool: LockPool, fake: FakeGeminiClient):
+    """Swap process-wide locks for instrumented ones."""
+    from src.core import gemini_client
+    from src.core.rate_limiter import get_rate_limiter
+    
+    gemini_client._query_embedding_lock = pool.wrap('query_embedding_cache', gemini_client._query_embedding_lock)
+    fake._lock = pool.wrap('gemini_client', fake._lock)
+    for kind in ('embed', 'generate'):
+        bucket = get_rate_limiter(kind)
+        if bucket is not None:
+            bucket._lock = pool.wrap(f'rate_limiter.{kind}', bucket._lock)
+
+
+class TimedCall:
+    """Record the latency of a wrapped callable (e.g. Chroma's collection.query)."""
+    
+    def __init__(self, func):
+        self.func = func
+        self.samples: List[float] = []
+        self._lock = threading.Lock()
+    
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.samples.append(elapsed)
+    
+    def drain(self) -> List[float]:
+        with self._lock:
+            samples, self.samples = self.samples, []
+        return samples
+
+
+def run_session(session_id: int, query_handler, fake, memory, deadline: float, args, results: List, results_lock):
+    """One seeker: ask questions until the deadline, like a Streamlit session."""
+    from src.core.conversation_context import ConversationContext
+    
+    rng = random.Random(args.seed * 10007 + session_id)
+    context = ConversationContext(gemini_client=fake)
+    weights = [weight for weight, _, _ in QUERY_MIX]
+    last_query = BENCHMARK_QUERIES[session_id % len(BENCHMARK_QUERIES)]
+    
+    while time.perf_counter() < deadline:
+        _, search_mode, kind = rng.choices(QUERY_MIX, weights)[0]
+        if kind == 'repeat':
+            query = last_query
+        elif kind == 'off_topic':
+            query = rng.choice(OFF_TOPIC_QUERIES)
+        else:
+            query = rng.choice(BENCHMARK_QUERIES)
+        stream = rng.random() < args.stream_fraction
+        
+        start = time.perf_counter()
+        error = None
+        try:
+            response = query_handler.process_query(
+                query=query, search_mode=search_mode, stream=stream, history=context.render()
+            )
+            if stream:
+                response = "".join(response)
+            if response.startswith(ERROR_PREFIXES):
+                error = 'api'
+        except Exception as e:
+            response = ''
+            error = type(e).__name__
+        answered = time.perf_counter()
+        
+        memory.add_conversation(query, response, {'search_mode': search_mode})
+        context.add_turn(query, response)
+        finished = time.perf_counter()
+        
+        with results_lock:
+            results.append({
+                'latency_ms': (answered - start) * 1000,
+                'memory_ms': (finished - answered) * 1000,
+                'error': error
+            })
+        last_query = query
+        if args.think_time:
+            time.sleep(rng.expovariate(1 / args.think_time))
+    
+    context._executor.shutdown(wait=False)
+
+
+def run_level(sessions: int, query_handler, fake, pool: LockPool, chroma_query: TimedCall, workdir: Path, args) -> Dict:
+    """Run one concurrency level and summarize it."""
+    from src.features.conversational_memory import ConversationalMemory
+    
+    memory_dir = workdir / f'memory_{sessions}'
+    if args.shared_memory:
+        shared = ConversationalMemory(memory_dir / 'shared.jsonl')
+        memories = [shared] * sessions
+    else:
+        memories = [ConversationalMemory(memory_dir / f'session_{i}.jsonl') for i in range(sessions)]
+    for memory in {id(m): m for m in memories}.values():
+        memory._lock = pool.wrap('memory.thread_lock', memory._lock)
+        memory._file_lock = pool.wrap('memory.file_lock', memory._file_lock)
+    
+    pool.reset()
+    chroma_query.drain()
+    results: List[Dict] = []
+    results_lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(i, query_handler, fake, memories[i], deadline, args, results, results_lock),
+            name=f'session-{i}'
+        )
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    latencies = [r['latency_ms'] for r in results] or [0.0]
+    memory_latencies = [r['memory_ms'] for r in results] or [0.0]
+    chroma = chroma_query.drain() or [0.0]
+    errors = sum(1 for r in results if r['error'])
+    return {
+        'sessions': sessions,
+        'queries': len(results),
+        'seconds': round(elapsed, 2),
+        'throughput_qps': round(len(results) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'error_pct': round(100 * errors / max(len(results), 1), 2),
+        'memory_write_p95_ms': round(percentile(memory_latencies, 95), 2),
+        'chroma_query_p50_ms': round(percentile(chroma, 50), 2),
+        'chroma_query_p95_ms': round(percentile(chroma, 95), 2),
+        'locks': pool.report()
+    }
+
+
+def print_curve(levels: List[Dict]):
+    """Print throughput against sessions, marking where scaling stops."""
+    peak = max(level['throughput_qps'] for level in levels) or 1.0
+    print()
+    print("Saturation curve (throughput by concurrent sessions)")
+    previous = None
+    for level in levels:
+        bar = '█' * max(1, int(40 * level['throughput_qps'] / peak))
+        note = ''
+        if previous and level['sessions'] > previous['sessions']:
+            ideal = previous['throughput_qps'] * level['sessions'] / previous['sessions']
+            efficiency = level['throughput_qps'] / max(ideal, 1e-9)
+            if efficiency < 0.5:
+                note = f"  ← saturated ({efficiency:.0%} of linear scaling)"
+        print(f"  {level['sessions']:4d} │{bar} {level['throughput_qps']:.1f} q/s{note}")
+        previous = level
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description="Concurrent-session load test on the fake Gemini client")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Mean seconds between a session's questions")
+    parser.add_argument('--stream-fraction', type=float, default=0.5, help="Fraction of queries streamed")
+    parser.add_argument('--shared-memory', action='store_true', help="All sessions write one memory log (one user)")
+    parser.add_argument('--in-memory', action='store_true', help="Use InMemoryEmbeddingManager instead of ChromaDB")
+    parser.add_argument('--rate-limited', action='store_true', help="Apply GEMINI_RATE_LIMITS to fake calls")
+    parser.add_argument('--embed-latency', type=float, default=0.05)
+    parser.add_argument('--generate-latency', type=float, default=0.3, help="Fake seconds to first token")
+    parser.add_argument('--tokens-per-second', type=float, default=400.0)
+    parser.add_argument('--error-rate', type=float, default=0.01, help="Fraction of fake calls failing with 429")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🕉️  Drishti AI - Load Test (offline)")
+    print("=" * 60)
+    print()
+    
+    fake = FakeGeminiClient(seed=args.seed, rate_limited=args.rate_limited, cache_queries=True)
+    pool = LockPool()
+    levels = []
+    with tempfile.TemporaryDirectory(prefix='drishti_load_') as workdir:
+        workdir = Path(workdir)
+        csv_path = write_synthetic_csv(workdir / 'verses.csv', seed=args.seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            query_handler = build_pipeline(fake, csv_path, workdir / 'chroma', in_memory=args.in_memory)
+        
+        # API-like behaviour only once the index is built
+        fake.embed_latency = args.embed_latency
+        fake.generate_latency = args.generate_latency
+        fake.tokens_per_second = args.tokens_per_second
+        fake.error_rate = args.error_rate
+        instrument_shared_locks(pool, fake)
+        
+        manager = query_handler.context_engineer.embedding_manager
+        chroma_query = TimedCall(manager.collection.query if not args.in_memory else manager.search)
+        if args.in_memory:
+            manager.search = chroma_query
+        else:
+            manager.collection.query = chroma_query
+        
+        print(f"{'sessions':>8s} {'queries':>8s} {'q/s':>7s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} "
+              f"{'errors':>7s} {'search p95':>11s}  most contended lock")
+        for sessions in args.sessions:
+            level = run_level(sessions, query_handler, fake, pool, chroma_query, workdir, args)
+            levels.append(level)
+            
+            locks = sorted(level['locks'].items(), key=lambda item: -item[1]['wait_ms'])
+            hot = next(((name, stats) for name, stats in locks if stats['contended']), None)
+            hot_text = f"{hot[0]} ({hot[1]['contended_pct']:.1f}%, {hot[1]['wait_ms']:.0f} ms waited)" if hot else "none"
+            print(f"{sessions:8d} {level['queries']:8d} {level['throughput_qps']:7.1f} {level['p50_ms']:8.0f} "
+                  f"{level['p95_ms']:8.0f} {level['p99_ms']:8.0f} {level['error_pct']:6.1f}% "
+                  f"{level['chroma_query_p95_ms']:9.1f}ms  {hot_text}")
+    
+    print_curve(levels)
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'duration': args.duration,
+                'shared_memory': args.shared_memory,
+                'in_memory': args.in_memory,
+                'rate_limited': args.rate_limited,
+                'fake_client': {
+                    'embed_latency': args.embed_latency,
+                    'generate_latency': args.generate_latency,
+                    'tokens_per_second': args.tokens_per_second,
+                    'error_rate': args.error_rate
+                }
+            },
+            'levels': levels
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nResults: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Benchmark the Drishti AI pipeline offline.
+
+Every case runs against a synthetic corpus and FakeGeminiClient, so no API
+key or network is needed and numbers are comparable between runs. Results
+are written as JSON; pass a previous result as --baseline to flag
+regressions (exit code 1 when any case's median slows past --threshold).
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_gemini import FakeGeminiClient
+from benchmarks.fixtures import BENCHMARK_QUERIES, build_pipeline, sample_messages, write_synthetic_csv
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def measure(func: Callable, repeat: int, warmup: int = 1, before: Callable = None) -> Dict:
+    """
+    Time a callable.
+    
+    Pipeline prints are silenced while timing, so console speed does not
+    skew the numbers. ``func`` receives the iteration number; ``before``,
+    if given, runs untimed ahead of every call (e.g. to clear caches).
+    
+    Returns:
+        Summary in milliseconds
+    """
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(warmup):
+            if before:
+                before()
+            func(i)
+        for i in range(repeat):
+            if before:
+                before()
+            start = time.perf_counter()
+            func(i)
+            samples.append((time.perf_counter() - start) * 1000)
+    
+    return {
+        'n': len(samples),
+        'min_ms': round(min(samples), 3),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'max_ms': round(max(samples), 3)
+    }
+
+
+def run_benchmarks(args, workdir: Path) -> Dict:
+    """Run every case, returning {case name: timings}."""
+    from src.core.data_processor import DataProcessor
+    from src.core.gemini_client import clear_query_embedding_cache
+    from src.features.export_handler import ExportHandler, message_lines
+    
+    fake = FakeGeminiClient(
+        seed=args.seed,
+        embed_latency=args.embed_latency,
+        generate_latency=args.generate_latency,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate
+    )
+    csv_path = write_synthetic_csv(workdir / 'verses.csv', args.chapters, args.verses, seed=args.seed)
+    query = lambda i: BENCHMARK_QUERIES[i % len(BENCHMARK_QUERIES)]
+    results = {}
+    
+    def run(name: str, func: Callable, repeat: int = args.repeat, warmup: int = 1, before: Callable = None):
+        print(f"  {name:32s}", end=" ", flush=True)
+        results[name] = measure(func, repeat, warmup, before)
+        print(f"p50 {results[name]['p50_ms']:9.3f} ms   p95 {results[name]['p95_ms']:9.3f} ms")
+    
+    # Data loading
+    run('data.load_csv', lambda i: DataProcessor(csv_path).load_csv())
+    processor = DataProcessor(csv_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.load_csv()
+    run('data.process_for_embeddings', lambda i: processor.process_for_embeddings())
+    
+    # Indexing (one cold pass each; the fake embeds instantly unless --embed-latency is set)
+    pipelines = {}
+    
+    def build(i, kind):
+        storage = workdir / f'chroma_{kind}_{i}'
+        pipelines[kind] = build_pipeline(fake, csv_path, storage, in_memory=(kind == 'memory'))
+    
+    # Injected 429s are left out here: one failed embedding aborts create_embeddings
+    error_rate, fake.error_rate = fake.error_rate, 0.0
+    run('index.chroma', lambda i: build(i, 'chroma'), repeat=1, warmup=0)
+    run('index.memory', lambda i: build(i, 'memory'), repeat=1, warmup=0)
+    fake.error_rate = error_rate
+    
+    # Retrieval
+    chroma = pipelines['chroma'].context_engineer
+    memory = pipelines['memory'].context_engineer
+    
+    def cold():
+        # Every timed query embeds and searches, as for a new question
+        clear_query_embedding_cache()
+        chroma.clear_retrieval_cache()
+        memory.clear_retrieval_cache()
+    
+    run('search.chroma', lambda i: chroma.embedding_manager.search(query(i), top_k=5), before=cold)
+    run('search.memory', lambda i: memory.embedding_manager.search(query(i), top_k=5), before=cold)
+    
+    # Prompt assembly: guardrails, retrieval, context formatting and template
+    run('prompt.build', lambda i: chroma.build_prompt(query(i), tone='modern', language='english'), before=cold)
+    
+    # End to end through QueryHandler
+    run('pipeline.process_query', lambda i: pipelines['chroma'].process_query(query(i)), before=cold)
+    run('pipeline.process_query_stream', lambda i: list(pipelines['chroma'].process_query(query(i), stream=True)),
+        before=cold)
+    
+    # Repeated questions, served from the query-embedding and retrieval caches
+    run('prompt.build.warm', lambda i: chroma.build_prompt(query(i), tone='modern', language='english'),
+        warmup=len(BENCHMARK_QUERIES))
+    run('pipeline.process_query.warm', lambda i: pipelines['chroma'].process_query(query(i)),
+        warmup=len(BENCHMARK_QUERIES))
+    
+    # Conversation exports
+    exporter = ExportHandler(export_dir=str(workdir / 'exports'))
+    messages = sample_messages(args.turns)
+    for fmt in ExportHandler.FORMATS:
+        path = lambda i, fmt=fmt: str(exporter.export_dir / f'bench_{i}.{fmt}')
+        run(f'export.{fmt}', lambda i, fmt=fmt: exporter.export_lines(message_lines(messages), path(i), fmt))
+    
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Print a comparison with a baseline run.
+    
+    Returns:
+        Names of cases whose median slowed by more than threshold
+    """
+    regressions = []
+    print()
+    print(f"{'case':34s} {'baseline':>11s} {'current':>11s} {'change':>8s}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:34s} {'-':>11s} {current['p50_ms']:9.3f}ms {'new':>8s}")
+            continue
+        change = current['p50_ms'] / max(previous['p50_ms'], 1e-6) - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  ❌ regression'
+        print(f"{name:34s} {previous['p50_ms']:9.3f}ms {current['p50_ms']:9.3f}ms {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the RAG pipeline")
+    parser.add_argument('--output', type=Path, help="Write results as JSON")
+    parser.add_argument('--baseline', type=Path, help="Earlier results JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed median slowdown (0.2 = 20%%)")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed iterations per case")
+    parser.add_argument('--chapters', type=int, default=18)
+    parser.add_argument('--verses', type=int, default=40, help="Verses per chapter")
+    parser.add_argument('--turns', type=int, default=20, help="Conversation turns exported")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--embed-latency', type=float, default=0.0, help="Fake seconds per embedding")
+    parser.add_argument('--generate-latency', type=float, default=0.0, help="Fake seconds to first token")
+    parser.add_argument('--tokens-per-second', type=float, help="Fake generation throughput")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of fake calls failing with 429")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🕉️  Drishti AI - Benchmarks (offline)")
+    print("=" * 60)
+    print()
+    
+    with tempfile.TemporaryDirectory(prefix='drishti_bench_') as workdir:
+        results = run_benchmarks(args, Path(workdir))
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'verses': args.chapters * args.verses,
+            'repeat': args.repeat,
+            'fake_client': {
+                'embed_latency': args.embed_latency,
+                'generate_latency': args.generate_latency,
+                'tokens_per_second': args.tokens_per_second,
+                'error_rate': args.error_rate
+            }
+        },
+        'results': results
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nResults: {args.output}")
+    
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if baseline['meta'].get('verses') != report['meta']['verses']:
+            print("⚠️  Baseline was run on a different corpus size")
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
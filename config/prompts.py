@@ -131,9 +131,10 @@ def get_tone_prompt(tone: str) -> str:
     }
     return tones.get(tone, MODERN_RELATABLE_TONE)
 
-def create_query_prompt(query: str, context: str, tone: str, language: str) -> str:
+def create_query_prompt(query: str, context: str, tone: str, language: str, history: str = '') -> str:
     """Create complete prompt for query."""
     tone_instruction = get_tone_prompt(tone)
+    history_section = f"\n**Earlier in this Conversation**:\n{history}\n" if history else ""
     
     prompt = f"""
 {BASE_SYSTEM_PROMPT}
@@ -142,7 +143,7 @@ def create_query_prompt(query: str, context: str, tone: str, language: str) -> s
 
 **Context from Bhagavad Gita**:
 {context}
-
+{history_section}
 **Seeker's Question**: {query}
 
 **Response Language**: {language}
@@ -160,3 +161,26 @@ Remember: You are guiding a soul on their spiritual journey. Be authentic, compa
 """
     
     return prompt
+
+def create_summary_prompt(summary: str, turns: list, max_words: int) -> str:
+    """Create prompt that folds older turns into the rolling conversation summary."""
+    transcript = "\n".join(
+        f"Seeker: {query}\nKrishna: {response}" for query, response in turns
+    )
+    
+    prompt = f"""
+Update the running summary of a conversation between a seeker and Krishna.
+
+**Current Summary**:
+{summary or "(none yet)"}
+
+**New Exchanges**:
+{transcript}
+
+**Your Task**:
+Write the updated summary in at most {max_words} words. Keep the seeker's
+situation, the questions asked, the verses cited (e.g. BG 2.47) and the key
+guidance given. Write plain prose in English, without greetings or blessings.
+"""
+    
+    return prompt
@@ -1,6 +1,7 @@
 """Application settings and configuration."""
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -17,15 +18,28 @@ GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY', '')
 DATA_DIR = PROJECT_ROOT / 'data'
 ASSETS_DIR = PROJECT_ROOT / 'assets'
 CONFIG_DIR = PROJECT_ROOT / 'config'
+STATIC_DIR = PROJECT_ROOT / 'static'  # Served by Streamlit at app/static/
+MEMORY_DIR = os.getenv('MEMORY_DIR', str(DATA_DIR / 'memory'))
+MEMORY_FILE = str(DATA_DIR / 'memory.json')  # Legacy single-user memory, migrated once
+DEFAULT_MEMORY_USER = os.getenv('DEFAULT_MEMORY_USER', 'default')  # Owner of the migrated legacy memory (?uid=)
 CHROMADB_PATH = os.getenv('CHROMADB_PATH', str(PROJECT_ROOT / 'chromadb_storage'))
 
 # ChromaDB Settings
 CHROMADB_COLLECTION_NAME = 'bhagavad_gita'
+SNAPSHOT_MANIFEST_NAME = 'manifest.json'  # Expected count and checksum (scripts/write_manifest.py)
+STATS_CACHE_TTL = 300  # Seconds collection statistics are reused
+READINESS_RETRY_SECONDS = 30  # Seconds a failed readiness check is reused before checking again
 
 # Gemini Models - Using latest stable 2.0 Flash
 GEMINI_MODEL = 'gemini-2.5-pro'  # Latest stable version with good rate limits
 GEMINI_EMBEDDING_MODEL = 'models/text-embedding-004'  # Embedding model keeps 'models/' prefix
 
+# Requests per minute shared by every session and worker (0 disables a limit)
+GEMINI_RATE_LIMITS = {
+    'generate': int(os.getenv('GEMINI_GENERATE_RPM', '60')),
+    'embed': int(os.getenv('GEMINI_EMBED_RPM', '1500')),
+}
+
 # Generation Settings
 GENERATION_CONFIG = {
     'temperature': 0.7,
@@ -39,9 +53,82 @@ TOP_K_RESULTS = 10
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 50
 
+# Conversation Context Settings
+CONTEXT_RECENT_TURNS = 3
+CONTEXT_TOKEN_BUDGET = 1200
+CONTEXT_SUMMARY_TOKENS = 400
+
+# Cache Settings
+QUERY_EMBEDDING_CACHE_SIZE = 2048
+RETRIEVAL_CACHE_SIZE = 1024  # Search results per ContextEngineer
+
+# Precomputed Answer Settings (see scripts/precompute_answers.py)
+ANSWER_CACHE_PATH = os.getenv('ANSWER_CACHE_PATH', str(DATA_DIR / 'answer_cache.json'))
+PRECOMPUTE_TOP_QUERIES = 25  # Most frequent logged questions answered ahead
+PRECOMPUTE_MAX_CALLS = 300  # Generation calls one nightly run may spend
+PRECOMPUTE_MAX_AGE_DAYS = 7  # Answers older than this are regenerated
+
+# Text-to-Speech Settings
+TTS_BACKEND = os.getenv('TTS_BACKEND', 'gtts')  # 'gtts' or 'local' (offline stand-in)
+TTS_MAX_WORKERS = 4
+TTS_CHUNK_CHARS = 400
+
+# Audio Cache Settings
+AUDIO_CACHE_DIR = os.getenv('AUDIO_CACHE_DIR', str(Path(tempfile.gettempdir()) / 'drishti_audio'))
+AUDIO_CACHE_MAX_BYTES = 200 * 1024 * 1024
+AUDIO_HOT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Session Message Store Settings
+SESSION_DIR = os.getenv('SESSION_DIR', str(Path(tempfile.gettempdir()) / 'drishti_sessions'))
+SESSION_MESSAGES_IN_MEMORY = 40  # Older messages spill to disk
+EXPORT_MAX_WORKERS = 2
+EXPORT_MAX_JOBS = 8  # Finished exports kept per session; older files are deleted
+
+# Corpus Export Settings
+CORPUS_EXPORT_DIR = os.getenv('CORPUS_EXPORT_DIR', str(DATA_DIR / 'exports'))
+CORPUS_EXPORT_WORKERS = min(os.cpu_count() or 2, 8)
+# TrueType fonts tried, in order, for Sanskrit and Hindi text in PDFs
+DEVANAGARI_FONT_PATHS = [
+    os.getenv('DEVANAGARI_FONT_PATH', ''),
+    str(ASSETS_DIR / 'fonts' / 'NotoSansDevanagari-Regular.ttf'),
+    '/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf',
+    '/usr/share/fonts/truetype/lohit-devanagari/Lohit-Devanagari.ttf',
+    '/usr/share/fonts/truetype/freefont/FreeSans.ttf',
+    'C:/Windows/Fonts/mangal.ttf'
+]
+
+# Guardrail Settings
+GUARDRAILS_PATH = os.getenv('GUARDRAILS_PATH', str(CONFIG_DIR / 'guardrails.yaml'))
+
+# Conversation Recall Settings
+CONVERSATION_RECALL_THRESHOLD = 0.95
+
+# Theme Index Settings
+THEME_INDEX_PATH = os.getenv('THEME_INDEX_PATH', str(Path(CHROMADB_PATH) / 'theme_index.json'))
+THEME_INDEX_TOP_N = 20
+
+# API Server Settings
+API_HOST = os.getenv('API_HOST', '0.0.0.0')
+API_PORT = int(os.getenv('API_PORT', '8000'))
+API_MAX_CONCURRENCY = int(os.getenv('API_MAX_CONCURRENCY', '8'))  # Pipeline calls in flight
+API_QUEUE_TIMEOUT = 10.0  # Seconds a request waits for a slot before 503
+API_MAX_BODY_BYTES = 64 * 1024
+
+# Telemetry Settings (see src/core/telemetry.py)
+TELEMETRY_ENABLED = os.getenv('TELEMETRY_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+TELEMETRY_DIR = os.getenv('TELEMETRY_DIR', str(DATA_DIR / 'telemetry'))
+TELEMETRY_EXPORT_INTERVAL = 60  # Seconds between metric snapshots
+
+# Request Profiling Settings (enable under 'profiling' in features.yaml)
+PROFILES_DIR = os.getenv('PROFILES_DIR', str(DATA_DIR / 'profiles'))
+
 # UI Settings
 APP_TITLE = "Drishti AI - Divine Wisdom from Bhagavad Gita"
 APP_ICON = "🕉️"
+BACKGROUND_IMAGE = 'drishti_ai_bg_4_1764420887041.png'
+BACKGROUND_WIDTHS = (480, 768, 1024)  # Variants per screen size
+CHAT_HISTORY_TURNS = 5  # Turns shown (with audio) before 'show earlier'
+CHAT_HISTORY_PAGE_TURNS = 10  # Turns added per 'show earlier' click
 
 # Supported Languages
 LANGUAGES = {
@@ -0,0 +1,192 @@
+"""
+Answer a file of questions offline and stream the results to JSON Lines.
+
+Input is JSONL, CSV (columns: query, and optionally id, tone, language,
+search_mode) or plain text with one question per line. Questions run on a
+bounded worker pool; Gemini calls go through the shared rate limiter.
+Re-running with the same output file skips questions already answered.
+    python scripts/batch_answer.py questions.jsonl answers.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import LANGUAGES, RESPONSE_TONES, SEARCH_MODES
+
+
+def item_id(item: dict) -> str:
+    """Stable id for a question, so resumed runs can match it."""
+    key = json.dumps([item['query'], item['tone'], item['language'], item['search_mode']], ensure_ascii=False)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def read_questions(path: Path, defaults: dict):
+    """Yield question items from a JSONL, CSV or text file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            rows = (json.loads(line) for line in f if line.strip())
+        elif path.suffix == '.csv':
+            rows = csv.DictReader(f)
+        else:
+            rows = ({'query': line.strip()} for line in f if line.strip())
+        
+        for row in rows:
+            query = (row.get('query') or row.get('question') or '').strip()
+            if not query:
+                continue
+            item = {
+                'query': query,
+                'tone': row.get('tone') or defaults['tone'],
+                'language': row.get('language') or defaults['language'],
+                'search_mode': row.get('search_mode') or defaults['search_mode']
+            }
+            item['id'] = str(row.get('id') or item_id(item))
+            yield item
+
+
+def read_completed(path: Path, retry_errors: bool) -> set:
+    """Ids already answered in an earlier run."""
+    completed = set()
+    if not path.exists():
+        return completed
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn last line from an interrupted run
+                continue
+            if retry_errors and record.get('error'):
+                continue
+            completed.add(record['id'])
+    return completed
+
+
+def truncate_torn_tail(path: Path):
+    """Drop a partial last line left by an interrupted run, so appends start on a fresh line."""
+    if not path.exists():
+        return
+    
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+
+def answer(query_handler, item: dict) -> dict:
+    """Answer one question in a worker thread, with latency and API usage."""
+    from src.core.gemini_client import reset_usage, get_usage
+    
+    reset_usage()
+    start = time.perf_counter()
+    error = None
+    try:
+        response = query_handler.process_query(
+            query=item['query'],
+            tone=item['tone'],
+            language=item['language'],
+            search_mode=item['search_mode']
+        )
+    except Exception as e:
+        response = None
+        error = str(e)
+    latency = time.perf_counter() - start
+    
+    usage = get_usage()
+    if error is None and usage['errors']:
+        # GeminiClient reports failures in the text; flag them for --retry-errors
+        error = f"{usage['errors']} API call(s) failed"
+    
+    return {
+        **item,
+        'response': response,
+        'error': error,
+        'latency_s': round(latency, 3),
+        'usage': usage
+    }
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def main():
+    """Run the batch."""
+    parser = argparse.ArgumentParser(description="Answer questions in bulk to JSONL")
+    parser.add_argument('input', type=Path, help="Questions (.jsonl, .csv or .txt)")
+    parser.add_argument('output', type=Path, help="Results (.jsonl), appended to and resumed from")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--tone', default='modern', choices=list(RESPONSE_TONES))
+    parser.add_argument('--language', default='english', choices=list(LANGUAGES))
+    parser.add_argument('--search-mode', default='gita', choices=list(SEARCH_MODES))
+    parser.add_argument('--retry-errors', action='store_true', help="Re-run questions that failed before")
+    args = parser.parse_args()
+    
+    from src.core.query_handler import QueryHandler
+    from src.core.telemetry import configure_telemetry
+    
+    configure_telemetry()
+    defaults = {'tone': args.tone, 'language': args.language, 'search_mode': args.search_mode}
+    completed = read_completed(args.output, args.retry_errors)
+    if completed:
+        print(f"Resuming: {len(completed)} questions already answered")
+    
+    query_handler = QueryHandler.shared()
+    latencies = []
+    totals = {'answered': 0, 'errors': 0, 'prompt_tokens': 0, 'output_tokens': 0}
+    start = time.perf_counter()
+    
+    def record(result: dict):
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        out.flush()
+        latencies.append(result['latency_s'])
+        totals['answered'] += 1
+        totals['errors'] += 1 if result['error'] else 0
+        totals['prompt_tokens'] += result['usage']['prompt_tokens']
+        totals['output_tokens'] += result['usage']['output_tokens']
+        if totals['answered'] % 25 == 0:
+            print(f"Answered {totals['answered']} ({totals['errors']} errors)")
+    
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    truncate_torn_tail(args.output)
+    with open(args.output, 'a', encoding='utf-8') as out, \
+            ThreadPoolExecutor(max_workers=args.workers) as pool:
+        # Keep a bounded window in flight, so large inputs are never queued whole
+        pending = set()
+        for item in read_questions(args.input, defaults):
+            if item['id'] in completed:
+                continue
+            completed.add(item['id'])
+            pending.add(pool.submit(answer, query_handler, item))
+            if len(pending) >= args.workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+        for future in wait(pending).done:
+            record(future.result())
+    
+    elapsed = time.perf_counter() - start
+    print()
+    print(f"✅ Answered {totals['answered']} questions in {elapsed:.1f}s "
+          f"({totals['answered'] / max(elapsed, 1e-9):.2f}/s), {totals['errors']} errors")
+    print(f"   Latency p50 {percentile(latencies, 50):.2f}s, p95 {percentile(latencies, 95):.2f}s")
+    print(f"   Tokens: {totals['prompt_tokens']} prompt, {totals['output_tokens']} output")
+    print(f"   Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
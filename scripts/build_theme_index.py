@@ -0,0 +1,43 @@
+"""
+Build the theme-to-verse index used by the Themes view.
+
+Scores every stored verse against each theme centroid using the existing
+embeddings, so no Gemini calls are made. Run after setup.py:
+    python scripts/build_theme_index.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.embedding_manager import EmbeddingManager
+from src.features.chapter_navigator import ChapterNavigator
+from src.features.theme_index import ThemeIndex
+
+
+def main():
+    """Build and persist the theme index."""
+    print("=" * 60)
+    print("🕉️  Drishti AI - Theme Index Builder")
+    print("=" * 60)
+    print()
+    
+    embedding_manager = EmbeddingManager()
+    embedding_manager.initialize_collection()
+    
+    theme_index = ThemeIndex()
+    index = theme_index.build(embedding_manager, ChapterNavigator.THEMES)
+    path = theme_index.save(index)
+    
+    print(f"✅ Ranked {index['verse_count']} verses for {len(index['themes'])} themes")
+    for theme, verses in index['themes'].items():
+        top = ", ".join(v['verse_id'] for v in verses[:5])
+        print(f"   {theme}: {top}")
+    print()
+    print(f"Saved index: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Export the Bhagavad Gita as downloadable PDF/DOCX books.
+
+Chapters are rendered in parallel worker processes and cached by content,
+so re-running only rebuilds chapters whose verses changed. Examples:
+    python scripts/export_corpus.py                       # full Gita, PDF
+    python scripts/export_corpus.py --format docx --chapters 2 3 12
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import CORPUS_EXPORT_DIR, CORPUS_EXPORT_WORKERS
+from src.core.telemetry import configure_telemetry
+from src.features.corpus_export import CorpusExporter
+
+
+def main():
+    """Build the requested books and report throughput."""
+    parser = argparse.ArgumentParser(description="Export the Gita corpus as PDF/DOCX books")
+    parser.add_argument('--format', choices=['pdf', 'docx', 'both'], default='pdf')
+    parser.add_argument('--chapters', type=int, nargs='+', help="Chapters to include (default: all)")
+    parser.add_argument('--workers', type=int, default=CORPUS_EXPORT_WORKERS)
+    parser.add_argument('--output', default=CORPUS_EXPORT_DIR)
+    parser.add_argument('--chapters-only', action='store_true', help="Build chapter files without merging")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🕉️  Drishti AI - Corpus Export")
+    print("=" * 60)
+    print()
+    
+    configure_telemetry()
+    exporter = CorpusExporter(output_dir=args.output, workers=args.workers)
+    formats = ['pdf', 'docx'] if args.format == 'both' else [args.format]
+    
+    for fmt in formats:
+        if args.chapters_only:
+            result = exporter.build_chapters(fmt, args.chapters)
+        else:
+            result = exporter.build_book(fmt, args.chapters)
+        
+        seconds = max(result['seconds'], 1e-9)
+        rebuilt = len(result['rebuilt'])
+        print(f"{fmt.upper()}: {rebuilt} chapters rebuilt, {len(result['cached'])} from cache")
+        print(f"   {result['verses']} verses in {seconds:.2f}s "
+              f"({result['verses'] / seconds:.0f} verses/s, {len(result['paths']) / seconds:.1f} chapters/s)")
+        if result.get('book'):
+            print(f"   Book: {result['book']}")
+        else:
+            print(f"   Chapters: {exporter.chapter_dir}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Precompute answers for the verse of the day and the most frequent questions.
+
+Meant to run nightly (e.g. from cron). Frequent questions are counted from
+every ConversationalMemory log under MEMORY_DIR, and each is answered in
+every tone and language, most frequent first, until the generation budget
+is spent. Answers still fresh from earlier runs are kept without new
+calls, and so are stale ones the budget cannot cover. Follow-ups ("tell me
+more") are skipped. The app serves these answers without calling Gemini
+at the start of a conversation.
+    python scripts/precompute_answers.py
+    python scripts/precompute_answers.py --top 50 --max-calls 600 --days 2
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import product
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import (
+    LANGUAGES, PRECOMPUTE_MAX_AGE_DAYS, PRECOMPUTE_MAX_CALLS, PRECOMPUTE_TOP_QUERIES, RESPONSE_TONES
+)
+
+
+def main():
+    """Run the precomputation."""
+    parser = argparse.ArgumentParser(description="Precompute answers for frequent questions and the verse of the day")
+    parser.add_argument('--top', type=int, default=PRECOMPUTE_TOP_QUERIES, help="Frequent questions to answer")
+    parser.add_argument('--min-count', type=int, default=2, help="Times a question must have been asked")
+    parser.add_argument('--days', type=int, default=2, help="Verses of the day to prepare, from today")
+    parser.add_argument('--max-calls', type=int, default=PRECOMPUTE_MAX_CALLS, help="Generation budget for this run")
+    parser.add_argument('--max-age', type=float, default=PRECOMPUTE_MAX_AGE_DAYS, help="Days before an answer is regenerated")
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🕉️  Drishti AI - Answer Precomputation")
+    print("=" * 60)
+    print()
+    
+    from src.core.answer_cache import AnswerCache, verse_of_the_day, verse_query
+    from src.core.data_processor import DataProcessor
+    from src.core.gemini_client import get_usage, reset_usage
+    from src.core.query_handler import QueryHandler
+    from src.core.telemetry import configure_telemetry
+    from src.features.conversational_memory import ConversationalMemory
+    
+    configure_telemetry()
+    cache = AnswerCache()
+    previous = cache.load()
+    
+    # Verses of the day come first, then questions by frequency
+    verse_ids = [verse['id'] for verse in DataProcessor().process_for_embeddings()]
+    daily = {}
+    questions = []
+    for offset in range(args.days):
+        day = date.today() + timedelta(days=offset)
+        verse_id = verse_of_the_day(verse_ids, day)
+        daily[day.isoformat()] = {'verse_id': verse_id, 'query': verse_query(verse_id)}
+        questions.append((verse_query(verse_id), 'gita'))
+    
+    frequent = ConversationalMemory.frequent_queries(args.top, min_count=args.min_count)
+    print(f"{len(frequent)} frequent questions (asked at least {args.min_count} times)")
+    for query, search_mode, count in frequent:
+        print(f"   {count:4d}×  {query[:70]}")
+        questions.append((query, search_mode))
+    
+    query_handler = QueryHandler.shared()
+    context_engineer = query_handler.context_engineer
+    
+    # Keep fresh answers; queue the rest within the budget
+    cutoff = datetime.now() - timedelta(days=args.max_age)
+    answers = {}
+    pending = []
+    over_budget = 0
+    for query, search_mode in questions:
+        if not (context_engineer.is_spiritual_query(query)
+                and not context_engineer.detect_harmful_intent(query)['is_harmful']):
+            # Guardrail replies never reach Gemini, so there is nothing to save
+            continue
+        if 'follow_up' in context_engineer.guardrails.classify(query):
+            # "Tell me more" depends on the earlier turns; a canned answer would be wrong
+            continue
+        for tone, language in product(RESPONSE_TONES, LANGUAGES):
+            key = AnswerCache.make_key(query, tone, language, search_mode)
+            if key in answers:
+                continue
+            entry = previous['answers'].get(key)
+            if entry and datetime.fromisoformat(entry['generated_at']) > cutoff:
+                answers[key] = entry
+            elif len(pending) < args.max_calls:
+                pending.append((key, query, tone, language, search_mode))
+            elif entry:
+                # Over budget: keep serving the stale answer until a later run refreshes it
+                answers[key] = entry
+                over_budget += 1
+    kept = len(answers)
+    
+    def generate(item):
+        key, query, tone, language, search_mode = item
+        reset_usage()
+        try:
+            # Straight to the pipeline, bypassing the cache being rebuilt
+            response = context_engineer.engineer_response(
+                query=query, tone=tone, language=language, search_mode=search_mode
+            )
+        except Exception as e:
+            print(f"❌ {query[:40]} ({tone}, {language}): {e}")
+            return key, None
+        if get_usage()['errors']:
+            # GeminiClient reports failures in the text; never cache those
+            return key, None
+        return key, {
+            'query': query,
+            'tone': tone,
+            'language': language,
+            'search_mode': search_mode,
+            'response': response,
+            'generated_at': datetime.now().isoformat()
+        }
+    
+    print()
+    print(f"Generating {len(pending)} answers ({kept} still fresh, budget {args.max_calls})...")
+    start = time.perf_counter()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for key, entry in pool.map(generate, pending):
+            if entry is None:
+                failed += 1
+                # Fall back to the stale answer rather than dropping the question
+                entry = previous['answers'].get(key)
+            if entry is not None:
+                answers[key] = entry
+    
+    path = cache.save(answers, daily)
+    print()
+    print(f"✅ {len(answers)} answers cached in {time.perf_counter() - start:.1f}s "
+          f"({len(pending) - failed} generated, {kept} kept, {failed} failed)")
+    for day, verse in daily.items():
+        print(f"   Verse of the day {day}: {verse['verse_id']}")
+    if len(pending) == args.max_calls:
+        print(f"⚠️  Budget reached; {over_budget} stale answers kept, other questions will be answered live")
+    print(f"Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
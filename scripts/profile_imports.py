@@ -0,0 +1,99 @@
+"""
+Report how long each Drishti AI module takes to import.
+
+Every module is imported in a fresh interpreter with ``-X importtime``, so
+each number is a cold start including that module's dependencies. Run:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --top 15
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.features.feature_registry import FeatureRegistry
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Loaded by app.py at startup
+CORE_MODULES = [
+    'streamlit',
+    'src.core.query_handler',
+    'src.core.conversation_context',
+    'src.features.feature_registry',
+    'src.features.message_store',
+    'src.ui.base_components'
+]
+
+
+def profile_module(module: str):
+    """
+    Import a module in a fresh interpreter.
+    
+    Returns:
+        (total seconds, {top-level package: cumulative seconds})
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    
+    packages = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if depth == 0:
+            seconds = int(cumulative) / 1e6
+            package = name.split('.')[0]
+            packages[package] = packages.get(package, 0) + seconds
+            total += seconds
+    return total, packages
+
+
+def main():
+    """Print the import profile."""
+    parser = argparse.ArgumentParser(description="Profile module import times")
+    parser.add_argument('--top', type=int, default=5, help="Heaviest packages listed per module")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🕉️  Drishti AI - Import Profile (cold, per module)")
+    print("=" * 60)
+    print()
+    
+    registry = FeatureRegistry()
+    modules = [(module, 'startup') for module in CORE_MODULES]
+    for feature, (module, _) in FeatureRegistry.FEATURE_MODULES.items():
+        gate = FeatureRegistry.FEATURE_GATES.get(feature, feature)
+        state = 'lazy, enabled' if registry.is_enabled(gate) else 'lazy, disabled'
+        modules.append((module, state))
+    
+    for module, state in modules:
+        try:
+            total, packages = profile_module(module)
+        except RuntimeError as e:
+            print(f"{module:45s} failed: {e}")
+            continue
+        
+        print(f"{module:45s} {total * 1000:8.0f} ms  ({state})")
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[:args.top]
+        for package, seconds in heaviest:
+            print(f"    {package:41s} {seconds * 1000:8.0f} ms")
+    print()
+    print("Startup imports run on every cold start; lazy ones only when an enabled feature is first used.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Write the snapshot manifest for an existing verse store.
+
+create_embeddings writes the manifest when it builds a store; run this for
+a store built before manifests existed, or after restoring a copy, then
+commit chromadb_storage/manifest.json with the store so deployments can
+verify it at startup (GET /ready):
+    python scripts/write_manifest.py
+    python scripts/write_manifest.py --check
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import CHROMADB_PATH
+
+
+def main():
+    """Write or verify the manifest."""
+    parser = argparse.ArgumentParser(description="Write the snapshot manifest for an existing verse store")
+    parser.add_argument('--path', default=CHROMADB_PATH, help="ChromaDB directory")
+    parser.add_argument('--check', action='store_true', help="Verify the store against its manifest instead")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🕉️  Drishti AI - Snapshot Manifest")
+    print("=" * 60)
+    print()
+    
+    from src.core.embedding_manager import EmbeddingManager
+    
+    embedding_manager = EmbeddingManager(chromadb_path=args.path)
+    embedding_manager.initialize_collection()
+    
+    if args.check:
+        result = embedding_manager.readiness()
+        for problem in result['problems']:
+            print(f"❌ {problem}")
+        if result['ready']:
+            print(f"✅ {result['total_verses']} verses, snapshot {result['snapshot']}")
+        sys.exit(0 if result['ready'] else 1)
+    
+    total = embedding_manager.get_stats()['total_verses']
+    if total == 0:
+        print(f"❌ No verses stored in {args.path}; create embeddings first (python setup.py)")
+        sys.exit(1)
+    
+    path = embedding_manager.write_manifest()
+    print(f"✅ Recorded {total} verses")
+    print(f"Saved manifest: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Initialize api package."""
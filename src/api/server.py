@@ -0,0 +1,335 @@
+"""
+Headless HTTP API for Drishti AI.
+
+A plain ASGI application (no web framework) serving the RAG pipeline to
+non-Streamlit clients. Run with:
+    python -m src.api.server
+or
+    uvicorn src.api.server:app --host 0.0.0.0 --port 8000
+    
+Routes:
+    GET  /health                  Liveness and verse count
+    GET  /ready                   Snapshot check (503 until the verse store is usable)
+    POST /query                   {"query", "tone", "language", "search_mode", "history"}
+    POST /query/stream            Same body; answer as server-sent events
+    GET  /verses/{id}             Verse by id, e.g. /verses/2.47
+    GET  /search?q=...&top_k=5    Semantic verse search
+"""
+
+import asyncio
+import json
+import threading
+from typing import Dict, Tuple
+from urllib.parse import parse_qs
+from config.settings import (
+    API_HOST, API_PORT, API_MAX_CONCURRENCY, API_QUEUE_TIMEOUT, API_MAX_BODY_BYTES,
+    LANGUAGES, RESPONSE_TONES, SEARCH_MODES
+)
+from src.core.telemetry import configure_telemetry
+
+
+class HTTPError(Exception):
+    """Error returned to the client as a JSON body."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class DrishtiAPI:
+    """
+    ASGI application wrapping QueryHandler.
+    
+    One QueryHandler (and so one Gemini client and Chroma collection) is
+    shared by every request. Pipeline calls are blocking, so they run in
+    worker threads, and a semaphore caps how many run at once; requests
+    that cannot get a slot within API_QUEUE_TIMEOUT get a 503.
+    """
+    
+    def __init__(self, query_handler=None, max_concurrency: int = API_MAX_CONCURRENCY):
+        """
+        Initialize API.
+        
+        Args:
+            query_handler: Pipeline to serve (created on first request if None)
+            max_concurrency: Pipeline calls allowed in flight
+        """
+        self._query_handler = query_handler
+        self._init_lock = threading.Lock()
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/ready'): self.ready,
+            ('POST', '/query'): self.query,
+            ('POST', '/query/stream'): self.query_stream,
+            ('GET', '/search'): self.search
+        }
+    
+    @property
+    def query_handler(self):
+        """Shared QueryHandler, created on first use."""
+        if self._query_handler is None:
+            with self._init_lock:
+                if self._query_handler is None:
+                    from src.core.query_handler import QueryHandler
+                    from src.features.feature_registry import FeatureRegistry
+                    query_handler = QueryHandler()
+                    
+                    registry = FeatureRegistry()
+                    RequestProfiler = registry.load('profiling')
+                    if RequestProfiler:
+                        RequestProfiler(registry.get_config('profiling').get('settings', {})).install(query_handler)
+                    CacheWarmer = registry.load('cache_warming')
+                    if CacheWarmer:
+                        CacheWarmer.for_handler(query_handler, registry.get_config('cache_warming').get('settings', {}))
+                    self._query_handler = query_handler
+        return self._query_handler
+    
+    @property
+    def embedding_manager(self):
+        """Embedding manager of the shared pipeline."""
+        return self.query_handler.context_engineer.embedding_manager
+    
+    async def __call__(self, scope, receive, send):
+        """ASGI entry point."""
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        
+        try:
+            handler, args = self._route(scope['method'], scope['path'])
+            await handler(scope, receive, send, *args)
+        except HTTPError as e:
+            await self._send_json(send, e.status, {'error': e.message})
+        except Exception as e:
+            print(f"Error handling {scope['method']} {scope['path']}: {e}")
+            await self._send_json(send, 500, {'error': 'Internal server error'})
+    
+    async def _lifespan(self, receive, send):
+        """Create shared resources at startup so the first request is not slow."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    configure_telemetry()
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    await asyncio.to_thread(lambda: self.query_handler)
+                    # Verify the snapshot once, so /ready never queries Chroma
+                    await asyncio.to_thread(self.embedding_manager.readiness)
+                    await send({'type': 'lifespan.startup.complete'})
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    def _route(self, method: str, path: str) -> Tuple:
+        """Find the handler for a request."""
+        path = path.rstrip('/') or '/'
+        if path.startswith('/verses/'):
+            if method != 'GET':
+                raise HTTPError(405, 'Method not allowed')
+            return self.verse, (path[len('/verses/'):],)
+        
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HTTPError(405, 'Method not allowed')
+            raise HTTPError(404, 'Not found')
+        return handler, ()
+    
+    # Helpers
+    
+    @staticmethod
+    async def _send_json(send, status: int, payload: Dict):
+        """Send a complete JSON response."""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json; charset=utf-8'),
+                (b'content-length', str(len(body)).encode())
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+    
+    @staticmethod
+    async def _read_json(receive) -> Dict:
+        """Read and parse a JSON request body."""
+        body = b''
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise HTTPError(400, 'Client disconnected')
+            body += message.get('body', b'')
+            if len(body) > API_MAX_BODY_BYTES:
+                raise HTTPError(413, 'Request body too large')
+            if not message.get('more_body'):
+                break
+        
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(400, 'Invalid JSON body')
+        if not isinstance(payload, dict):
+            raise HTTPError(400, 'JSON body must be an object')
+        return payload
+    
+    @staticmethod
+    def _query_args(payload: Dict) -> Dict:
+        """Validate query parameters against the supported options."""
+        query = payload.get('query')
+        if not isinstance(query, str) or not query.strip():
+            raise HTTPError(400, "'query' is required")
+        
+        args = {
+            'query': query.strip(),
+            'tone': payload.get('tone', 'modern'),
+            'language': payload.get('language', 'english'),
+            'search_mode': payload.get('search_mode', 'gita'),
+            'history': payload.get('history', '') or ''
+        }
+        for name, options in (('tone', RESPONSE_TONES), ('language', LANGUAGES), ('search_mode', SEARCH_MODES)):
+            if args[name] not in options:
+                raise HTTPError(400, f"'{name}' must be one of: {', '.join(options)}")
+        if not isinstance(args['history'], str):
+            raise HTTPError(400, "'history' must be a string")
+        return args
+    
+    async def _acquire(self):
+        """Wait for a pipeline slot."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=API_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPError(503, 'Server busy, please retry')
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking pipeline call in a worker thread, within the concurrency limit."""
+        await self._acquire()
+        try:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        finally:
+            self._semaphore.release()
+    
+    # Handlers
+    
+    async def health(self, scope, receive, send):
+        """GET /health"""
+        stats = await self._run_blocking(self.embedding_manager.get_stats)
+        await self._send_json(send, 200, {'status': 'ok', 'total_verses': stats['total_verses']})
+    
+    async def ready(self, scope, receive, send):
+        """GET /ready"""
+        readiness = await asyncio.to_thread(self.embedding_manager.readiness)
+        await self._send_json(send, 200 if readiness['ready'] else 503, readiness)
+    
+    async def query(self, scope, receive, send):
+        """POST /query"""
+        args = self._query_args(await self._read_json(receive))
+        response = await self._run_blocking(self.query_handler.process_query, **args)
+        await self._send_json(send, 200, {'response': response})
+    
+    async def query_stream(self, scope, receive, send):
+        """POST /query/stream — answer chunks as server-sent events."""
+        args = self._query_args(await self._read_json(receive))
+        await self._acquire()
+        
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+        done = object()
+        
+        def produce():
+            """Drive the blocking generator in a worker thread."""
+            try:
+                for chunk in self.query_handler.process_query(stream=True, **args):
+                    if cancelled.is_set():
+                        break
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, done)
+        
+        async def watch_disconnect():
+            """Stop generating when the client goes away."""
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    cancelled.set()
+                    return
+        
+        producer = asyncio.create_task(asyncio.to_thread(produce))
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream; charset=utf-8'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no')
+                ]
+            })
+            while True:
+                chunk = await chunks.get()
+                if chunk is done:
+                    event = 'event: done\ndata: {}\n\n'
+                elif isinstance(chunk, Exception):
+                    event = f"event: error\ndata: {json.dumps({'error': str(chunk)})}\n\n"
+                else:
+                    event = f"data: {json.dumps({'text': chunk}, ensure_ascii=False)}\n\n"
+                
+                if not cancelled.is_set():
+                    await send({'type': 'http.response.body', 'body': event.encode('utf-8'), 'more_body': chunk is not done})
+                if chunk is done:
+                    break
+        finally:
+            cancelled.set()
+            watcher.cancel()
+            await producer
+            self._semaphore.release()
+    
+    async def verse(self, scope, receive, send, verse_id: str):
+        """GET /verses/{id}"""
+        verse = await self._run_blocking(self.embedding_manager.get_verse_by_id, verse_id)
+        if verse is None:
+            raise HTTPError(404, f"Verse {verse_id} not found")
+        await self._send_json(send, 200, verse)
+    
+    async def search(self, scope, receive, send):
+        """GET /search?q=...&top_k=5"""
+        params = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+        query = (params.get('q') or [''])[0].strip()
+        if not query:
+            raise HTTPError(400, "'q' is required")
+        try:
+            top_k = int((params.get('top_k') or ['5'])[0])
+        except ValueError:
+            raise HTTPError(400, "'top_k' must be an integer")
+        top_k = max(1, min(top_k, 50))
+        
+        results = await self._run_blocking(self.embedding_manager.search, query, top_k)
+        await self._send_json(send, 200, {'query': query, 'results': results})
+
+
+app = DrishtiAPI()
+
+
+def main():
+    """Run the API with uvicorn."""
+    import uvicorn
+    uvicorn.run(app, host=API_HOST, port=API_PORT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Precomputed answers for frequent questions and the verse of the day."""
+
+import hashlib
+import json
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import ANSWER_CACHE_PATH
+from .normalize import normalize_query
+from .telemetry import record_cache
+
+
+def verse_of_the_day(verse_ids: List[str], day: date = None) -> str:
+    """
+    Pick the verse of the day, the same for every process.
+    
+    Args:
+        verse_ids: Ids of every verse ('2.47'), in corpus order
+        day: Date to pick for (defaults to today)
+        
+    Returns:
+        Verse id
+    """
+    day = day or date.today()
+    digest = hashlib.sha1(day.isoformat().encode('utf-8')).digest()
+    return verse_ids[int.from_bytes(digest[:8], 'big') % len(verse_ids)]
+
+
+def verse_query(verse_id: str) -> str:
+    """Question answered for a verse of the day."""
+    return f"Explain Bhagavad Gita verse {verse_id} and how to apply it today"
+
+
+class AnswerCache:
+    """
+    Read-only lookup of answers generated ahead of time.
+    
+    The nightly job (scripts/precompute_answers.py) writes one JSON file;
+    the app loads it into a dictionary keyed by normalized query, tone,
+    language and search mode, and reloads it when the file changes.
+    """
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, cache_path: str = ANSWER_CACHE_PATH):
+        """
+        Initialize answer cache.
+        
+        Args:
+            cache_path: Path of the precomputed answers file
+        """
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self._data = {'answers': {}, 'daily': {}}
+        self._mtime_ns = None
+    
+    @classmethod
+    def shared(cls) -> 'AnswerCache':
+        """Get the process-wide cache shared by every session."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    @staticmethod
+    def make_key(query: str, tone: str, language: str, search_mode: str) -> str:
+        """Build the lookup key of an answer."""
+        return f"{search_mode}|{tone}|{language}|{normalize_query(query)}"
+    
+    def load(self) -> Dict:
+        """Get the cached data, reloading the file if it was replaced."""
+        try:
+            mtime_ns = self.cache_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        
+        with self._lock:
+            if mtime_ns != self._mtime_ns:
+                data = {'answers': {}, 'daily': {}}
+                if mtime_ns is not None:
+                    with open(self.cache_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                self._data = data
+                self._mtime_ns = mtime_ns
+            return self._data
+    
+    def get(self, query: str, tone: str, language: str, search_mode: str) -> Optional[str]:
+        """
+        Look up a precomputed answer.
+        
+        Returns:
+            Answer text, or None if the question was not precomputed
+        """
+        entry = self.load()['answers'].get(self.make_key(query, tone, language, search_mode))
+        record_cache('answer', entry is not None)
+        return entry['response'] if entry else None
+    
+    def get_daily(self, day: date = None) -> Optional[Dict]:
+        """
+        Get the precomputed verse of the day.
+        
+        Returns:
+            {'verse_id', 'query'}, or None if the day was not precomputed
+        """
+        day = day or date.today()
+        return self.load()['daily'].get(day.isoformat())
+    
+    def save(self, answers: Dict, daily: Dict) -> str:
+        """
+        Replace the cache file.
+        
+        Args:
+            answers: {key: {'query', 'tone', 'language', 'search_mode', 'response', 'generated_at'}}
+            daily: {ISO date: {'verse_id', 'query'}}
+            
+        Returns:
+            Path to the saved file
+        """
+        data = {
+            'built_at': datetime.now().isoformat(),
+            'answers': answers,
+            'daily': daily
+        }
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write atomically so the app never reads a half-written file
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(self.cache_path)
+        
+        return str(self.cache_path)
@@ -1,8 +1,14 @@
 """Context engineering for accurate and relevant responses."""
 
-from typing import List, Dict
+import threading
+from typing import List, Dict, Iterator
+from cachetools import LRUCache
+from config.settings import RETRIEVAL_CACHE_SIZE
 from .gemini_client import GeminiClient
 from .embedding_manager import EmbeddingManager
+from .guardrails import GuardrailMatcher
+from .normalize import normalize_query
+from .telemetry import record_cache, span, traced
 from config.prompts import (
     create_query_prompt,
     DIVINE_PURPOSE_FILTER,
@@ -14,47 +20,50 @@ from config.prompts import (
 class ContextEngineer:
     """Advanced context engineering for Bhagavad Gita responses."""
     
-    def __init__(self):
-        """Initialize context engineer."""
-        self.gemini_client = GeminiClient()
-        self.embedding_manager = EmbeddingManager()
+    def __init__(self, gemini_client=None, embedding_manager=None):
+        """
+        Initialize context engineer.
+        
+        Args:
+            gemini_client: Client for generation (defaults to a new GeminiClient)
+            embedding_manager: Verse store to search (defaults to an EmbeddingManager
+                sharing gemini_client)
+        """
+        self.gemini_client = gemini_client if gemini_client is not None else GeminiClient()
+        if embedding_manager is None:
+            embedding_manager = EmbeddingManager(gemini_client=self.gemini_client)
+        self.embedding_manager = embedding_manager
         self.embedding_manager.initialize_collection()
+        self.guardrails = GuardrailMatcher.shared()
+        
+        # Unfiltered search results by normalized query and top_k
+        self._retrieval_cache = LRUCache(maxsize=RETRIEVAL_CACHE_SIZE)
+        self._retrieval_lock = threading.Lock()
+    
+    # Verses retrieved for a Gita-mode prompt
+    PROMPT_VERSES = 5
+    
+    # Lexicon categories that mark a harmful query, in priority order
+    HARMFUL_CATEGORIES = {
+        'violence': VIOLENCE_REDIRECT,
+        'discrimination': DISCRIMINATION_REDIRECT
+    }
     
     def is_spiritual_query(self, query: str) -> bool:
         """Check if query is spiritual/on-topic."""
-        off_topic_keywords = [
-            'weather', 'joke', 'recipe', 'sports', 'politics',
-            'hack', 'cheat', 'stock', 'pizza', 'movie'
-        ]
-        
-        query_lower = query.lower()
-        return not any(keyword in query_lower for keyword in off_topic_keywords)
+        return 'off_topic' not in self.guardrails.classify(query)
     
     def detect_harmful_intent(self, query: str) -> Dict:
         """Detect potentially harmful queries."""
-        query_lower = query.lower()
-        
-        # Violence justification
-        violence_keywords = [
-            'justify violence', 'kill', 'harm others', 'attack', 'destroy', 'revenge'
-        ]
-        if any(kw in query_lower for kw in violence_keywords):
-            return {
-                'is_harmful': True,
-                'category': 'violence',
-                'redirect': VIOLENCE_REDIRECT
-            }
-        
-        # Discrimination
-        discrimination_keywords = [
-            'justify caste', 'superiority', 'inferior', 'discriminate'
-        ]
-        if any(kw in query_lower for kw in discrimination_keywords):
-            return {
-                'is_harmful': True,
-                'category': 'discrimination',
-                'redirect': DISCRIMINATION_REDIRECT
-            }
+        matches = self.guardrails.classify(query)
+        
+        for category, redirect in self.HARMFUL_CATEGORIES.items():
+            if category in matches:
+                return {
+                    'is_harmful': True,
+                    'category': category,
+                    'redirect': redirect
+                }
         
         return {'is_harmful': False}
     
@@ -67,6 +76,9 @@ class ContextEngineer:
         """
         Retrieve relevant verses for query.
         
+        Unfiltered results are cached by normalized query, since the verse
+        store does not change while the app runs.
+        
         Args:
             query: User query
             top_k: Number of verses to retrieve
@@ -75,13 +87,31 @@ class ContextEngineer:
         Returns:
             List of relevant verses
         """
-        results = self.embedding_manager.search(
-            query=query,
-            top_k=top_k,
-            filter_metadata=filter_metadata
-        )
+        cache_key = (normalize_query(query), top_k) if filter_metadata is None else None
+        if cache_key is not None:
+            with self._retrieval_lock:
+                cached = self._retrieval_cache.get(cache_key)
+            record_cache('retrieval', cached is not None)
+            if cached is not None:
+                return list(cached)
         
-        return results
+        with span('context.retrieve', top_k=top_k):
+            results = self.embedding_manager.search(
+                query=query,
+                top_k=top_k,
+                filter_metadata=filter_metadata
+            )
+            
+            # Empty results may be a failed embedding; retry those next time
+            if cache_key is not None and results:
+                with self._retrieval_lock:
+                    self._retrieval_cache[cache_key] = list(results)
+            return results
+    
+    def clear_retrieval_cache(self):
+        """Drop every cached search result."""
+        with self._retrieval_lock:
+            self._retrieval_cache.clear()
     
     def format_context(self, verses: List[Dict]) -> str:
         """
@@ -108,39 +138,45 @@ class ContextEngineer:
         
         return "\n".join(context_parts)
     
-    def engineer_response(
+    @traced('context.build_prompt')
+    def build_prompt(
         self,
         query: str,
         tone: str = 'modern',
         language: str = 'english',
-        search_mode: str = 'gita'
-    ) -> str:
+        search_mode: str = 'gita',
+        history: str = ''
+    ) -> Dict:
         """
-        Engineer complete response with context.
+        Run guardrails and retrieval, and build the generation prompt.
         
         Args:
             query: User query
             tone: Response tone (spiritual/scholarly/modern/devotional)
             language: Response language
             search_mode: 'gita' or 'universal'
+            history: Bounded summary of earlier turns (see ConversationContext)
             
         Returns:
-            Generated response
+            Dictionary with either 'prompt' to generate from, or a canned
+            'response' when a guardrail applies; 'verses' lists retrieved verses
         """
         # Check for off-topic queries
         if not self.is_spiritual_query(query):
-            return DIVINE_PURPOSE_FILTER
+            return {'prompt': None, 'response': DIVINE_PURPOSE_FILTER, 'verses': []}
         
         # Check for harmful intent
         harm_check = self.detect_harmful_intent(query)
         if harm_check['is_harmful']:
-            return harm_check['redirect']
+            return {'prompt': None, 'response': harm_check['redirect'], 'verses': []}
         
         # Universal mode - direct LLM query
         if search_mode == 'universal':
+            history_section = f"Earlier in this conversation:\n{history}\n" if history else ""
             prompt = f"""
             You are Krishna, providing spiritual guidance.
             
+            {history_section}
             Question: {query}
             
             Provide wisdom that helps the seeker, drawing on your knowledge
@@ -148,19 +184,74 @@ class ContextEngineer:
             
             Respond in {language}.
             """
-            return self.gemini_client.generate(prompt)
+            return {'prompt': prompt, 'response': None, 'verses': []}
         
         # Gita mode - RAG pipeline
         # Retrieve relevant verses
-        verses = self.retrieve_context(query, top_k=5)
+        verses = self.retrieve_context(query, top_k=self.PROMPT_VERSES)
         
         # Format context
         context = self.format_context(verses)
         
         # Create prompt
-        prompt = create_query_prompt(query, context, tone, language)
+        prompt = create_query_prompt(query, context, tone, language, history)
+        
+        return {'prompt': prompt, 'response': None, 'verses': verses}
+    
+    def engineer_response(
+        self,
+        query: str,
+        tone: str = 'modern',
+        language: str = 'english',
+        search_mode: str = 'gita',
+        history: str = ''
+    ) -> str:
+        """
+        Engineer complete response with context.
+        
+        Args:
+            query: User query
+            tone: Response tone (spiritual/scholarly/modern/devotional)
+            language: Response language
+            search_mode: 'gita' or 'universal'
+            history: Bounded summary of earlier turns (see ConversationContext)
+            
+        Returns:
+            Generated response
+        """
+        prepared = self.build_prompt(query, tone, language, search_mode, history)
+        if prepared['prompt'] is None:
+            return prepared['response']
         
         # Generate response
-        response = self.gemini_client.generate(prompt)
+        response = self.gemini_client.generate(prepared['prompt'])
         
         return response
+    
+    def engineer_response_stream(
+        self,
+        query: str,
+        tone: str = 'modern',
+        language: str = 'english',
+        search_mode: str = 'gita',
+        history: str = ''
+    ) -> Iterator[str]:
+        """
+        Engineer a response, yielding text chunks as they are generated.
+        
+        Args:
+            query: User query
+            tone: Response tone (spiritual/scholarly/modern/devotional)
+            language: Response language
+            search_mode: 'gita' or 'universal'
+            history: Bounded summary of earlier turns (see ConversationContext)
+            
+        Yields:
+            Response text chunks
+        """
+        prepared = self.build_prompt(query, tone, language, search_mode, history)
+        if prepared['prompt'] is None:
+            yield prepared['response']
+            return
+        
+        yield from self.gemini_client.generate_stream(prepared['prompt'])
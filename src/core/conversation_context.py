@@ -0,0 +1,154 @@
+"""Bounded-token conversation context for multi-turn questions."""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+import threading
+from config.prompts import create_summary_prompt
+from config.settings import CONTEXT_RECENT_TURNS, CONTEXT_TOKEN_BUDGET, CONTEXT_SUMMARY_TOKENS
+from .gemini_client import GeminiClient
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count (about 4 UTF-8 bytes per token)."""
+    return len(text.encode('utf-8')) // 4 + 1
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """Clip text to roughly fit a token budget."""
+    if max_tokens <= 0:
+        return ''
+    max_bytes = max_tokens * 4
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode('utf-8', errors='ignore').rstrip() + " ..."
+
+
+class ConversationContext:
+    """
+    Keep a rolling summary plus the last few turns under a token budget.
+    
+    Turns that fall out of the recent window are folded into the summary by
+    a background worker, so building the context for a follow-up question
+    never waits on a generation call.
+    """
+    
+    def __init__(
+        self,
+        gemini_client: GeminiClient = None,
+        recent_turns: int = CONTEXT_RECENT_TURNS,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        summary_tokens: int = CONTEXT_SUMMARY_TOKENS
+    ):
+        """
+        Initialize conversation context.
+        
+        Args:
+            gemini_client: Client used to refresh the summary
+            recent_turns: Number of most recent turns kept verbatim
+            token_budget: Maximum tokens of rendered context
+            summary_tokens: Maximum tokens of the rolling summary
+        """
+        self.gemini_client = gemini_client or GeminiClient()
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summary = ''
+        # Turns added since creation or clear(), not counting seeded ones
+        self.turns_asked = 0
+        
+        self._turns = deque()
+        self._pending: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='drishti-summary')
+        self._future = None
+    
+    def seed(self, turns: List[Tuple[str, str]]):
+        """
+        Start from earlier turns (e.g. from ConversationalMemory) without summarizing.
+        
+        Args:
+            turns: (query, response) pairs, oldest first
+        """
+        with self._lock:
+            for turn in turns[-self.recent_turns:]:
+                self._turns.append(turn)
+    
+    def add_turn(self, query: str, response: str):
+        """Record a finished turn and refresh the summary in the background."""
+        with self._lock:
+            self._turns.append((query, response))
+            self.turns_asked += 1
+            while len(self._turns) > self.recent_turns:
+                self._pending.append(self._turns.popleft())
+        
+        self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        """Submit a summary refresh unless one is already running."""
+        with self._lock:
+            if not self._pending:
+                return
+            if self._future is not None and not self._future.done():
+                return
+            self._future = self._executor.submit(self._refresh)
+    
+    def _refresh(self):
+        """Fold pending turns into the summary until none are left."""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                summary = self.summary
+            
+            max_words = self.summary_tokens * 3 // 4
+            prompt = create_summary_prompt(summary, batch, max_words)
+            updated = self.gemini_client.generate(prompt, temperature=0.3, max_tokens=self.summary_tokens)
+            
+            if not updated or updated.startswith("I apologize, but I encountered an error"):
+                # Fall back to an extractive summary so earlier questions are not lost
+                asked = "; ".join(query for query, _ in batch)
+                updated = f"{summary} Earlier the seeker asked: {asked}.".strip()
+            
+            with self._lock:
+                self.summary = clip_to_tokens(updated.strip(), self.summary_tokens)
+    
+    def render(self) -> str:
+        """
+        Build the context for the next question.
+        
+        Returns:
+            Summary and recent turns, clipped to the token budget
+        """
+        with self._lock:
+            summary = self.summary
+            turns = list(self._turns)
+        
+        if not summary and not turns:
+            return ''
+        
+        parts = []
+        remaining = self.token_budget
+        if summary:
+            parts.append(f"Summary: {summary}")
+            remaining -= estimate_tokens(parts[0])
+        
+        if turns and remaining > 0:
+            # Share what is left of the budget evenly, minus room for the labels
+            per_turn = max(remaining // len(turns) - 8, 0)
+            for query, response in turns:
+                query_text = clip_to_tokens(query, per_turn // 4)
+                response_text = clip_to_tokens(response, max(per_turn - estimate_tokens(query_text), 0))
+                parts.append(f"Seeker: {query_text}\nKrishna: {response_text}")
+        
+        return "\n\n".join(parts)
+    
+    def clear(self):
+        """Forget the conversation."""
+        with self._lock:
+            self.summary = ''
+            self.turns_asked = 0
+            self._turns.clear()
+            self._pending = []
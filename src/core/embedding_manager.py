@@ -1,41 +1,85 @@
 """ChromaDB embedding manager for persistent vector storage."""
 
+import hashlib
+import json
+import threading
+import time
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
-from config.settings import CHROMADB_PATH, CHROMADB_COLLECTION_NAME
+from config.settings import (
+    CHROMADB_PATH, CHROMADB_COLLECTION_NAME, GEMINI_EMBEDDING_MODEL, STATS_CACHE_TTL, SNAPSHOT_MANIFEST_NAME,
+    READINESS_RETRY_SECONDS
+)
 from .gemini_client import GeminiClient
 from .data_processor import DataProcessor
+from .telemetry import span
 
 
 class EmbeddingManager:
-    """Manage ChromaDB embeddings for Bhagavad Gita."""
+    """
+    Manage ChromaDB embeddings for Bhagavad Gita.
     
-    def __init__(self):
-        """Initialize embedding manager."""
+    Statistics and the readiness probe are cached process-wide per storage
+    path, so Streamlit reruns and new sessions do not query Chroma again.
+    """
+    
+    # Storage path -> (version, expiry, stats)
+    _stats_cache: Dict[str, Tuple] = {}
+    # Storage path -> (expiry or None, readiness result); ready is kept for good
+    _readiness: Dict[str, Tuple] = {}
+    # Storage paths whose collection was already announced
+    _announced = set()
+    _cache_lock = threading.Lock()
+    _readiness_lock = threading.Lock()
+    
+    def __init__(self, gemini_client=None, chromadb_path: str = None, data_processor=None):
+        """
+        Initialize embedding manager.
+        
+        Args:
+            gemini_client: Client for embeddings (defaults to a new GeminiClient)
+            chromadb_path: ChromaDB directory (defaults to CHROMADB_PATH)
+            data_processor: Verse source for create_embeddings (defaults to DataProcessor())
+        """
+        if chromadb_path is None:
+            chromadb_path = CHROMADB_PATH
+        self.chromadb_path = Path(chromadb_path)
         try:
             # Try to use persistent client (works locally and reads from GitHub on cloud)
-            self.client = chromadb.PersistentClient(path=CHROMADB_PATH)
+            self.client = chromadb.PersistentClient(path=str(chromadb_path))
         except Exception as e:
             print(f"Note: Using read-only mode - {e}")
             # Fallback: still try persistent client, it can read even if it can't write
-            self.client = chromadb.PersistentClient(path=CHROMADB_PATH)
+            self.client = chromadb.PersistentClient(path=str(chromadb_path))
         
-        self.gemini_client = GeminiClient()
+        self.gemini_client = gemini_client if gemini_client is not None else GeminiClient()
+        self.data_processor = data_processor
         self.collection = None
     
     def initialize_collection(self):
-        """Initialize or get existing collection."""
+        """Initialize or get existing collection (announced once per process)."""
+        if self.collection is not None:
+            return
+        
         try:
             self.collection = self.client.get_or_create_collection(
                 name=CHROMADB_COLLECTION_NAME,
                 metadata={"description": "Bhagavad Gita verses with embeddings"}
             )
-            print(f"Collection '{CHROMADB_COLLECTION_NAME}' initialized")
-            print(f"Current count: {self.collection.count()} verses")
         except Exception as e:
             print(f"Error initializing collection: {e}")
+            return
+        
+        with self._cache_lock:
+            first = str(self.chromadb_path) not in self._announced
+            self._announced.add(str(self.chromadb_path))
+        if first:
+            print(f"Collection '{CHROMADB_COLLECTION_NAME}' initialized")
+            print(f"Current count: {self.get_stats()['total_verses']} verses")
     
     def create_embeddings(self, force_recreate: bool = False):
         """
@@ -57,10 +101,11 @@ class EmbeddingManager:
         if force_recreate and self.collection.count() > 0:
             print("Deleting existing embeddings...")
             self.client.delete_collection(CHROMADB_COLLECTION_NAME)
+            self.collection = None
             self.initialize_collection()
         
         # Load and process data
-        processor = DataProcessor()
+        processor = self.data_processor or DataProcessor()
         verses_data = processor.process_for_embeddings()
         
         # Deduplicate by verse ID (keep first occurrence)
@@ -100,6 +145,10 @@ class EmbeddingManager:
             print(f"Processed {min(i + batch_size, len(unique_verses))}/{len(unique_verses)} verses")
         
         print(f"✅ Created embeddings for {len(unique_verses)} verses")
+        
+        self._invalidate()
+        manifest_path = self.write_manifest()
+        print(f"Snapshot manifest: {manifest_path}")
     
     def search(
         self,
@@ -118,32 +167,37 @@ class EmbeddingManager:
         Returns:
             List of matching verses with metadata
         """
-        if self.collection is None:
-            self.initialize_collection()
-        
-        # Create query embedding
-        query_embedding = self.gemini_client.create_query_embedding(query)
-        
-        # Search
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k,
-            where=filter_metadata,
-            include=['documents', 'metadatas', 'distances']
-        )
-        
-        # Format results
-        formatted_results = []
-        if results['ids'] and len(results['ids'][0]) > 0:
-            for i in range(len(results['ids'][0])):
-                formatted_results.append({
-                    'id': results['ids'][0][i],
-                    'text': results['documents'][0][i],
-                    'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i]
-                })
-        
-        return formatted_results
+        with span('embedding.search', backend='chroma', top_k=top_k) as current:
+            if self.collection is None:
+                self.initialize_collection()
+            
+            # Create query embedding
+            query_embedding = self.gemini_client.create_query_embedding(query)
+            if not query_embedding:
+                # Embedding failed (e.g. quota exceeded); answer without verses
+                return []
+            
+            # Search
+            results = self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=top_k,
+                where=filter_metadata,
+                include=['documents', 'metadatas', 'distances']
+            )
+            
+            # Format results
+            formatted_results = []
+            if results['ids'] and len(results['ids'][0]) > 0:
+                for i in range(len(results['ids'][0])):
+                    formatted_results.append({
+                        'id': results['ids'][0][i],
+                        'text': results['documents'][0][i],
+                        'metadata': results['metadatas'][0][i],
+                        'distance': results['distances'][0][i]
+                    })
+            
+            current.set_attribute('results', len(formatted_results))
+            return formatted_results
     
     def get_verse_by_id(self, verse_id: str) -> Optional[Dict]:
         """
@@ -175,13 +229,164 @@ class EmbeddingManager:
         
         return None
     
-    def get_stats(self) -> Dict:
-        """Get collection statistics."""
+    def get_all_embeddings(self) -> Dict:
+        """
+        Get every stored verse embedding.
+        
+        Returns:
+            Dictionary with 'ids', 'embeddings' and 'metadatas' lists
+        """
         if self.collection is None:
             self.initialize_collection()
         
+        result = self.collection.get(include=['embeddings', 'metadatas'])
+        
         return {
+            'ids': result['ids'],
+            'embeddings': result['embeddings'] if result['embeddings'] is not None else [],
+            'metadatas': result['metadatas']
+        }
+    
+    def _version(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the Chroma database, which change on every write."""
+        try:
+            stat = (self.chromadb_path / 'chroma.sqlite3').stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _invalidate(self):
+        """Drop cached statistics and readiness after the collection changed."""
+        key = str(self.chromadb_path)
+        with self._cache_lock:
+            self._stats_cache.pop(key, None)
+        with self._readiness_lock:
+            self._readiness.pop(key, None)
+    
+    def get_stats(self) -> Dict:
+        """
+        Get collection statistics.
+        
+        Counted once and cached process-wide until the database changes
+        on disk or STATS_CACHE_TTL passes.
+        """
+        key = str(self.chromadb_path)
+        version = self._version()
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._stats_cache.get(key)
+        if cached is not None and cached[0] == version and now < cached[1]:
+            return dict(cached[2])
+        
+        if self.collection is None:
+            self.initialize_collection()
+        
+        stats = {
             'total_verses': self.collection.count(),
             'collection_name': CHROMADB_COLLECTION_NAME,
-            'storage_path': CHROMADB_PATH
+            'storage_path': str(self.chromadb_path)
+        }
+        with self._cache_lock:
+            self._stats_cache[key] = (version, now + STATS_CACHE_TTL, stats)
+        return dict(stats)
+    
+    def snapshot_checksum(self) -> str:
+        """
+        Checksum the stored verses and embeddings.
+        
+        Covers content rather than files, because Chroma rewrites its files
+        when a store is opened.
+        """
+        if self.collection is None:
+            self.initialize_collection()
+        
+        stored = self.collection.get(include=['embeddings', 'documents', 'metadatas'])
+        digest = hashlib.sha256()
+        for i in sorted(range(len(stored['ids'])), key=lambda i: stored['ids'][i]):
+            record = [stored['ids'][i], stored['documents'][i], stored['metadatas'][i]]
+            digest.update(json.dumps(record, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            digest.update(np.asarray(stored['embeddings'][i], dtype=np.float32).tobytes())
+        return digest.hexdigest()
+    
+    def write_manifest(self) -> str:
+        """
+        Record the expected count and checksum next to the store.
+        
+        Returns:
+            Path to the manifest
+        """
+        manifest = {
+            'collection_name': CHROMADB_COLLECTION_NAME,
+            'count': self.get_stats()['total_verses'],
+            'checksum': self.snapshot_checksum(),
+            'embedding_model': GEMINI_EMBEDDING_MODEL,
+            'created_at': datetime.now().isoformat()
         }
+        manifest_path = self.chromadb_path / SNAPSHOT_MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        tmp_path.replace(manifest_path)
+        
+        # The next readiness check verifies against the new manifest
+        with self._readiness_lock:
+            self._readiness.pop(str(self.chromadb_path), None)
+        return str(manifest_path)
+    
+    def readiness(self) -> Dict:
+        """
+        Check the store: verses present and, when a snapshot manifest
+        exists, matching its count and checksum.
+        
+        A ready store is checked once per process; a failed check is reused
+        for READINESS_RETRY_SECONDS, then run again, so a store that is
+        restored or rebuilt becomes ready without a restart.
+        
+        Returns:
+            Dictionary with 'ready', 'total_verses', 'expected_verses',
+            'snapshot' ('verified', 'unverified' or 'mismatch') and 'problems'
+        """
+        key = str(self.chromadb_path)
+        with self._readiness_lock:
+            cached = self._readiness.get(key)
+            if cached is not None and (cached[0] is None or time.monotonic() < cached[0]):
+                return dict(cached[1])
+            
+            problems = []
+            expected = None
+            snapshot = 'unverified'
+            try:
+                total = self.get_stats()['total_verses']
+                if total == 0:
+                    problems.append("Collection is empty")
+                
+                manifest_path = self.chromadb_path / SNAPSHOT_MANIFEST_NAME
+                if manifest_path.exists():
+                    with open(manifest_path, 'r', encoding='utf-8') as f:
+                        manifest = json.load(f)
+                    expected = manifest.get('count')
+                    if expected != total:
+                        snapshot = 'mismatch'
+                        problems.append(f"Expected {expected} verses, found {total}")
+                    elif manifest.get('checksum') != self.snapshot_checksum():
+                        snapshot = 'mismatch'
+                        problems.append("Stored verses differ from the snapshot manifest")
+                    else:
+                        snapshot = 'verified'
+            except Exception as e:
+                total = 0
+                problems.append(f"Could not read collection: {e}")
+            
+            result = {
+                'ready': not problems,
+                'total_verses': total,
+                'expected_verses': expected,
+                'snapshot': snapshot,
+                'problems': problems
+            }
+            expiry = None if result['ready'] else time.monotonic() + READINESS_RETRY_SECONDS
+            self._readiness[key] = (expiry, result)
+        
+        print(f"Readiness: {'ready' if result['ready'] else 'NOT READY'} "
+              f"({total} verses, snapshot {snapshot}){''.join(f'; {p}' for p in problems)}")
+        return dict(result)
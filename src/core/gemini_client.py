@@ -1,9 +1,62 @@
 """Gemini API client for embeddings and text generation."""
 
 import google.generativeai as genai
-from typing import List, Optional
+from typing import Dict, List, Optional
+import threading
 import time
-from config.settings import GOOGLE_API_KEY, GEMINI_MODEL, GEMINI_EMBEDDING_MODEL
+from cachetools import LRUCache
+from config.settings import GOOGLE_API_KEY, GEMINI_MODEL, GEMINI_EMBEDDING_MODEL, QUERY_EMBEDDING_CACHE_SIZE
+from .normalize import normalize_query
+from .rate_limiter import get_rate_limiter
+from .telemetry import record_api_call, record_cache, span
+
+
+# Process-wide cache of query embeddings, shared by every session
+_query_embedding_cache = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+_query_embedding_lock = threading.Lock()
+
+
+# Per-thread API usage, so a caller can attribute usage to its own work
+_usage = threading.local()
+
+
+def clear_query_embedding_cache():
+    """Drop every cached query embedding."""
+    with _query_embedding_lock:
+        _query_embedding_cache.clear()
+
+
+def reset_usage():
+    """Start counting API usage for the current thread."""
+    _usage.stats = {'calls': 0, 'errors': 0, 'prompt_tokens': 0, 'output_tokens': 0}
+
+
+def get_usage() -> Dict:
+    """Get API usage of the current thread since reset_usage."""
+    if not hasattr(_usage, 'stats'):
+        reset_usage()
+    return dict(_usage.stats)
+
+
+def _record_usage(usage_metadata=None, error: bool = False, kind: str = 'generate'):
+    """Add one API call to the current thread's usage and the telemetry counters."""
+    record_api_call(kind, usage_metadata, error)
+    if not hasattr(_usage, 'stats'):
+        reset_usage()
+    stats = _usage.stats
+    stats['calls'] += 1
+    if error:
+        stats['errors'] += 1
+    if usage_metadata is not None:
+        stats['prompt_tokens'] += getattr(usage_metadata, 'prompt_token_count', 0) or 0
+        stats['output_tokens'] += getattr(usage_metadata, 'candidates_token_count', 0) or 0
+
+
+def _wait_for_quota(kind: str):
+    """Block until the shared rate limiter allows another call."""
+    limiter = get_rate_limiter(kind)
+    if limiter is not None:
+        limiter.acquire()
 
 
 class GeminiClient:
@@ -28,37 +81,56 @@ class GeminiClient:
         Returns:
             List of floats representing the embedding
         """
-        try:
-            result = genai.embed_content(
-                model=self.embedding_model,
-                content=text,
-                task_type="retrieval_document"
-            )
-            return result['embedding']
-        except Exception as e:
-            print(f"Error creating embedding: {e}")
-            return []
+        with span('gemini.embed'):
+            try:
+                _wait_for_quota('embed')
+                result = genai.embed_content(
+                    model=self.embedding_model,
+                    content=text,
+                    task_type="retrieval_document"
+                )
+                _record_usage(kind='embed')
+                return result['embedding']
+            except Exception as e:
+                _record_usage(error=True, kind='embed')
+                print(f"Error creating embedding: {e}")
+                return []
     
     def create_query_embedding(self, query: str) -> List[float]:
         """
         Create embedding for search query.
         
+        Embeddings are cached process-wide by normalized query text.
+        
         Args:
             query: Search query
             
         Returns:
             List of floats representing the embedding
         """
-        try:
-            result = genai.embed_content(
-                model=self.embedding_model,
-                content=query,
-                task_type="retrieval_query"
-            )
-            return result['embedding']
-        except Exception as e:
-            print(f"Error creating query embedding: {e}")
-            return []
+        cache_key = normalize_query(query)
+        with _query_embedding_lock:
+            cached = _query_embedding_cache.get(cache_key)
+        record_cache('query_embedding', cached is not None)
+        if cached is not None:
+            return cached
+        
+        with span('gemini.embed_query'):
+            try:
+                _wait_for_quota('embed')
+                result = genai.embed_content(
+                    model=self.embedding_model,
+                    content=query,
+                    task_type="retrieval_query"
+                )
+                _record_usage(kind='embed')
+                with _query_embedding_lock:
+                    _query_embedding_cache[cache_key] = result['embedding']
+                return result['embedding']
+            except Exception as e:
+                _record_usage(error=True, kind='embed')
+                print(f"Error creating query embedding: {e}")
+                return []
     
     def generate(
         self, 
@@ -77,25 +149,29 @@ class GeminiClient:
         Returns:
             Generated text
         """
-        try:
-            generation_config = {
-                "temperature": temperature,
-                "top_p": 0.95,
-                "top_k": 40,
-            }
-            if max_tokens:
-                generation_config["max_output_tokens"] = max_tokens
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
-            
-            # Return text - Gemini handles UTF-8 properly
-            return response.text
-        except Exception as e:
-            print(f"Error generating response: {e}")
-            return f"I apologize, but I encountered an error: {str(e)}"
+        with span('gemini.generate', model=GEMINI_MODEL):
+            try:
+                generation_config = {
+                    "temperature": temperature,
+                    "top_p": 0.95,
+                    "top_k": 40,
+                }
+                if max_tokens:
+                    generation_config["max_output_tokens"] = max_tokens
+                
+                _wait_for_quota('generate')
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config
+                )
+                _record_usage(getattr(response, 'usage_metadata', None))
+                
+                # Return text - Gemini handles UTF-8 properly
+                return response.text
+            except Exception as e:
+                _record_usage(error=True)
+                print(f"Error generating response: {e}")
+                return f"I apologize, but I encountered an error: {str(e)}"
     
     def generate_stream(
         self,
@@ -112,21 +188,25 @@ class GeminiClient:
         Yields:
             Text chunks as they're generated
         """
-        try:
-            generation_config = {
-                "temperature": temperature,
-                "top_p": 0.95,
-                "top_k": 40,
-            }
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                stream=True
-            )
-            
-            for chunk in response:
-                if chunk.text:
-                    yield chunk.text
-        except Exception as e:
-            yield f"Error: {str(e)}"
+        with span('gemini.generate_stream', model=GEMINI_MODEL):
+            try:
+                generation_config = {
+                    "temperature": temperature,
+                    "top_p": 0.95,
+                    "top_k": 40,
+                }
+                
+                _wait_for_quota('generate')
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    stream=True
+                )
+                
+                for chunk in response:
+                    if chunk.text:
+                        yield chunk.text
+                _record_usage(getattr(response, 'usage_metadata', None))
+            except Exception as e:
+                _record_usage(error=True)
+                yield f"Error: {str(e)}"
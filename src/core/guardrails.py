@@ -0,0 +1,148 @@
+"""Compiled guardrail matcher for classifying queries against a lexicon."""
+
+import re
+import threading
+import unicodedata
+import yaml
+from pathlib import Path
+from typing import Dict, Iterable, List
+from config.settings import GUARDRAILS_PATH
+
+
+# Word characters, including Devanagari vowel signs and viramas, which
+# Python's \w (and so \b) does not treat as part of a word
+WORD_CHARS = r'\w\u0900-\u097F\uA8E0-\uA8FF'
+WORD_START = f'(?<![{WORD_CHARS}])'
+WORD_END = f'(?![{WORD_CHARS}])'
+
+_PREFIX = '*'
+_END = ''
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for matching.
+    
+    Case-folds, drops Latin diacritics (so IAST transliteration matches
+    plain ASCII), keeps Devanagari intact and collapses whitespace.
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    stripped = ''.join(ch for ch in decomposed if not '\u0300' <= ch <= '\u036f')
+    return ' '.join(unicodedata.normalize('NFC', stripped).split())
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Turn a character trie into a prefix-factored regex."""
+    if _PREFIX in node:
+        # A prefix term ends here; longer terms add nothing
+        return ''
+    
+    alternatives = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char != _END
+    ]
+    if _END in node:
+        alternatives.append(WORD_END)
+    
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+def compile_terms(terms: Iterable[str]) -> str:
+    """
+    Compile terms into one regex whose cost does not grow with the term count.
+    
+    Args:
+        terms: Terms; a trailing '*' makes a term match any word it starts
+        
+    Returns:
+        Regex source (without the leading word boundary)
+    """
+    trie = {}
+    for term in terms:
+        prefix = term.endswith(_PREFIX)
+        term = normalize_text(term.rstrip(_PREFIX))
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_PREFIX if prefix else _END] = True
+    return _trie_pattern(trie) if trie else ''
+
+
+class GuardrailMatcher:
+    """
+    Classify queries against a multilingual lexicon in a single pass.
+    
+    Every category's terms are folded into one trie-shaped regex with a
+    named group per category, so a query is scanned once however many
+    terms the lexicon holds. Terms match whole words only: "kill" does
+    not match "skill".
+    """
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, lexicon_path: str = GUARDRAILS_PATH):
+        """
+        Initialize matcher.
+        
+        Args:
+            lexicon_path: YAML file with a 'categories' mapping of name to terms
+        """
+        self.lexicon_path = Path(lexicon_path)
+        self.categories = self._load_lexicon()
+        
+        groups = [
+            f'(?P<{name}>{pattern})'
+            for name, pattern in (
+                (name, compile_terms(terms)) for name, terms in self.categories.items()
+            )
+            if pattern
+        ]
+        # Zero-width, so a term overlapping an earlier match is still found at its own word start
+        self._pattern = re.compile(f"{WORD_START}(?=(?:{'|'.join(groups)}))") if groups else None
+    
+    @classmethod
+    def shared(cls) -> 'GuardrailMatcher':
+        """Get the process-wide matcher, compiling the lexicon on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def _load_lexicon(self) -> Dict[str, List[str]]:
+        """Load lexicon categories."""
+        if not self.lexicon_path.exists():
+            print(f"Warning: guardrail lexicon not found: {self.lexicon_path}")
+            return {}
+        
+        with open(self.lexicon_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        
+        return {
+            name: [str(term) for term in (terms or [])]
+            for name, terms in config.get('categories', {}).items()
+        }
+    
+    def classify(self, query: str) -> Dict[str, List[str]]:
+        """
+        Find lexicon terms in a query.
+        
+        Args:
+            query: User query
+            
+        Returns:
+            Mapping of matched category to the matched text, in query order
+        """
+        if self._pattern is None:
+            return {}
+        
+        matches = {}
+        for match in self._pattern.finditer(normalize_text(query)):
+            category = match.lastgroup
+            matches.setdefault(category, []).append(match.group(category))
+        return matches
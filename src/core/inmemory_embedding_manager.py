@@ -4,14 +4,22 @@ from typing import List, Dict, Optional
 import numpy as np
 from src.core.gemini_client import GeminiClient
 from src.core.data_processor import DataProcessor
+from src.core.telemetry import span
 
 
 class InMemoryEmbeddingManager:
     """Manage embeddings in memory for Streamlit Cloud (read-only filesystem)."""
     
-    def __init__(self):
-        """Initialize in-memory embedding manager."""
-        self.gemini_client = GeminiClient()
+    def __init__(self, gemini_client=None, data_processor=None):
+        """
+        Initialize in-memory embedding manager.
+        
+        Args:
+            gemini_client: Client for embeddings (defaults to a new GeminiClient)
+            data_processor: Verse source for create_embeddings (defaults to DataProcessor())
+        """
+        self.gemini_client = gemini_client if gemini_client is not None else GeminiClient()
+        self.data_processor = data_processor
         self.embeddings_data = {
             'ids': [],
             'embeddings': [],
@@ -46,7 +54,7 @@ class InMemoryEmbeddingManager:
             }
         
         # Load and process data
-        processor = DataProcessor()
+        processor = self.data_processor or DataProcessor()
         verses_data = processor.process_for_embeddings()
         
         # Deduplicate by verse ID
@@ -96,35 +104,40 @@ class InMemoryEmbeddingManager:
         Returns:
             List of matching verses with metadata
         """
-        if len(self.embeddings_data['ids']) == 0:
-            return []
-        
-        # Create query embedding
-        query_embedding = self.gemini_client.create_query_embedding(query)
-        
-        # Calculate cosine similarities
-        similarities = []
-        for i, emb in enumerate(self.embeddings_data['embeddings']):
-            # Cosine similarity
-            similarity = np.dot(query_embedding, emb) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(emb)
-            )
-            similarities.append((i, similarity))
-        
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        # Get top k results
-        results = []
-        for idx, similarity in similarities[:top_k]:
-            results.append({
-                'id': self.embeddings_data['ids'][idx],
-                'text': self.embeddings_data['documents'][idx],
-                'metadata': self.embeddings_data['metadatas'][idx],
-                'distance': 1 - similarity  # Convert similarity to distance
-            })
-        
-        return results
+        with span('embedding.search', backend='memory', top_k=top_k) as current:
+            if len(self.embeddings_data['ids']) == 0:
+                return []
+            
+            # Create query embedding
+            query_embedding = self.gemini_client.create_query_embedding(query)
+            if not query_embedding:
+                # Embedding failed (e.g. quota exceeded); answer without verses
+                return []
+            
+            # Calculate cosine similarities
+            similarities = []
+            for i, emb in enumerate(self.embeddings_data['embeddings']):
+                # Cosine similarity
+                similarity = np.dot(query_embedding, emb) / (
+                    np.linalg.norm(query_embedding) * np.linalg.norm(emb)
+                )
+                similarities.append((i, similarity))
+            
+            # Sort by similarity (descending)
+            similarities.sort(key=lambda x: x[1], reverse=True)
+            
+            # Get top k results
+            results = []
+            for idx, similarity in similarities[:top_k]:
+                results.append({
+                    'id': self.embeddings_data['ids'][idx],
+                    'text': self.embeddings_data['documents'][idx],
+                    'metadata': self.embeddings_data['metadatas'][idx],
+                    'distance': 1 - similarity  # Convert similarity to distance
+                })
+            
+            current.set_attribute('results', len(results))
+            return results
     
     def get_verse_by_id(self, verse_id: str) -> Optional[Dict]:
         """
@@ -146,6 +159,19 @@ class InMemoryEmbeddingManager:
         except ValueError:
             return None
     
+    def get_all_embeddings(self) -> Dict:
+        """
+        Get every stored verse embedding.
+        
+        Returns:
+            Dictionary with 'ids', 'embeddings' and 'metadatas' lists
+        """
+        return {
+            'ids': self.embeddings_data['ids'],
+            'embeddings': self.embeddings_data['embeddings'],
+            'metadatas': self.embeddings_data['metadatas']
+        }
+    
     def get_stats(self) -> Dict:
         """Get collection statistics."""
         return {
@@ -153,3 +179,14 @@ class InMemoryEmbeddingManager:
             'collection_name': 'in_memory_bhagavad_gita',
             'storage_path': 'memory'
         }
+    
+    def readiness(self) -> Dict:
+        """Check that verses are loaded (there is no snapshot to verify)."""
+        total = len(self.embeddings_data['ids'])
+        return {
+            'ready': total > 0,
+            'total_verses': total,
+            'expected_verses': None,
+            'snapshot': 'unverified',
+            'problems': [] if total else ["No embeddings loaded"]
+        }
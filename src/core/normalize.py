@@ -0,0 +1,6 @@
+"""Query normalization shared by the caches, free of API dependencies."""
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (case and whitespace)."""
+    return " ".join(query.lower().split())
@@ -1,17 +1,39 @@
 """Query handler orchestrating the complete RAG pipeline."""
 
+import threading
 from typing import Dict, Generator
+from .answer_cache import AnswerCache
 from .context_engineer import ContextEngineer
-from .gemini_client import GeminiClient
+from .telemetry import span
 
 
 class QueryHandler:
     """Handle queries through the complete RAG pipeline."""
     
-    def __init__(self):
-        """Initialize query handler."""
-        self.context_engineer = ContextEngineer()
-        self.gemini_client = GeminiClient()
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, context_engineer: ContextEngineer = None, gemini_client=None, answer_cache: AnswerCache = None):
+        """
+        Initialize query handler.
+        
+        Args:
+            context_engineer: Pipeline to answer with (defaults to a new ContextEngineer
+                using gemini_client)
+            gemini_client: Gemini client (defaults to the context engineer's)
+            answer_cache: Precomputed answers checked first (defaults to the shared cache)
+        """
+        self.context_engineer = context_engineer or ContextEngineer(gemini_client=gemini_client)
+        self.gemini_client = gemini_client or self.context_engineer.gemini_client
+        self.answer_cache = answer_cache or AnswerCache.shared()
+    
+    @classmethod
+    def shared(cls) -> 'QueryHandler':
+        """Get the process-wide pipeline shared by every session."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
     
     def process_query(
         self,
@@ -19,29 +41,48 @@ class QueryHandler:
         tone: str = 'modern',
         language: str = 'english',
         search_mode: str = 'gita',
-        stream: bool = False
+        stream: bool = False,
+        history: str = '',
+        follow_up: bool = None
     ):
         """
         Process query through RAG pipeline.
         
+        Questions answered ahead by the nightly precompute job are served
+        from the answer cache without retrieval or generation, but only when
+        the question does not follow earlier turns: then the answer must
+        take them into account.
+        
         Args:
             query: User query
             tone: Response tone
             language: Response language
             search_mode: 'gita' or 'universal'
             stream: Whether to stream response
-            
+            history: Bounded summary of earlier turns (see ConversationContext)
+            follow_up: Whether the question follows turns asked in this
+                conversation (defaults to whether history is given; history
+                seeded from past sessions alone is not a follow-up)
+                
         Returns:
             Response string or generator if streaming
         """
+        if follow_up is None:
+            follow_up = bool(history)
+        cached = None if follow_up else self.answer_cache.get(query, tone, language, search_mode)
+        if cached is not None:
+            return iter([cached]) if stream else cached
+        
         if stream:
-            return self._process_query_stream(query, tone, language, search_mode)
-        else:
+            return self._process_query_stream(query, tone, language, search_mode, history)
+        
+        with span('query.process', tone=tone, language=language, search_mode=search_mode, stream=False):
             return self.context_engineer.engineer_response(
                 query=query,
                 tone=tone,
                 language=language,
-                search_mode=search_mode
+                search_mode=search_mode,
+                history=history
             )
     
     def _process_query_stream(
@@ -49,15 +90,16 @@ class QueryHandler:
         query: str,
         tone: str,
         language: str,
-        search_mode: str
+        search_mode: str,
+        history: str = ''
     ) -> Generator[str, None, None]:
         """Process query with streaming response."""
-        # For now, return non-streaming response
-        # Streaming can be enhanced later
-        response = self.context_engineer.engineer_response(
-            query=query,
-            tone=tone,
-            language=language,
-            search_mode=search_mode
-        )
-        yield response
+        # The span covers the whole stream, so it ends when the consumer finishes
+        with span('query.process', tone=tone, language=language, search_mode=search_mode, stream=True):
+            yield from self.context_engineer.engineer_response_stream(
+                query=query,
+                tone=tone,
+                language=language,
+                search_mode=search_mode,
+                history=history
+            )
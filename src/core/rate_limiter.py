@@ -0,0 +1,93 @@
+"""Process-wide rate limiting for Gemini API calls."""
+
+import threading
+import time
+from typing import Dict, Optional
+from config.settings import GEMINI_RATE_LIMITS
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    Allows bursts of up to ``capacity`` calls, refilled at ``rate`` calls
+    per second. ``acquire`` blocks until a token is available.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst (defaults to one second's worth, at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        """Add tokens for the time elapsed since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def available(self) -> float:
+        """Tokens that could be taken right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+    
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting for them if needed.
+        
+        Args:
+            tokens: Tokens to take
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if acquired, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+# One bucket per API kind, shared by every session and worker thread
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(kind: str) -> Optional[TokenBucket]:
+    """
+    Get the shared bucket for an API kind.
+    
+    Args:
+        kind: Key of GEMINI_RATE_LIMITS ('generate' or 'embed')
+        
+    Returns:
+        TokenBucket, or None when the kind is not limited
+    """
+    per_minute = GEMINI_RATE_LIMITS.get(kind)
+    if not per_minute:
+        return None
+    
+    with _buckets_lock:
+        if kind not in _buckets:
+            _buckets[kind] = TokenBucket(per_minute / 60.0)
+        return _buckets[kind]
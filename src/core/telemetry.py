@@ -0,0 +1,157 @@
+"""
+Tracing and metrics for the RAG pipeline.
+
+Instrumentation uses the OpenTelemetry API, which is a no-op until
+configure_telemetry installs the SDK. When TELEMETRY_ENABLED is set, spans
+and metrics are written as JSON Lines under TELEMETRY_DIR:
+    spans-<date>-<pid>.jsonl     One span per line
+    metrics-<date>-<pid>.jsonl   Metric snapshots every TELEMETRY_EXPORT_INTERVAL
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Optional
+from opentelemetry import metrics, trace
+from config.settings import TELEMETRY_ENABLED, TELEMETRY_DIR, TELEMETRY_EXPORT_INTERVAL
+
+
+_tracer = trace.get_tracer('drishti')
+_meter = metrics.get_meter('drishti')
+
+# Instruments bind to the real provider once configure_telemetry runs
+_latency = _meter.create_histogram(
+    'drishti.operation.duration', unit='ms',
+    description="Latency of pipeline operations, by operation"
+)
+_tokens = _meter.create_counter(
+    'drishti.gemini.tokens', unit='{token}',
+    description="Gemini tokens, by direction (prompt/output)"
+)
+_api_calls = _meter.create_counter(
+    'drishti.gemini.calls', unit='{call}',
+    description="Gemini API calls, by outcome"
+)
+_cache_lookups = _meter.create_counter(
+    'drishti.cache.lookups', unit='{lookup}',
+    description="Cache lookups, by cache and hit"
+)
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_telemetry(enabled: bool = TELEMETRY_ENABLED, output_dir: Optional[str] = None) -> bool:
+    """
+    Install file exporters for spans and metrics, once per process.
+    
+    Args:
+        enabled: Install exporters (defaults to TELEMETRY_ENABLED)
+        output_dir: Directory for the files (defaults to TELEMETRY_DIR)
+        
+    Returns:
+        True if telemetry is being recorded
+    """
+    global _configured
+    if not enabled:
+        return _configured
+    
+    with _configure_lock:
+        if _configured:
+            return True
+        
+        try:
+            from opentelemetry.sdk.metrics import MeterProvider
+            from opentelemetry.sdk.metrics.export import ConsoleMetricExporter, PeriodicExportingMetricReader
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        except ImportError:
+            print("Note: opentelemetry-sdk not installed, telemetry disabled")
+            return False
+        
+        output_dir = Path(output_dir or TELEMETRY_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        suffix = f"{date.today().isoformat()}-{os.getpid()}.jsonl"
+        # Line buffered and left open: the providers flush into them at exit
+        span_file = open(output_dir / f"spans-{suffix}", 'a', encoding='utf-8', buffering=1)
+        metric_file = open(output_dir / f"metrics-{suffix}", 'a', encoding='utf-8', buffering=1)
+        
+        resource = Resource.create({'service.name': 'drishti-ai'})
+        tracer_provider = TracerProvider(resource=resource)
+        tracer_provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter(
+            out=span_file,
+            formatter=lambda span: span.to_json(indent=None) + '\n'
+        )))
+        trace.set_tracer_provider(tracer_provider)
+        
+        reader = PeriodicExportingMetricReader(
+            ConsoleMetricExporter(out=metric_file, formatter=lambda data: data.to_json(indent=None) + '\n'),
+            export_interval_millis=TELEMETRY_EXPORT_INTERVAL * 1000
+        )
+        metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[reader]))
+        
+        _configured = True
+        print(f"Telemetry: writing spans and metrics to {output_dir}")
+        return True
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Trace a block and record its latency.
+    
+    Exceptions are recorded on the span and re-raised.
+    
+    Args:
+        name: Operation name, e.g. 'embedding.search'
+        **attributes: Span attributes (None values are dropped)
+    """
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    start = time.perf_counter()
+    try:
+        with _tracer.start_as_current_span(name, attributes=attributes) as current:
+            yield current
+    finally:
+        _latency.record((time.perf_counter() - start) * 1000, {'operation': name})
+
+
+def traced(name: str):
+    """Decorator form of span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_api_call(kind: str, usage_metadata=None, error: bool = False):
+    """
+    Count a Gemini call and its tokens.
+    
+    Args:
+        kind: 'embed' or 'generate'
+        usage_metadata: Response usage, if the API reported it
+        error: Whether the call failed
+    """
+    _api_calls.add(1, {'kind': kind, 'outcome': 'error' if error else 'ok'})
+    if usage_metadata is not None:
+        prompt_tokens = getattr(usage_metadata, 'prompt_token_count', 0) or 0
+        output_tokens = getattr(usage_metadata, 'candidates_token_count', 0) or 0
+        _tokens.add(prompt_tokens, {'kind': kind, 'direction': 'prompt'})
+        _tokens.add(output_tokens, {'kind': kind, 'direction': 'output'})
+        trace.get_current_span().set_attributes({
+            'gemini.prompt_tokens': prompt_tokens,
+            'gemini.output_tokens': output_tokens
+        })
+
+
+def record_cache(cache: str, hit: bool):
+    """Count a cache lookup."""
+    _cache_lookups.add(1, {'cache': cache, 'hit': hit})
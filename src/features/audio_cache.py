@@ -0,0 +1,165 @@
+"""Content-addressed cache for synthesized speech."""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from config.settings import AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES, AUDIO_HOT_CACHE_MAX_BYTES
+from src.core.telemetry import record_cache
+
+
+class AudioCache:
+    """
+    Two-tier LRU cache of audio keyed by a stable digest of its inputs.
+    
+    The hot tier keeps recently used clips in memory; the disk tier keeps
+    up to ``max_bytes`` of clips and evicts the least recently used ones.
+    """
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        cache_dir: str = AUDIO_CACHE_DIR,
+        max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+        hot_max_bytes: int = AUDIO_HOT_CACHE_MAX_BYTES
+    ):
+        """
+        Initialize audio cache.
+        
+        Args:
+            cache_dir: Directory of the disk tier
+            max_bytes: Size cap of the disk tier
+            hot_max_bytes: Size cap of the in-memory tier
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hot_max_bytes = hot_max_bytes
+        
+        self._lock = threading.Lock()
+        self._hot = OrderedDict()
+        self._hot_bytes = 0
+        self._disk_bytes = None
+    
+    @classmethod
+    def shared(cls) -> 'AudioCache':
+        """Get the process-wide cache shared by every session."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    @staticmethod
+    def make_key(text: str, language: str, **voice_settings) -> str:
+        """
+        Build a stable cache key.
+        
+        Args:
+            text: Spoken text
+            language: Language code
+            **voice_settings: Any other setting that changes the audio
+            
+        Returns:
+            Hex digest identifying the clip
+        """
+        payload = json.dumps([text, language, voice_settings], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def path_for(self, key: str, suffix: str = '.mp3') -> Path:
+        """Get the disk path of a clip."""
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+    
+    def get(self, key: str, suffix: str = '.mp3') -> Optional[bytes]:
+        """Get a clip, promoting disk hits to the hot tier."""
+        with self._lock:
+            data = self._hot.get(key)
+            if data is not None:
+                self._hot.move_to_end(key)
+                record_cache('audio', True)
+                return data
+        
+        path = self.path_for(key, suffix)
+        try:
+            data = path.read_bytes()
+            # Touch so eviction sees this clip as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            record_cache('audio', False)
+            return None
+        
+        record_cache('audio', True)
+        self._remember(key, data)
+        return data
+    
+    def put(self, key: str, data: bytes, suffix: str = '.mp3') -> Path:
+        """Store a clip in both tiers and return its disk path."""
+        path = self.path_for(key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        existed = path.exists()
+        tmp_path.replace(path)
+        
+        self._remember(key, data)
+        
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            elif not existed:
+                self._disk_bytes += len(data)
+            over_cap = self._disk_bytes > self.max_bytes
+        
+        if over_cap:
+            self._evict()
+        return path
+    
+    def _remember(self, key: str, data: bytes):
+        """Add a clip to the hot tier, evicting least recently used clips."""
+        if len(data) > self.hot_max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                return
+            self._hot[key] = data
+            self._hot_bytes += len(data)
+            while self._hot_bytes > self.hot_max_bytes:
+                _, evicted = self._hot.popitem(last=False)
+                self._hot_bytes -= len(evicted)
+    
+    def _scan_disk_bytes(self) -> int:
+        """Total size of clips on disk."""
+        return sum(p.stat().st_size for p in self.cache_dir.glob('*/*') if p.is_file())
+    
+    def _evict(self):
+        """Delete least recently used clips until the disk tier fits its cap."""
+        files = []
+        for p in self.cache_dir.glob('*/*'):
+            try:
+                stat = p.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, p))
+        files.sort()
+        
+        total = sum(size for _, size, _ in files)
+        # Evict down to 90% of the cap so puts do not trigger a scan each time
+        target = self.max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,133 @@
+"""Background warm-up of the retrieval caches from past questions."""
+
+import threading
+import time
+from typing import Dict, Optional
+from src.core.rate_limiter import get_rate_limiter
+from src.features.conversational_memory import ConversationalMemory
+
+
+class CacheWarmer:
+    """
+    Fill the query-embedding and retrieval-result caches after a restart.
+    
+    The most frequent Gita-mode questions in every user's memory log are
+    retrieved once in a background thread, at most ``max_per_second`` and
+    only while the embedding rate limiter has more than ``reserve`` of its
+    burst left, so live queries always come first.
+    """
+    
+    _instances: Dict[int, 'CacheWarmer'] = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, query_handler, settings: Optional[Dict] = None):
+        """
+        Initialize cache warmer.
+        
+        Args:
+            query_handler: Pipeline whose caches are warmed
+            settings: 'top_queries', 'min_count', 'max_per_second' and
+                'reserve' (from features.yaml)
+        """
+        settings = settings or {}
+        self.query_handler = query_handler
+        self.top_queries = int(settings.get('top_queries', 200))
+        self.min_count = int(settings.get('min_count', 2))
+        self.interval = 1.0 / float(settings.get('max_per_second', 2.0))
+        self.reserve = float(settings.get('reserve', 0.5))
+        
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._progress = {'status': 'idle', 'total': 0, 'done': 0, 'skipped': 0, 'failed': 0, 'seconds': 0.0}
+    
+    @classmethod
+    def for_handler(cls, query_handler, settings: Optional[Dict] = None) -> 'CacheWarmer':
+        """
+        Get the warmer of a pipeline, starting it on first use.
+        
+        Returns:
+            CacheWarmer shared by every session using this pipeline
+        """
+        with cls._instances_lock:
+            warmer = cls._instances.get(id(query_handler))
+            if warmer is None:
+                warmer = cls(query_handler, settings)
+                cls._instances[id(query_handler)] = warmer
+                warmer.start()
+            return warmer
+    
+    def start(self):
+        """Start warming in a daemon thread."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop warming after the current question."""
+        self._stop.set()
+    
+    def progress(self) -> Dict:
+        """Get warm-up progress: status ('idle', 'mining', 'warming', 'done'), counts and seconds."""
+        with self._lock:
+            return dict(self._progress)
+    
+    def _update(self, **changes):
+        with self._lock:
+            self._progress.update(changes)
+    
+    def _wait_for_headroom(self):
+        """Wait until live traffic leaves enough embedding quota."""
+        bucket = get_rate_limiter('embed')
+        while bucket is not None and not self._stop.is_set():
+            if bucket.available() >= bucket.capacity * self.reserve:
+                return
+            self._stop.wait(self.interval)
+    
+    def _run(self):
+        """Retrieve each frequent question once, throttled."""
+        start = time.perf_counter()
+        self._update(status='mining')
+        try:
+            # Retrieval depends only on the question text, so follow-ups warm too
+            frequent = ConversationalMemory.frequent_queries(
+                self.top_queries, min_count=self.min_count, skip_follow_ups=False
+            )
+        except Exception as e:
+            print(f"Cache warm-up skipped: {e}")
+            frequent = []
+        
+        # Only Gita mode retrieves, so only its questions benefit
+        queries = [query for query, search_mode, _ in frequent if search_mode == 'gita']
+        self._update(status='warming', total=len(queries))
+        context_engineer = self.query_handler.context_engineer
+        
+        for query in queries:
+            self._wait_for_headroom()
+            if self._stop.is_set():
+                break
+            
+            if (not context_engineer.is_spiritual_query(query)
+                    or context_engineer.detect_harmful_intent(query)['is_harmful']):
+                # Guardrails answer these without retrieval
+                with self._lock:
+                    self._progress['skipped'] += 1
+                    self._progress['done'] += 1
+                continue
+            
+            try:
+                verses = context_engineer.retrieve_context(query, top_k=context_engineer.PROMPT_VERSES)
+            except Exception as e:
+                print(f"Cache warm-up failed for '{query[:40]}': {e}")
+                verses = []
+            with self._lock:
+                self._progress['failed'] += 0 if verses else 1
+                self._progress['done'] += 1
+            self._stop.wait(self.interval)
+        
+        self._update(status='done', seconds=round(time.perf_counter() - start, 1))
+        progress = self.progress()
+        print(f"Cache warm-up: {progress['done'] - progress['skipped'] - progress['failed']} "
+              f"questions warmed in {progress['seconds']}s")
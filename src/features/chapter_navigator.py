@@ -3,6 +3,7 @@
 import streamlit as st
 from typing import Dict, List
 from src.core.data_processor import DataProcessor
+from src.features.theme_index import ThemeIndex
 
 
 class ChapterNavigator:
@@ -32,19 +33,28 @@ class ChapterNavigator:
     
     # Theme categories
     THEMES = {
-        "Karma Yoga": {"icon": "⚡", "chapters": [2, 3, 5, 18]},
-        "Dharma": {"icon": "⚖️", "chapters": [1, 2, 16]},
-        "Bhakti": {"icon": "❤️", "chapters": [7, 9, 12, 18]},
-        "Jnana": {"icon": "💡", "chapters": [2, 4, 7, 13, 15]},
-        "Detachment": {"icon": "🍃", "chapters": [2, 5, 6, 12]},
-        "Self-Realization": {"icon": "🧘", "chapters": [6, 13, 15]},
-        "Meditation": {"icon": "🧘‍♂️", "chapters": [6, 8, 12]},
-        "Universal Form": {"icon": "🌟", "chapters": [11]}
+        "Karma Yoga": {"icon": "⚡", "chapters": [2, 3, 5, 18],
+                       "seed_verses": ["2.47", "2.48", "3.8", "3.19", "3.27", "5.10"]},
+        "Dharma": {"icon": "⚖️", "chapters": [1, 2, 16],
+                   "seed_verses": ["2.31", "2.33", "3.35", "4.7", "4.8", "18.47"]},
+        "Bhakti": {"icon": "❤️", "chapters": [7, 9, 12, 18],
+                   "seed_verses": ["9.22", "9.26", "9.34", "12.8", "18.65", "18.66"]},
+        "Jnana": {"icon": "💡", "chapters": [2, 4, 7, 13, 15],
+                  "seed_verses": ["4.33", "4.37", "4.38", "7.2", "13.11"]},
+        "Detachment": {"icon": "🍃", "chapters": [2, 5, 6, 12],
+                       "seed_verses": ["2.56", "2.64", "2.71", "12.17", "12.18", "12.19"]},
+        "Self-Realization": {"icon": "🧘", "chapters": [6, 13, 15],
+                             "seed_verses": ["2.20", "6.5", "6.20", "6.29", "13.28", "15.7"]},
+        "Meditation": {"icon": "🧘‍♂️", "chapters": [6, 8, 12],
+                       "seed_verses": ["6.10", "6.11", "6.12", "6.13", "6.19", "8.12"]},
+        "Universal Form": {"icon": "🌟", "chapters": [11],
+                           "seed_verses": ["11.9", "11.12", "11.16", "11.32"]}
     }
     
     def __init__(self, data_processor: DataProcessor = None):
         """Initialize chapter navigator."""
         self.data_processor = data_processor
+        self.theme_index = ThemeIndex()
     
     def render_chapter_grid(self):
         """Render chapter grid view."""
@@ -83,6 +93,19 @@ class ChapterNavigator:
             for chapter_num in theme_info['chapters']:
                 chapter_info = self.CHAPTERS[chapter_num]
                 st.markdown(f"- {chapter_info['icon']} Chapter {chapter_num}: {chapter_info['name']}")
+            
+            # Show precomputed most relevant verses
+            ranked_verses = self.theme_index.get_theme_verses(selected_theme)
+            if ranked_verses:
+                st.markdown("**Most Relevant Verses:**")
+                for ref in ranked_verses:
+                    verse_text = ''
+                    if self.data_processor:
+                        verse_data = self.data_processor.get_verse(ref['chapter'], ref['verse'])
+                        verse_text = str(verse_data.get('english', '')).strip()[:150]
+                    st.markdown(f"- **BG {ref['verse_id']}** {verse_text}")
+            else:
+                st.caption("Verse rankings not built yet - run `python scripts/build_theme_index.py`")
     
     def render_verse_browser(self, chapter: int):
         """Render verse browser for a chapter."""
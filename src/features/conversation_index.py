@@ -0,0 +1,196 @@
+"""Semantic search over a user's past conversations."""
+
+import json
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+from filelock import FileLock
+from config.settings import CONVERSATION_RECALL_THRESHOLD
+from src.core.gemini_client import GeminiClient
+from src.features.conversational_memory import ConversationalMemory
+
+
+class ConversationIndex:
+    """
+    Embedding index over the questions stored in a ConversationalMemory.
+    
+    Each conversation is indexed by its question's query embedding, which
+    the RAG pipeline has usually just cached, so indexing costs no extra
+    API calls. Vectors are appended to a sidecar file next to the memory
+    log and loaded lazily on the first search; the sidecar is pruned when
+    the memory compacts.
+    """
+    
+    def __init__(self, memory: ConversationalMemory, gemini_client: GeminiClient = None):
+        """
+        Initialize conversation index.
+        
+        Args:
+            memory: Memory whose conversations are indexed
+            gemini_client: Client used for (cached) query embeddings
+        """
+        self.memory = memory
+        self.gemini_client = gemini_client or GeminiClient()
+        self.vectors_path = memory.storage_path.with_suffix('.vectors.jsonl')
+        self._file_lock = FileLock(str(self.vectors_path) + '.lock')
+        self._lock = threading.Lock()
+        
+        self._reset()
+        memory.add_compaction_listener(self.prune)
+    
+    def _reset(self):
+        """Forget the loaded vectors."""
+        self._ordinals: List[int] = []
+        self._rows: List[np.ndarray] = []
+        self._matrix = None
+        self._read_until = 0
+        self._inode = None
+    
+    def add(self, ordinal: int, query: str):
+        """
+        Index a stored conversation.
+        
+        Args:
+            ordinal: Ordinal returned by ConversationalMemory.add_conversation
+            query: The conversation's question
+        """
+        embedding = self.gemini_client.create_query_embedding(query)
+        if not embedding:
+            return
+        
+        line = json.dumps({'ordinal': ordinal, 'embedding': embedding}) + '\n'
+        with self._lock, self._file_lock:
+            self._load()
+            with open(self.vectors_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._read_until = self.vectors_path.stat().st_size
+            self._append_row(ordinal, embedding)
+    
+    def _append_row(self, ordinal: int, embedding: List[float]):
+        """Add a normalized vector to the in-memory index."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        self._ordinals.append(ordinal)
+        self._rows.append(vector / norm)
+        self._matrix = None
+    
+    def _load(self):
+        """Read vectors appended since the last load (call while locked)."""
+        if not self.vectors_path.exists():
+            return
+        
+        inode = self.vectors_path.stat().st_ino
+        if inode != self._inode:
+            # Rewritten by a prune, possibly in another process
+            self._reset()
+            self._inode = inode
+        
+        with open(self.vectors_path, 'rb') as f:
+            f.seek(self._read_until)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                record = json.loads(line)
+                self._append_row(record['ordinal'], record['embedding'])
+                self._read_until += len(line)
+    
+    def prune(self):
+        """Rewrite the sidecar without vectors of conversations the memory compacted away."""
+        first = self.memory.first_ordinal()
+        with self._lock, self._file_lock:
+            if not self.vectors_path.exists():
+                return
+            
+            kept = []
+            with open(self.vectors_path, 'rb') as f:
+                for line in f:
+                    if line.endswith(b'\n') and json.loads(line)['ordinal'] >= first:
+                        kept.append(line)
+            
+            tmp_path = self.vectors_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.writelines(kept)
+            tmp_path.replace(self.vectors_path)
+            
+            self._reset()
+            self._load()
+    
+    def search(self, query: str, top_k: int = 5) -> List[Dict]:
+        """
+        Find past conversations similar to a query.
+        
+        Args:
+            query: Search query
+            top_k: Number of conversations to return
+            
+        Returns:
+            Conversations with a 'score' (cosine similarity), best first
+        """
+        query_embedding = self.gemini_client.create_query_embedding(query)
+        if not query_embedding:
+            return []
+        
+        with self._lock, self._file_lock:
+            self._load()
+            if not self._rows:
+                return []
+            if self._matrix is None:
+                self._matrix = np.vstack(self._rows)
+            matrix = self._matrix
+            ordinals = list(self._ordinals)
+        
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        scores = matrix @ (query_vector / (np.linalg.norm(query_vector) or 1.0))
+        
+        results = []
+        for i in np.argsort(-scores):
+            conversation = self.memory.get_conversation(ordinals[i])
+            if conversation is None:
+                continue
+            results.append({**conversation, 'score': float(scores[i])})
+            if len(results) >= top_k:
+                break
+        
+        return results
+    
+    def find_answer(
+        self,
+        query: str,
+        tone: str,
+        language: str,
+        search_mode: str,
+        threshold: float = CONVERSATION_RECALL_THRESHOLD
+    ) -> Optional[str]:
+        """
+        Find a previous answer to (nearly) the same question.
+        
+        Only answers given at the start of a conversation qualify, since a
+        follow-up's answer depended on the turns before it, and answers
+        recorded as failed ('error' in their metadata) never do. Callers
+        should likewise only recall for the first question of a conversation.
+        
+        Args:
+            query: User query
+            tone: Response tone the answer must have been given in
+            language: Response language the answer must have been given in
+            search_mode: Search mode the answer must have been given in
+            threshold: Minimum cosine similarity between the questions
+            
+        Returns:
+            Previous response, or None if there is no close enough match
+        """
+        for conversation in self.search(query, top_k=3):
+            if conversation['score'] < threshold:
+                break
+            
+            metadata = conversation.get('metadata', {})
+            if (metadata.get('tone') == tone and
+                    metadata.get('language') == language and
+                    metadata.get('search_mode') == search_mode and
+                    not metadata.get('follow_up') and
+                    not metadata.get('error')):
+                return conversation['response']
+        
+        return None
@@ -1,39 +1,309 @@
 """Conversational memory for tracking user journey."""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+import hashlib
 import json
+import os
+import threading
+import uuid
+import weakref
 from pathlib import Path
+from filelock import FileLock
+from config.settings import DATA_DIR, DEFAULT_MEMORY_USER, MEMORY_DIR, MEMORY_FILE
+from src.core.normalize import normalize_query
 
 
 class ConversationalMemory:
-    """Track user's spiritual journey and conversation history."""
+    """
+    Track user's spiritual journey and conversation history.
     
-    def __init__(self, storage_path: str = "data/memory.json"):
-        """Initialize conversational memory."""
+    Memory is stored as an append-only JSON Lines log, one record per line.
+    Each write appends a single record, and loading only indexes record
+    offsets, so conversations are read from disk on demand. A background
+    compaction rewrites the log when it outgrows ``max_conversations``.
+    
+    Use ``for_user`` to get the shared, per-user sharded instance. Writes
+    hold a file lock, and each instance catches up with records appended
+    by other processes before reading or writing.
+    """
+    
+    # Live instances only: a memory is dropped once no session holds it
+    _instances: 'weakref.WeakValueDictionary[str, ConversationalMemory]' = weakref.WeakValueDictionary()
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, storage_path: str = "data/memory.jsonl", max_conversations: Optional[int] = None):
+        """
+        Initialize conversational memory.
+        
+        Args:
+            storage_path: Path to the JSON Lines log
+            max_conversations: Conversations kept on compaction (None keeps all)
+        """
         self.storage_path = Path(storage_path)
-        self.memory = self._load_memory()
-    
-    def _load_memory(self) -> Dict:
-        """Load memory from storage."""
-        if self.storage_path.exists():
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {
-            'conversations': [],
-            'themes_explored': [],
-            'favorite_verses': [],
-            'journey_milestones': []
-        }
+        self.max_conversations = max_conversations
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(str(self.storage_path) + '.lock')
+        self._loaded = False
+        self._compaction_thread = None
+        # Called after each compaction, held weakly (see add_compaction_listener)
+        self._compaction_listeners: List[weakref.WeakMethod] = []
+        self._reset_index()
+    
+    @classmethod
+    def for_user(cls, user_id: str, max_conversations: Optional[int] = None) -> 'ConversationalMemory':
+        """
+        Get the shared memory for a user, loading only that user's shard.
+        
+        Args:
+            user_id: User or session identifier
+            max_conversations: Conversations kept on compaction (None keeps all)
+            
+        Returns:
+            ConversationalMemory shared by every session of this user in the
+            process; callers keep a reference (e.g. in session state) for as
+            long as they use it
+        """
+        cls.migrate_legacy()
+        with cls._instances_lock:
+            memory = cls._instances.get(user_id)
+            if memory is None:
+                memory = cls(cls.shard_path(user_id), max_conversations=max_conversations)
+                cls._instances[user_id] = memory
+            return memory
+    
+    @staticmethod
+    def shard_path(user_id: str) -> Path:
+        """Get the log path for a user, spread across shard directories."""
+        digest = hashlib.sha1(user_id.encode('utf-8')).hexdigest()
+        return Path(MEMORY_DIR) / digest[:2] / f"{digest}.jsonl"
+    
+    @classmethod
+    def all_logs(cls) -> Iterator[Path]:
+        """Every per-user memory log, including the migrated legacy memory."""
+        cls.migrate_legacy()
+        for path in sorted(Path(MEMORY_DIR).glob('*/*.jsonl')):
+            # Skip sidecars such as ConversationIndex's <digest>.vectors.jsonl
+            if '.' not in path.stem:
+                yield path
+    
+    @classmethod
+    def migrate_legacy(cls) -> Optional[Path]:
+        """
+        Move single-user memory from before sharding into DEFAULT_MEMORY_USER's shard.
+        
+        Uses the unsharded log (data/memory.jsonl) if there is one, else
+        converts MEMORY_FILE (data/memory.json). Runs once: nothing happens
+        when the shard already exists. The legacy files are left in place.
+        
+        Returns:
+            Path of the shard written, or None if there was nothing to migrate
+        """
+        shard = cls.shard_path(DEFAULT_MEMORY_USER)
+        legacy_log = DATA_DIR / 'memory.jsonl'
+        legacy_file = Path(MEMORY_FILE)
+        if shard.exists() or not (legacy_log.exists() or legacy_file.exists()):
+            return None
+        
+        shard.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(shard) + '.lock'):
+            if shard.exists():
+                # Another process migrated first
+                return None
+            
+            if legacy_log.exists():
+                data = legacy_log.read_bytes()
+            else:
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                records = [{'type': 'conversation', 'data': c} for c in legacy.get('conversations', [])]
+                records += [{'type': 'theme', 'data': t} for t in legacy.get('themes_explored', [])]
+                records += [{'type': 'favorite', 'data': v} for v in legacy.get('favorite_verses', [])]
+                data = b''.join(cls._encode(record) for record in records)
+            
+            tmp_path = shard.with_suffix('.tmp')
+            tmp_path.write_bytes(data)
+            tmp_path.replace(shard)
+        
+        print(f"Migrated legacy memory to user '{DEFAULT_MEMORY_USER}' ({shard})")
+        return shard
+    
+    @classmethod
+    def frequent_queries(
+        cls,
+        top: int,
+        min_count: int = 1,
+        skip_follow_ups: bool = True
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Count questions across every user's log by normalized text.
+        
+        Args:
+            top: Number of questions returned
+            min_count: Times a question must have been asked
+            skip_follow_ups: Leave out questions recorded as follow-ups
+                (asked after earlier turns), whose answers depended on them
+                
+        Returns:
+            [(query, search mode, count)], most frequent first, using each
+            question's most common phrasing and search mode
+        """
+        counts = Counter()
+        phrasings = {}
+        modes = {}
+        for path in cls.all_logs():
+            memory = cls(path)
+            total = memory.get_journey_summary()['total_conversations']
+            for conversation in memory.get_recent_conversations(limit=total):
+                if skip_follow_ups and conversation.get('metadata', {}).get('follow_up'):
+                    # Asked after earlier turns, so its wording depends on them
+                    continue
+                key = normalize_query(conversation['query'])
+                counts[key] += 1
+                phrasings.setdefault(key, Counter())[conversation['query'].strip()] += 1
+                search_mode = conversation.get('metadata', {}).get('search_mode', 'gita')
+                modes.setdefault(key, Counter())[search_mode] += 1
+        
+        return [
+            (phrasings[key].most_common(1)[0][0], modes[key].most_common(1)[0][0], count)
+            for key, count in counts.most_common(top)
+            if count >= min_count
+        ]
+    
+    def _reset_index(self):
+        """Clear the in-memory index."""
+        # Offsets of records in the log, maintained incrementally
+        self._conversation_offsets: List[int] = []
+        self._favorite_offsets: List[int] = []
+        self._themes: List[str] = []
+        
+        # Counters for conversations dropped by compaction
+        self._archived_conversations = 0
+        self._journey_started = None
+        
+        # Size, first line and mtime of the log as of the last index update
+        self._end = 0
+        self._head = b''
+        self._mtime_ns = None
     
-    def _save_memory(self):
-        """Save memory to storage."""
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.storage_path, 'w', encoding='utf-8') as f:
-            json.dump(self.memory, f, indent=2, ensure_ascii=False)
+    @contextmanager
+    def _locked(self):
+        """Hold the thread lock and the file lock, with the index up to date."""
+        with self._lock, self._file_lock:
+            if not self._loaded:
+                self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+                self._loaded = True
+            self._sync()
+            yield
     
-    def add_conversation(self, query: str, response: str, metadata: Dict = None):
-        """Add a conversation to memory."""
+    def _sync(self):
+        """Index records appended by other writers since the last sync."""
+        if not self.storage_path.exists():
+            if self._end:
+                self._reset_index()
+            return
+        
+        stat = self.storage_path.stat()
+        if stat.st_size == self._end and stat.st_mtime_ns == self._mtime_ns:
+            return
+        
+        if self._head:
+            with open(self.storage_path, 'rb') as f:
+                head = f.readline()
+            if head != self._head or stat.st_size < self._end:
+                # Log was replaced by another writer's compaction
+                self._reset_index()
+        
+        self._index_log(self._end)
+    
+    def _index_log(self, start: int = 0):
+        """Scan the log from an offset, recording record offsets and counters."""
+        good_end = start
+        with open(self.storage_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Torn write from an interrupted append
+                    break
+                if offset == 0:
+                    self._head = line
+                self._index_record(line, offset)
+                offset += len(line)
+                good_end = offset
+        
+        if good_end < self.storage_path.stat().st_size:
+            with open(self.storage_path, 'r+b') as f:
+                f.truncate(good_end)
+        
+        self._end = good_end
+        self._mtime_ns = self.storage_path.stat().st_mtime_ns
+    
+    def _index_record(self, line: bytes, offset: int):
+        """Add one raw log line to the in-memory index."""
+        # Conversations dominate the log, so avoid parsing them while indexing
+        if line.startswith(b'{"type": "conversation"'):
+            self._conversation_offsets.append(offset)
+            if self._journey_started is None:
+                self._journey_started = json.loads(line)['data']['timestamp']
+            return
+        
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        
+        record_type = record.get('type')
+        if record_type == 'favorite':
+            self._favorite_offsets.append(offset)
+        elif record_type == 'theme':
+            if record['data'] not in self._themes:
+                self._themes.append(record['data'])
+        elif record_type == 'summary':
+            self._archived_conversations = record['data'].get('archived_conversations', 0)
+            self._journey_started = record['data'].get('journey_started')
+        elif record_type == 'conversation':
+            self._conversation_offsets.append(offset)
+    
+    @staticmethod
+    def _encode(record: Dict) -> bytes:
+        """Encode a record as one log line."""
+        return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+    
+    def _read_records(self, offsets: List[int]) -> List[Dict]:
+        """Read records at the given byte offsets."""
+        if not offsets:
+            return []
+        
+        records = []
+        with open(self.storage_path, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline())['data'])
+        return records
+    
+    def _append(self, record: Dict) -> int:
+        """Append a record to the log and return its offset (call while locked)."""
+        line = self._encode(record)
+        with open(self.storage_path, 'ab') as f:
+            offset = f.tell()
+            f.write(line)
+        
+        if offset == 0:
+            self._head = line
+        self._end = offset + len(line)
+        self._mtime_ns = self.storage_path.stat().st_mtime_ns
+        return offset
+    
+    def add_conversation(self, query: str, response: str, metadata: Dict = None) -> int:
+        """
+        Add a conversation to memory.
+        
+        Returns:
+            Ordinal of the conversation (stable across compaction)
+        """
         conversation = {
             'timestamp': datetime.now().isoformat(),
             'query': query,
@@ -41,14 +311,22 @@ class ConversationalMemory:
             'metadata': metadata or {}
         }
         
-        self.memory['conversations'].append(conversation)
-        self._save_memory()
+        with self._locked():
+            offset = self._append({'type': 'conversation', 'data': conversation})
+            self._conversation_offsets.append(offset)
+            if self._journey_started is None:
+                self._journey_started = conversation['timestamp']
+            ordinal = self._archived_conversations + len(self._conversation_offsets) - 1
+        
+        self._maybe_compact()
+        return ordinal
     
     def add_theme(self, theme: str):
         """Track explored themes."""
-        if theme not in self.memory['themes_explored']:
-            self.memory['themes_explored'].append(theme)
-            self._save_memory()
+        with self._locked():
+            if theme not in self._themes:
+                self._append({'type': 'theme', 'data': theme})
+                self._themes.append(theme)
     
     def add_favorite_verse(self, chapter: int, verse: int, text: str):
         """Add a favorite verse."""
@@ -59,26 +337,138 @@ class ConversationalMemory:
             'added_at': datetime.now().isoformat()
         }
         
-        self.memory['favorite_verses'].append(favorite)
-        self._save_memory()
+        with self._locked():
+            offset = self._append({'type': 'favorite', 'data': favorite})
+            self._favorite_offsets.append(offset)
     
     def get_recent_conversations(self, limit: int = 5) -> List[Dict]:
         """Get recent conversations."""
-        return self.memory['conversations'][-limit:]
+        with self._locked():
+            return self._read_records(self._conversation_offsets[-limit:] if limit > 0 else [])
+    
+    def first_ordinal(self) -> int:
+        """Ordinal of the oldest conversation still stored; older ones were compacted away."""
+        with self._locked():
+            return self._archived_conversations
+    
+    def add_compaction_listener(self, callback):
+        """
+        Call a bound method after every compaction, e.g. to drop data kept
+        for conversations that were removed.
+        
+        The method is held weakly, so listening does not keep its object alive.
+        """
+        with self._lock:
+            self._compaction_listeners = [ref for ref in self._compaction_listeners if ref() is not None]
+            self._compaction_listeners.append(weakref.WeakMethod(callback))
+    
+    def get_conversation(self, ordinal: int) -> Optional[Dict]:
+        """Get a conversation by ordinal, or None if it was compacted away."""
+        with self._locked():
+            position = ordinal - self._archived_conversations
+            if position < 0 or position >= len(self._conversation_offsets):
+                return None
+            return self._read_records([self._conversation_offsets[position]])[0]
     
     def get_themes_explored(self) -> List[str]:
         """Get all explored themes."""
-        return self.memory['themes_explored']
+        with self._locked():
+            return list(self._themes)
     
     def get_favorite_verses(self) -> List[Dict]:
         """Get favorite verses."""
-        return self.memory['favorite_verses']
+        with self._locked():
+            return self._read_records(self._favorite_offsets)
     
     def get_journey_summary(self) -> Dict:
         """Get summary of spiritual journey."""
-        return {
-            'total_conversations': len(self.memory['conversations']),
-            'themes_explored': len(self.memory['themes_explored']),
-            'favorite_verses': len(self.memory['favorite_verses']),
-            'journey_started': self.memory['conversations'][0]['timestamp'] if self.memory['conversations'] else None
-        }
+        with self._locked():
+            return {
+                'total_conversations': self._archived_conversations + len(self._conversation_offsets),
+                'themes_explored': len(self._themes),
+                'favorite_verses': len(self._favorite_offsets),
+                'journey_started': self._journey_started
+            }
+    
+    def _maybe_compact(self):
+        """Start background compaction once the log outgrows its limit."""
+        if self.max_conversations is None:
+            return
+        
+        # Let the log grow by half again before rewriting, to amortize the cost
+        if len(self._conversation_offsets) <= self.max_conversations * 1.5:
+            return
+        
+        with self._lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            
+            self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+            self._compaction_thread.start()
+    
+    def compact(self):
+        """
+        Rewrite the log keeping only the most recent conversations.
+        
+        Dropped conversations are folded into a summary record so journey
+        counters survive. Appends made while the rewrite runs are copied
+        over before the new log replaces the old one.
+        """
+        with self._locked():
+            if not self.storage_path.exists():
+                return
+            keep = self.max_conversations if self.max_conversations is not None else len(self._conversation_offsets)
+            dropped = max(len(self._conversation_offsets) - keep, 0)
+            kept_offsets = self._conversation_offsets[dropped:]
+            favorite_offsets = list(self._favorite_offsets)
+            themes = list(self._themes)
+            summary = {
+                'archived_conversations': self._archived_conversations + dropped,
+                'journey_started': self._journey_started,
+                'generation': uuid.uuid4().hex
+            }
+            snapshot_end = self._end
+            snapshot_head = self._head
+        
+        tmp_path = self.storage_path.with_suffix(f'.compacting-{os.getpid()}-{threading.get_ident()}')
+        new_favorites = []
+        new_conversations = []
+        
+        with open(self.storage_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            dst.write(self._encode({'type': 'summary', 'data': summary}))
+            for theme in themes:
+                dst.write(self._encode({'type': 'theme', 'data': theme}))
+            for offsets, new_offsets in ((favorite_offsets, new_favorites), (kept_offsets, new_conversations)):
+                for offset in offsets:
+                    src.seek(offset)
+                    new_offsets.append(dst.tell())
+                    dst.write(src.readline())
+        
+        with self._locked():
+            if self._head != snapshot_head or self._end < snapshot_end:
+                # Another writer compacted the log meanwhile
+                tmp_path.unlink()
+                return
+            
+            # Carry over records appended during the rewrite
+            with open(self.storage_path, 'rb') as src, open(tmp_path, 'ab') as dst:
+                src.seek(snapshot_end)
+                tail_start = dst.tell()
+                dst.write(src.read(self._end - snapshot_end))
+            
+            tmp_path.replace(self.storage_path)
+            
+            self._reset_index()
+            self._conversation_offsets = new_conversations
+            self._favorite_offsets = new_favorites
+            self._themes = themes
+            self._archived_conversations = summary['archived_conversations']
+            self._journey_started = summary['journey_started']
+            with open(self.storage_path, 'rb') as f:
+                self._head = f.readline()
+            self._index_log(tail_start)
+            listeners = [ref() for ref in self._compaction_listeners]
+        
+        for listener in listeners:
+            if listener is not None:
+                listener()
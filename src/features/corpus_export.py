@@ -0,0 +1,231 @@
+"""Bulk export of the Gita corpus as chapter and full-book documents."""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+from config.settings import CORPUS_EXPORT_DIR, CORPUS_EXPORT_WORKERS
+from src.core.data_processor import DataProcessor
+from src.core.telemetry import traced
+from src.features.chapter_navigator import ChapterNavigator
+from src.features.export_handler import ExportHandler, devanagari_font
+
+
+# Bump when the chapter layout changes, so cached chapters are rebuilt
+RENDER_VERSION = 2
+
+
+def chapter_lines(verses: List[Dict]) -> List[str]:
+    """
+    Lay out a chapter's verses as markdown lines.
+    
+    Args:
+        verses: Verse records from DataProcessor.get_chapter_verses
+        
+    Returns:
+        Markdown lines
+    """
+    lines = []
+    for verse in verses:
+        lines.append(f"### Verse {verse['chapter']}.{verse['verse']}")
+        for field in ('sanskrit', 'hindi', 'english'):
+            text = verse.get(field)
+            if isinstance(text, str) and text.strip():
+                lines.extend(part for part in text.split('\n') if part.strip())
+                lines.append('')
+    return lines
+
+
+def chapter_title(chapter: int) -> str:
+    """Title of a chapter, e.g. 'Chapter 2: Sankhya Yoga'."""
+    info = ChapterNavigator.CHAPTERS.get(chapter, {})
+    name = info.get('name')
+    return f"Chapter {chapter}: {name}" if name else f"Chapter {chapter}"
+
+
+def chapter_digest(chapter: int, verses: List[Dict], fmt: str) -> str:
+    """Content hash of a rendered chapter."""
+    # PDFs also depend on the Devanagari font found, so installing one rebuilds them
+    font = devanagari_font() if fmt == 'pdf' else None
+    payload = json.dumps(
+        [RENDER_VERSION, fmt, font, chapter, chapter_title(chapter), chapter_lines(verses)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def render_chapter(chapter: int, verses: List[Dict], fmt: str, path: str) -> str:
+    """
+    Render one chapter to a file. Runs in a worker process.
+    
+    Args:
+        chapter: Chapter number
+        verses: Verse records
+        fmt: 'pdf' or 'docx'
+        path: Output path
+        
+    Returns:
+        Output path
+    """
+    lines = chapter_lines(verses)
+    if fmt == 'pdf':
+        # ReportLab paragraphs are markup; escape the corpus text
+        lines = [escape(line) for line in lines]
+    else:
+        lines = [f"# {chapter_title(chapter)}", ''] + lines
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    ExportHandler(export_dir=str(Path(path).parent)).export_lines(
+        lines, tmp_path, fmt, title=escape(chapter_title(chapter))
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def merge_pdf(paths: List[str], output_path: str) -> str:
+    """
+    Concatenate chapter PDFs.
+    
+    Requires pypdf.
+    """
+    from pypdf import PdfWriter
+    
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+    writer.close()
+    return output_path
+
+
+def merge_docx(paths: List[str], output_path: str) -> str:
+    """Concatenate chapter DOCX files, each starting on a new page."""
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+    
+    book = Document(paths[0])
+    for path in paths[1:]:
+        book.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+        chapter = Document(path)
+        for element in chapter.element.body:
+            # Keep the book's own section properties
+            if element.tag.endswith('}sectPr'):
+                continue
+            book.element.body.append(deepcopy(element))
+    book.save(output_path)
+    return output_path
+
+
+class CorpusExporter:
+    """Build per-chapter and full-Gita books from the verse corpus."""
+    
+    def __init__(
+        self,
+        data_processor: Optional[DataProcessor] = None,
+        output_dir: str = CORPUS_EXPORT_DIR,
+        workers: int = CORPUS_EXPORT_WORKERS
+    ):
+        """
+        Initialize corpus exporter.
+        
+        Args:
+            data_processor: Corpus source (defaults to the CSV)
+            output_dir: Directory for books; chapters are cached under chapters/
+            workers: Worker processes rendering chapters
+        """
+        self.data_processor = data_processor or DataProcessor()
+        self.output_dir = Path(output_dir)
+        self.chapter_dir = self.output_dir / 'chapters'
+        self.workers = workers
+    
+    def _chapter_path(self, chapter: int, digest: str, fmt: str) -> Path:
+        """Cache path of a rendered chapter."""
+        return self.chapter_dir / f"chapter-{chapter:02d}-{digest[:12]}.{fmt}"
+    
+    @traced('export.corpus_chapters')
+    def build_chapters(self, fmt: str, chapters: Optional[List[int]] = None) -> Dict:
+        """
+        Render chapters in parallel, reusing cached chapters whose content is unchanged.
+        
+        Args:
+            fmt: 'pdf' or 'docx'
+            chapters: Chapter numbers (defaults to every chapter)
+            
+        Returns:
+            Dictionary with chapter 'paths' in order, 'rebuilt', 'cached',
+            'verses' and 'seconds'
+        """
+        if self.data_processor.df is None:
+            self.data_processor.load_csv()
+        if chapters is None:
+            chapters = sorted(int(c) for c in self.data_processor.df['chapter'].unique())
+        
+        self.chapter_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        
+        paths = {}
+        pending = {}
+        verse_count = 0
+        for chapter in chapters:
+            verses = self.data_processor.get_chapter_verses(chapter)
+            verse_count += len(verses)
+            path = self._chapter_path(chapter, chapter_digest(chapter, verses, fmt), fmt)
+            paths[chapter] = str(path)
+            if not path.exists():
+                pending[chapter] = verses
+        
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                futures = [
+                    pool.submit(render_chapter, chapter, verses, fmt, paths[chapter])
+                    for chapter, verses in pending.items()
+                ]
+                for future in futures:
+                    future.result()
+        
+        return {
+            'paths': [paths[c] for c in chapters],
+            'rebuilt': sorted(pending),
+            'cached': [c for c in chapters if c not in pending],
+            'verses': verse_count,
+            'seconds': time.perf_counter() - start
+        }
+    
+    @traced('export.corpus_book')
+    def build_book(self, fmt: str, chapters: Optional[List[int]] = None) -> Dict:
+        """
+        Build the chapters and merge them into one book.
+        
+        Args:
+            fmt: 'pdf' or 'docx'
+            chapters: Chapter numbers (defaults to the full Gita)
+            
+        Returns:
+            build_chapters result plus the merged 'book' path (None if the
+            merge was skipped) and total 'seconds'
+        """
+        start = time.perf_counter()
+        result = self.build_chapters(fmt, chapters)
+        
+        name = 'bhagavad_gita' if chapters is None else \
+            'bhagavad_gita_ch' + '-'.join(str(c) for c in chapters)
+        book_path = self.output_dir / f"{name}.{fmt}"
+        
+        try:
+            merge = merge_pdf if fmt == 'pdf' else merge_docx
+            tmp_path = f"{book_path}.{os.getpid()}.tmp"
+            merge(result['paths'], tmp_path)
+            os.replace(tmp_path, book_path)
+            result['book'] = str(book_path)
+        except ImportError as e:
+            print(f"Skipping merge, chapters are in {self.chapter_dir}: {e}")
+            result['book'] = None
+        
+        result['seconds'] = time.perf_counter() - start
+        return result
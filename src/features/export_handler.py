@@ -5,96 +5,196 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.colors import HexColor
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 import markdown
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+import hashlib
+import importlib.util
+import json
+import os
 import re
-from typing import List, Dict
+import shutil
+import tempfile
+import threading
+import weakref
+from typing import Dict, Iterable, Iterator, List, Optional
+from config.settings import DEVANAGARI_FONT_PATHS, SESSION_DIR, EXPORT_MAX_JOBS, EXPORT_MAX_WORKERS
+from src.core.telemetry import record_cache, span
 
 
-class ExportHandler:
-    """Handle PDF and DOCX export with proper formatting."""
+GOLDEN = HexColor('#FFD700')
+ORANGE = HexColor('#FFA500')
+SAFFRON = HexColor('#FF6600')
+DARK_GRAY = HexColor('#333333')
+
+PDF_TITLE = "Drishti AI - Divine Wisdom"
+
+EXPORT_FORMATS = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+
+# Sanskrit and Hindi script
+DEVANAGARI = re.compile('[\u0900-\u097F\uA8E0-\uA8FF]')
+
+
+@lru_cache(maxsize=1)
+def devanagari_font() -> Optional[str]:
+    """
+    Register the first available Devanagari font with ReportLab, once per process.
     
-    def __init__(self):
-        """Initialize export handler."""
-        self.golden = HexColor('#FFD700')
-        self.orange = HexColor('#FFA500')
-        self.saffron = HexColor('#FF6600')
-        self.dark_gray = HexColor('#333333')
+    Returns:
+        Registered font name, or None if no font in DEVANAGARI_FONT_PATHS exists
+    """
+    for path in DEVANAGARI_FONT_PATHS:
+        if path and Path(path).is_file():
+            pdfmetrics.registerFont(TTFont('Devanagari', path))
+            return 'Devanagari'
     
-    def export_to_pdf(self, content: str, filename: str) -> str:
-        """
-        Export content to PDF with formatting.
-        
-        Args:
-            content: Markdown content to export
-            filename: Output filename
-            
-        Returns:
-            Path to created PDF file
-        """
-        output_path = Path(filename)
-        
-        # Create PDF
-        doc = SimpleDocTemplate(
-            str(output_path),
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
+    print("No Devanagari font found (set DEVANAGARI_FONT_PATH); Sanskrit and Hindi will not render in PDFs")
+    return None
+
+
+@lru_cache(maxsize=1)
+def _pdf_styles() -> Dict[str, ParagraphStyle]:
+    """Build the PDF paragraph styles once per process."""
+    styles = getSampleStyleSheet()
+    
+    return {
+        'title': ParagraphStyle(
             'CustomTitle',
             parent=styles['Heading1'],
             fontSize=24,
-            textColor=self.golden,
+            textColor=GOLDEN,
             spaceAfter=30,
             alignment=1  # Center
-        )
-        
-        heading_style = ParagraphStyle(
+        ),
+        'heading': ParagraphStyle(
             'CustomHeading',
             parent=styles['Heading2'],
             fontSize=16,
-            textColor=self.golden,
+            textColor=GOLDEN,
             spaceAfter=12
-        )
-        
-        body_style = ParagraphStyle(
+        ),
+        'body': ParagraphStyle(
             'CustomBody',
             parent=styles['BodyText'],
             fontSize=12,
-            textColor=self.dark_gray,
+            textColor=DARK_GRAY,
             spaceAfter=12
-        )
-        
-        citation_style = ParagraphStyle(
+        ),
+        'citation': ParagraphStyle(
             'Citation',
             parent=styles['BodyText'],
             fontSize=11,
-            textColor=self.orange,
+            textColor=ORANGE,
             leftIndent=20,
             spaceAfter=12
+        ),
+        # Helvetica has no Devanagari glyphs; conjuncts need uharfbuzz shaping
+        'devanagari': ParagraphStyle(
+            'Devanagari',
+            parent=styles['BodyText'],
+            fontName=devanagari_font() or styles['BodyText'].fontName,
+            fontSize=12,
+            leading=18,
+            textColor=DARK_GRAY,
+            spaceAfter=12,
+            shaping=1 if importlib.util.find_spec('uharfbuzz') else 0
         )
+    }
+
+
+# Bounded pool shared by every session, so export clicks cannot pile up
+# document builds on the server
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide export pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXPORT_MAX_WORKERS, thread_name_prefix='drishti-export')
+        return _executor
+
+
+def message_lines(messages: Iterable[Dict]) -> Iterator[str]:
+    """
+    Yield the markdown lines of a conversation, one message at a time.
+    
+    Produces the same lines as joining every message into one string and
+    splitting it, without holding the whole conversation in memory.
+    
+    Args:
+        messages: Chat messages with 'role' and 'content'
+        
+    Yields:
+        Lines of markdown
+    """
+    for i, message in enumerate(messages):
+        if i:
+            yield ''
+        yield from f"**{message['role'].title()}:** {message['content']}".split('\n')
+
+
+class ExportHandler:
+    """Handle PDF and DOCX export with proper formatting."""
+    
+    FORMATS = EXPORT_FORMATS
+    
+    def __init__(self, export_dir: Optional[str] = None):
+        """
+        Initialize export handler.
+        
+        Args:
+            export_dir: Directory for finished exports (defaults to a new
+                per-session directory under SESSION_DIR, removed with the handler)
+        """
+        self.golden = GOLDEN
+        self.orange = ORANGE
+        self.saffron = SAFFRON
+        self.dark_gray = DARK_GRAY
+        
+        if export_dir is None:
+            Path(SESSION_DIR).mkdir(parents=True, exist_ok=True)
+            export_dir = tempfile.mkdtemp(prefix='export-', dir=SESSION_DIR)
+            weakref.finalize(self, shutil.rmtree, export_dir, True)
+        self.export_dir = Path(export_dir)
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Running or finished builds, by cache key, least recently used first
+        self._jobs: 'OrderedDict[str, Future]' = OrderedDict()
+        self._jobs_lock = threading.Lock()
+    
+    def _pdf_flowables(self, lines: Iterable[str], title: str = PDF_TITLE) -> List:
+        """Turn markdown lines into PDF flowables."""
+        styles = _pdf_styles()
+        title_style = styles['title']
+        heading_style = styles['heading']
+        body_style = styles['body']
+        citation_style = styles['citation']
+        devanagari_style = styles['devanagari']
         
         # Parse content
         story = []
         
         # Add header
-        story.append(Paragraph("Drishti AI - Divine Wisdom", title_style))
+        story.append(Paragraph(title, title_style))
         story.append(Spacer(1, 0.2 * inch))
         
         # Parse markdown
-        lines = content.split('\n')
         for line in lines:
             line = line.strip()
             
@@ -120,28 +220,35 @@ class ExportHandler:
             # Bullet points
             elif line.startswith('- ') or line.startswith('* '):
                 text = '• ' + line[2:]
-                story.append(Paragraph(text, body_style))
+                story.append(Paragraph(text, devanagari_style if DEVANAGARI.search(text) else body_style))
             
-            # Regular text
+            # Regular text (Sanskrit and Hindi verses need a Devanagari font)
             else:
-                story.append(Paragraph(line, body_style))
+                story.append(Paragraph(line, devanagari_style if DEVANAGARI.search(line) else body_style))
+        
+        return story
+    
+    def _build_pdf(self, lines: Iterable[str], filename: str, title: str = PDF_TITLE) -> str:
+        """Lay out markdown lines as a PDF."""
+        output_path = Path(filename)
+        
+        # Create PDF
+        doc = SimpleDocTemplate(
+            str(output_path),
+            pagesize=letter,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=72
+        )
         
         # Build PDF
-        doc.build(story)
+        doc.build(self._pdf_flowables(lines, title))
         
         return str(output_path)
     
-    def export_to_docx(self, content: str, filename: str) -> str:
-        """
-        Export content to DOCX with formatting.
-        
-        Args:
-            content: Markdown content to export
-            filename: Output filename
-            
-        Returns:
-            Path to created DOCX file
-        """
+    def _build_docx(self, lines: Iterable[str], filename: str) -> str:
+        """Lay out markdown lines as a DOCX document."""
         output_path = Path(filename)
         
         # Create document
@@ -154,8 +261,6 @@ class ExportHandler:
         header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         # Parse content
-        lines = content.split('\n')
-        
         for line in lines:
             line = line.strip()
             
@@ -199,3 +304,145 @@ class ExportHandler:
         doc.save(str(output_path))
         
         return str(output_path)
+    
+    def export_to_pdf(self, content: str, filename: str) -> str:
+        """
+        Export content to PDF with formatting.
+        
+        Args:
+            content: Markdown content to export
+            filename: Output filename
+            
+        Returns:
+            Path to created PDF file
+        """
+        return self._build_pdf(content.split('\n'), filename)
+    
+    def export_to_docx(self, content: str, filename: str) -> str:
+        """
+        Export content to DOCX with formatting.
+        
+        Args:
+            content: Markdown content to export
+            filename: Output filename
+            
+        Returns:
+            Path to created DOCX file
+        """
+        return self._build_docx(content.split('\n'), filename)
+    
+    def export_lines(self, lines: Iterable[str], filename: str, fmt: str, title: str = PDF_TITLE) -> str:
+        """
+        Export markdown lines, consumed one at a time.
+        
+        Args:
+            lines: Markdown lines
+            filename: Output filename
+            fmt: 'pdf' or 'docx'
+            title: Title at the top of a PDF
+            
+        Returns:
+            Path to created file
+        """
+        with span('export.render', format=fmt):
+            if fmt == 'pdf':
+                return self._build_pdf(lines, filename, title)
+            if fmt == 'docx':
+                return self._build_docx(lines, filename)
+            raise ValueError(f"Unknown export format: {fmt}")
+    
+    @staticmethod
+    def _content_key(messages) -> str:
+        """Digest of a conversation, reusing the store's running digest when it has one."""
+        digest = getattr(messages, 'digest', None)
+        if digest is not None:
+            return digest
+        
+        hasher = hashlib.sha256()
+        for message in messages:
+            hasher.update(json.dumps(message, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return hasher.hexdigest()
+    
+    def _export_path(self, key: str, fmt: str) -> Path:
+        """Path of a finished export."""
+        return self.export_dir / f"conversation-{key[:16]}.{fmt}"
+    
+    def _run_export(self, messages, count: int, fmt: str, path: Path) -> Path:
+        """Build an export in a worker thread."""
+        # Only the messages covered by the key, even if more arrived since
+        lines = message_lines(islice(messages, count))
+        
+        tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp.{fmt}")
+        self.export_lines(lines, str(tmp_path), fmt)
+        os.replace(tmp_path, path)
+        return path
+    
+    def submit(self, messages, fmt: str) -> str:
+        """
+        Start exporting a conversation in the background.
+        
+        Exports are cached by content, so exporting an unchanged
+        conversation again returns immediately.
+        
+        Args:
+            messages: Chat messages (list or MessageStore)
+            fmt: 'pdf' or 'docx'
+            
+        Returns:
+            Key to poll with get_export
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        
+        key = f"{self._content_key(messages)}.{fmt}"
+        path = self._export_path(key, fmt)
+        
+        with self._jobs_lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.done() and job.exception() is not None):
+                record_cache('export', True)
+                self._jobs.move_to_end(key)
+                return key
+            if path.exists():
+                job = Future()
+                job.set_result(path)
+            else:
+                job = _get_executor().submit(self._run_export, messages, len(messages), fmt, path)
+            record_cache('export', path.exists())
+            self._jobs[key] = job
+            self._jobs.move_to_end(key)
+            self._evict_finished(keep=key)
+        
+        return key
+    
+    def _evict_finished(self, keep: str):
+        """
+        Drop the oldest finished exports beyond EXPORT_MAX_JOBS, deleting
+        their files. Called with _jobs_lock held.
+        """
+        excess = len(self._jobs) - EXPORT_MAX_JOBS
+        for key in [key for key, job in self._jobs.items() if job.done() and key != keep][:max(excess, 0)]:
+            job = self._jobs.pop(key)
+            if job.exception() is None:
+                job.result().unlink(missing_ok=True)
+    
+    def get_export(self, key: str) -> Optional[Path]:
+        """
+        Get a finished export.
+        
+        Args:
+            key: Key returned by submit
+            
+        Returns:
+            Path to the file, or None while it is still being built
+            
+        Raises:
+            Exception: Whatever the build raised, if it failed
+        """
+        with self._jobs_lock:
+            job = self._jobs.get(key)
+        if job is None:
+            raise KeyError(key)
+        if not job.done():
+            return None
+        return job.result()
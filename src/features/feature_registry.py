@@ -1,13 +1,37 @@
 """Feature registry for managing optional features."""
 
+import importlib
+import threading
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 class FeatureRegistry:
     """Manage feature flags and availability."""
     
+    # Feature modules, imported only when an enabled feature is first used
+    FEATURE_MODULES = {
+        'voice': ('src.features.voice_handler', 'VoiceHandler'),
+        'export': ('src.features.export_handler', 'ExportHandler'),
+        'chapter_navigator': ('src.features.chapter_navigator', 'ChapterNavigator'),
+        'conversational_memory': ('src.features.conversational_memory', 'ConversationalMemory'),
+        'conversation_index': ('src.features.conversation_index', 'ConversationIndex'),
+        'profiling': ('src.features.request_profiler', 'RequestProfiler'),
+        'cache_warming': ('src.features.cache_warmer', 'CacheWarmer')
+    }
+    
+    # Gate for modules that belong to another feature
+    FEATURE_GATES = {
+        'conversation_index': 'conversational_memory'
+    }
+    
+    # Shared by every session: module imports are process-wide
+    _loaded: Dict[str, Any] = {}
+    _import_times: Dict[str, float] = {}
+    _load_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize feature registry."""
         self.config_path = Path(__file__).parent.parent.parent / "config" / "features.yaml"
@@ -30,3 +54,33 @@ class FeatureRegistry:
     def get_config(self, feature_name: str) -> Dict[str, Any]:
         """Get feature configuration."""
         return self.features.get(feature_name, {})
+    
+    def load(self, feature_name: str) -> Optional[Any]:
+        """
+        Import a feature's class on first use.
+        
+        Args:
+            feature_name: Key of FEATURE_MODULES
+            
+        Returns:
+            The feature class, or None if the feature is disabled
+        """
+        if not self.is_enabled(self.FEATURE_GATES.get(feature_name, feature_name)):
+            return None
+        
+        with self._load_lock:
+            if feature_name not in self._loaded:
+                module_name, class_name = self.FEATURE_MODULES[feature_name]
+                start = time.perf_counter()
+                module = importlib.import_module(module_name)
+                elapsed = time.perf_counter() - start
+                
+                self._loaded[feature_name] = getattr(module, class_name)
+                self._import_times[feature_name] = elapsed
+                print(f"Loaded feature '{feature_name}' in {elapsed * 1000:.0f} ms")
+            return self._loaded[feature_name]
+    
+    def import_profile(self) -> Dict[str, float]:
+        """Seconds spent importing each loaded feature (including its dependencies)."""
+        with self._load_lock:
+            return dict(self._import_times)
@@ -0,0 +1,171 @@
+"""Bounded per-session chat message store with disk spill."""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import weakref
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+from config.settings import SESSION_DIR, SESSION_MESSAGES_IN_MEMORY
+
+
+def _remove_segment(path: str):
+    """Delete a spill segment once its store is gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class MessageStore:
+    """
+    List-like store of chat messages for one browser session.
+    
+    The newest ``max_in_memory`` messages stay in memory. Older ones are
+    compressed and appended to an on-disk segment, which is read back
+    only when the full history is needed (export, 'show earlier'). The
+    segment is deleted when the store is garbage collected with its
+    session.
+    """
+    
+    # Frame header: compressed record length
+    HEADER = struct.Struct('<I')
+    
+    def __init__(self, max_in_memory: int = SESSION_MESSAGES_IN_MEMORY, spill_dir: str = SESSION_DIR):
+        """
+        Initialize message store.
+        
+        Args:
+            max_in_memory: Messages kept in memory
+            spill_dir: Directory for spill segments
+        """
+        self.max_in_memory = max(max_in_memory, 1)
+        self.spill_dir = Path(spill_dir)
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self._digest = hashlib.sha256()
+        
+        # Spilled messages: segment path and frame offsets, created on first spill
+        self._segment_path = None
+        self._offsets: List[int] = []
+        self._segment_size = 0
+    
+    def _open_segment(self):
+        """Create this store's spill segment."""
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix='messages-', suffix='.seg', dir=self.spill_dir)
+        os.close(fd)
+        self._segment_path = path
+        weakref.finalize(self, _remove_segment, path)
+    
+    def _spill(self, messages: List[Dict]):
+        """Append messages to the spill segment."""
+        if self._segment_path is None:
+            self._open_segment()
+        
+        frames = []
+        for message in messages:
+            data = zlib.compress(json.dumps(message, ensure_ascii=False).encode('utf-8'))
+            self._offsets.append(self._segment_size + sum(len(f) for f in frames))
+            frames.append(self.HEADER.pack(len(data)) + data)
+        
+        with open(self._segment_path, 'ab') as f:
+            for frame in frames:
+                f.write(frame)
+        self._segment_size += sum(len(f) for f in frames)
+    
+    def _read_spilled(self, start: int, stop: int) -> List[Dict]:
+        """Read spilled messages [start, stop) in one sequential pass."""
+        if start >= stop:
+            return []
+        
+        messages = []
+        with open(self._segment_path, 'rb') as f:
+            f.seek(self._offsets[start])
+            for _ in range(stop - start):
+                (length,) = self.HEADER.unpack(f.read(self.HEADER.size))
+                messages.append(json.loads(zlib.decompress(f.read(length)).decode('utf-8')))
+        return messages
+    
+    def append(self, message: Dict):
+        """Add a message, spilling the oldest in-memory messages if over the cap."""
+        with self._lock:
+            self._recent.append(message)
+            self._digest.update(json.dumps(message, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            if len(self._recent) > self.max_in_memory:
+                # Spill in batches of half the window to keep writes infrequent
+                count = len(self._recent) - self.max_in_memory // 2
+                self._spill([self._recent.popleft() for _ in range(count)])
+    
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._recent)
+    
+    def __bool__(self) -> bool:
+        return len(self) > 0
+    
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over every message, oldest first."""
+        with self._lock:
+            spilled = len(self._offsets)
+            recent = list(self._recent)
+        
+        # Stream spilled messages in batches rather than loading them all
+        batch = max(self.max_in_memory, 1)
+        for start in range(0, spilled, batch):
+            yield from self._read_spilled(start, min(start + batch, spilled))
+        yield from recent
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        """Get a message by position, or a list of messages by slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self[start:stop][::step] if step > 0 else [self[i] for i in range(start, stop, step)]
+            return self._slice(start, stop)
+        
+        with self._lock:
+            total = len(self)
+            spilled = len(self._offsets)
+            if index < 0:
+                index += total
+            if not 0 <= index < total:
+                raise IndexError("message index out of range")
+            if index >= spilled:
+                return self._recent[index - spilled]
+            return self._read_spilled(index, index + 1)[0]
+    
+    def _slice(self, start: int, stop: int) -> List[Dict]:
+        """Get messages [start, stop), reading the segment only if needed."""
+        with self._lock:
+            if stop <= start:
+                return []
+            spilled = len(self._offsets)
+            messages = self._read_spilled(min(start, spilled), min(stop, spilled))
+            recent = list(self._recent)
+            messages.extend(recent[max(start - spilled, 0):max(stop - spilled, 0)])
+            return messages
+    
+    @property
+    def digest(self) -> str:
+        """Digest of every message appended so far, updated incrementally."""
+        with self._lock:
+            return self._digest.hexdigest()
+    
+    def tail(self, n: int) -> List[Dict]:
+        """Get the last n messages."""
+        return self[-n:] if n > 0 else []
+    
+    def clear(self):
+        """Remove every message."""
+        with self._lock:
+            self._recent.clear()
+            self._digest = hashlib.sha256()
+            self._offsets = []
+            self._segment_size = 0
+            if self._segment_path is not None:
+                open(self._segment_path, 'wb').close()
@@ -0,0 +1,163 @@
+"""Sampling profiler for individual pipeline requests."""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+from config.settings import PROFILES_DIR
+
+
+def collapse_stack(frame) -> str:
+    """Render a frame and its callers as a folded stack (outermost first)."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = Path(code.co_filename).stem
+        names.append(f"{module}.{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Sample one thread's stack from a background thread.
+    
+    The profiled thread runs untouched (no tracing hooks); every
+    ``interval`` seconds the sampler reads its current frame and counts
+    the folded stack.
+    """
+    
+    def __init__(self, thread_id: int, interval: float):
+        """
+        Initialize sampler.
+        
+        Args:
+            thread_id: threading.get_ident() of the thread to sample
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+    
+    def _run(self):
+        """Sample until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+            del frame
+    
+    def start(self):
+        """Start sampling."""
+        self._thread.start()
+    
+    def stop(self) -> Counter:
+        """Stop sampling and return {folded stack: samples}."""
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+class RequestProfiler:
+    """
+    Profile a sampled fraction of pipeline requests.
+    
+    Each profiled request is written as a ``.folded`` file of collapsed
+    stacks (``frame;frame;frame count`` per line), ready for flamegraph.pl,
+    speedscope or inferno. Only the newest ``max_files`` are kept.
+    """
+    
+    def __init__(self, settings: Optional[Dict] = None):
+        """
+        Initialize profiler.
+        
+        Args:
+            settings: 'sample_rate' (fraction of requests), 'interval_ms',
+                'output_dir' and 'max_files' (from features.yaml)
+        """
+        settings = settings or {}
+        self.sample_rate = float(settings.get('sample_rate', 0.05))
+        self.interval = float(settings.get('interval_ms', 5)) / 1000
+        self.output_dir = Path(settings.get('output_dir') or PROFILES_DIR)
+        self.max_files = int(settings.get('max_files', 200))
+        self._rotate_lock = threading.Lock()
+    
+    @contextmanager
+    def profile(self, label: str):
+        """
+        Profile the current thread for the duration of a block, if sampled.
+        
+        Args:
+            label: Request name used in the file name
+        """
+        if random.random() >= self.sample_rate:
+            yield
+            return
+        
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            stacks = sampler.stop()
+            self._write(label, stacks, time.perf_counter() - start)
+    
+    def _write(self, label: str, stacks: Counter, seconds: float):
+        """Write one request's stacks and drop the oldest files."""
+        if not stacks:
+            return
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{seconds * 1000:.0f}ms-{label}-{threading.get_ident()}.folded"
+        path = self.output_dir / name
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp_path, path)
+        
+        with self._rotate_lock:
+            profiles = sorted(self.output_dir.glob('*.folded'), key=lambda p: p.stat().st_mtime)
+            for old in profiles[:max(len(profiles) - self.max_files, 0)]:
+                old.unlink(missing_ok=True)
+    
+    def install(self, query_handler) -> 'RequestProfiler':
+        """
+        Profile a QueryHandler's process_query calls.
+        
+        The method is wrapped on this instance only, so a handler without a
+        profiler runs exactly as before. Installing twice keeps the first.
+        
+        Returns:
+            The profiler in effect for the handler
+        """
+        existing = getattr(query_handler, 'request_profiler', None)
+        if existing is not None:
+            return existing
+        
+        process_query = query_handler.process_query
+        profiler = self
+        
+        def profiled_stream(chunks):
+            # Sample while the consumer pulls chunks, on the consumer's thread
+            with profiler.profile('process_query_stream'):
+                yield from chunks
+        
+        def profiled_process_query(*args, stream: bool = False, **kwargs):
+            if stream:
+                return profiled_stream(process_query(*args, stream=True, **kwargs))
+            with profiler.profile('process_query'):
+                return process_query(*args, **kwargs)
+        
+        query_handler.process_query = profiled_process_query
+        query_handler.request_profiler = self
+        print(f"Profiling {self.sample_rate:.0%} of queries to {self.output_dir}")
+        return self
@@ -0,0 +1,143 @@
+"""Precomputed theme-to-verse index for the Themes view."""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from config.settings import THEME_INDEX_PATH, THEME_INDEX_TOP_N
+
+
+class ThemeIndex:
+    """Rank every verse against each theme using stored embeddings."""
+    
+    def __init__(self, index_path: str = THEME_INDEX_PATH):
+        """
+        Initialize theme index.
+        
+        Args:
+            index_path: Path of the persisted index (defaults to next to the vector store)
+        """
+        self.index_path = Path(index_path)
+        self._index = None
+        self._mtime_ns = None
+        self._lock = threading.Lock()
+    
+    def build(self, embedding_manager, themes: Dict, top_n: int = THEME_INDEX_TOP_N) -> Dict:
+        """
+        Score all verses against each theme centroid.
+        
+        The centroid of a theme is the mean embedding of its seed verses,
+        falling back to every verse of its chapters. Embeddings are centered
+        on the corpus mean first so that generic similarity shared by all
+        verses does not dominate the ranking. No generation calls are made.
+        
+        Args:
+            embedding_manager: EmbeddingManager or InMemoryEmbeddingManager
+            themes: Theme definitions (see ChapterNavigator.THEMES)
+            top_n: Number of verses kept per theme
+            
+        Returns:
+            Index dictionary
+        """
+        stored = embedding_manager.get_all_embeddings()
+        ids = list(stored['ids'])
+        if not ids:
+            raise ValueError("No stored embeddings found - run setup.py first")
+        
+        vectors = np.asarray(stored['embeddings'], dtype=np.float32)
+        vectors = vectors - vectors.mean(axis=0)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        
+        metadatas = stored['metadatas']
+        position = {verse_id: i for i, verse_id in enumerate(ids)}
+        
+        index = {
+            'built_at': datetime.now().isoformat(),
+            'verse_count': len(ids),
+            'themes': {}
+        }
+        
+        for theme, info in themes.items():
+            rows = [position[v] for v in info.get('seed_verses', []) if v in position]
+            if not rows:
+                chapters = set(info.get('chapters', []))
+                rows = [i for i, m in enumerate(metadatas) if m.get('chapter') in chapters]
+            if not rows:
+                continue
+            
+            centroid = vectors[rows].mean(axis=0)
+            centroid_norm = np.linalg.norm(centroid)
+            if centroid_norm == 0:
+                continue
+            scores = vectors @ (centroid / centroid_norm)
+            
+            ranked = []
+            for i in np.argsort(-scores)[:top_n]:
+                metadata = metadatas[i]
+                ranked.append({
+                    'verse_id': ids[i],
+                    'chapter': int(metadata.get('chapter', 0)),
+                    'verse': int(metadata.get('verse', 0)),
+                    'score': round(float(scores[i]), 4)
+                })
+            
+            index['themes'][theme] = ranked
+        
+        self._index = index
+        return index
+    
+    def save(self, index: Dict = None) -> str:
+        """
+        Persist index to disk.
+        
+        Args:
+            index: Index to save (defaults to the last built index)
+            
+        Returns:
+            Path to saved index
+        """
+        index = index if index is not None else self._index
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write atomically so the app never reads a half-written index
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        tmp_path.replace(self.index_path)
+        
+        return str(self.index_path)
+    
+    def load(self) -> Optional[Dict]:
+        """Load index from disk, reloading it when the file was rebuilt."""
+        try:
+            mtime_ns = self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            # Nothing on disk: keep an index built in this process, if any
+            return self._index
+        
+        with self._lock:
+            if mtime_ns != self._mtime_ns:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+                self._mtime_ns = mtime_ns
+            return self._index
+    
+    def get_theme_verses(self, theme: str, limit: int = 10) -> List[Dict]:
+        """
+        Get the most relevant verses for a theme.
+        
+        Args:
+            theme: Theme name
+            limit: Maximum number of verses
+            
+        Returns:
+            Ranked list of verse references with scores
+        """
+        index = self.load()
+        if not index:
+            return []
+        return index['themes'].get(theme, [])[:limit]
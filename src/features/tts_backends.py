@@ -0,0 +1,83 @@
+"""Text-to-speech backends for VoiceHandler."""
+
+import time
+from io import BytesIO
+from gtts import gTTS
+
+
+class GTTSBackend:
+    """Google Translate text-to-speech (requires network access)."""
+    
+    name = 'gtts'
+    mime = 'audio/mp3'
+    
+    def synthesize(self, text: str, lang_code: str, slow: bool = False) -> bytes:
+        """
+        Synthesize speech.
+        
+        Args:
+            text: Text to speak
+            lang_code: gTTS language code
+            slow: Use slow speech
+            
+        Returns:
+            MP3 audio bytes
+        """
+        buffer = BytesIO()
+        gTTS(text=text, lang=lang_code, slow=slow).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class LocalTTSBackend:
+    """
+    Offline stand-in that produces silent MP3 audio.
+    
+    Output is deterministic, lasts roughly as long as the text would take
+    to read, and concatenates like real MP3 chunks, so tests and benchmarks
+    can exercise the voice pipeline without network access.
+    """
+    
+    name = 'local'
+    mime = 'audio/mp3'
+    
+    # One silent MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, mono, 26 ms
+    SILENT_FRAME = b'\xff\xfb\x90\xc4' + b'\x00' * 413
+    FRAMES_PER_WORD = 12
+    
+    def __init__(self, latency: float = 0.0):
+        """
+        Initialize local backend.
+        
+        Args:
+            latency: Simulated seconds of synthesis time per call
+        """
+        self.latency = latency
+    
+    def synthesize(self, text: str, lang_code: str, slow: bool = False) -> bytes:
+        """Synthesize silent speech for text."""
+        if self.latency:
+            time.sleep(self.latency)
+        
+        frames = max(len(text.split()), 1) * self.FRAMES_PER_WORD
+        if slow:
+            frames *= 2
+        return self.SILENT_FRAME * frames
+
+
+def get_tts_backend(name: str):
+    """
+    Get a TTS backend by name.
+    
+    Args:
+        name: 'gtts' or 'local'
+        
+    Returns:
+        Backend instance
+    """
+    backends = {
+        'gtts': GTTSBackend,
+        'local': LocalTTSBackend
+    }
+    if name not in backends:
+        raise ValueError(f"Unknown TTS backend: {name}")
+    return backends[name]()
@@ -1,18 +1,58 @@
 """Voice input and output using Web Speech API."""
 
 import streamlit as st
-from gtts import gTTS
-import tempfile
-from pathlib import Path
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List
+from config.settings import TTS_BACKEND, TTS_MAX_WORKERS, TTS_CHUNK_CHARS
+from src.features.audio_cache import AudioCache
+from src.features.tts_backends import get_tts_backend
+
+
+# Bounded pool shared by every session, so concurrent answers cannot
+# flood the TTS service
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide synthesis pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TTS_MAX_WORKERS, thread_name_prefix='drishti-tts')
+        return _executor
 
 
 class VoiceHandler:
     """Handle voice input and output."""
     
-    def __init__(self):
-        """Initialize voice handler."""
-        self.temp_dir = Path(tempfile.gettempdir()) / "drishti_audio"
-        self.temp_dir.mkdir(exist_ok=True)
+    # Map language codes
+    LANG_MAP = {
+        'english': 'en',
+        'hindi': 'hi',
+        'sanskrit': 'hi'  # Use Hindi for Sanskrit
+    }
+    
+    # Sentence ends, including the Devanagari danda and double danda
+    SENTENCE_END = re.compile(r'(?<=[.!?।॥])\s+|\n{2,}')
+    
+    def __init__(self, slow: bool = False, backend=None):
+        """
+        Initialize voice handler.
+        
+        Args:
+            slow: Use slow speech
+            backend: TTS backend (defaults to TTS_BACKEND from settings)
+        """
+        self.slow = slow
+        self.backend = backend or get_tts_backend(TTS_BACKEND)
+        self.audio_cache = AudioCache.shared()
+        
+        # Synthesis started ahead of rendering, by full-clip cache key
+        self._jobs: Dict[str, List[Future]] = {}
+        self._jobs_lock = threading.Lock()
     
     def render_voice_input(self) -> str:
         """Render voice input component."""
@@ -24,6 +64,152 @@ class VoiceHandler:
         
         return ""
     
+    def _cache_key(self, text: str, lang_code: str) -> str:
+        """Cache key covering everything that changes the audio."""
+        return AudioCache.make_key(text, lang_code, engine=self.backend.name, slow=self.slow)
+    
+    def split_text(self, text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
+        """
+        Split text into chunks at sentence boundaries.
+        
+        The first chunk is a single sentence so it is ready quickly; later
+        sentences are grouped up to ``max_chars``.
+        
+        Args:
+            text: Text to split
+            max_chars: Target maximum chunk length
+            
+        Returns:
+            List of chunks
+        """
+        sentences = [s.strip() for s in self.SENTENCE_END.split(text) if s and s.strip()]
+        if not sentences:
+            return []
+        
+        chunks = [sentences[0]]
+        current = ''
+        for sentence in sentences[1:]:
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            chunks.append(current)
+        
+        return chunks
+    
+    def _synthesize_chunk(self, chunk: str, lang_code: str) -> bytes:
+        """Synthesize one chunk, using the cache."""
+        key = self._cache_key(chunk, lang_code)
+        audio_bytes = self.audio_cache.get(key)
+        if audio_bytes is None:
+            audio_bytes = self.backend.synthesize(chunk, lang_code, slow=self.slow)
+            if audio_bytes:
+                self.audio_cache.put(key, audio_bytes)
+        return audio_bytes
+    
+    def _start_job(self, text: str, lang_code: str) -> List[Future]:
+        """Submit every chunk of text to the synthesis pool."""
+        executor = _get_executor()
+        return [
+            executor.submit(self._synthesize_chunk, chunk, lang_code)
+            for chunk in self.split_text(text)
+        ]
+    
+    def prefetch(self, text: str, language: str = 'en'):
+        """
+        Start synthesizing text in the background.
+        
+        Call as soon as the response text is available; a later
+        render_audio_player for the same text picks up the running job
+        instead of starting from scratch.
+        
+        Args:
+            text: Text to convert
+            language: Language name (english, hindi, sanskrit)
+        """
+        lang_code = self.LANG_MAP.get(language, 'en')
+        full_key = self._cache_key(text, lang_code)
+        
+        with self._jobs_lock:
+            if full_key in self._jobs:
+                return
+        
+        if self.audio_cache.get(full_key) is not None:
+            return
+        
+        futures = self._start_job(text, lang_code)
+        with self._jobs_lock:
+            self._jobs[full_key] = futures
+    
+    def cancel_pending(self):
+        """Cancel prefetched synthesis nobody is waiting for (e.g. after navigating away)."""
+        with self._jobs_lock:
+            jobs, self._jobs = self._jobs, {}
+        
+        for futures in jobs.values():
+            for future in futures:
+                future.cancel()
+    
+    def synthesize_chunks(self, text: str, language: str = 'en') -> Iterator[bytes]:
+        """
+        Synthesize text chunk by chunk, in parallel.
+        
+        Chunks are yielded in order, each as soon as it and the chunks
+        before it are ready. The whole clip is cached once complete.
+        
+        Args:
+            text: Text to convert
+            language: Language name (english, hindi, sanskrit)
+            
+        Yields:
+            MP3 audio bytes per chunk
+        """
+        lang_code = self.LANG_MAP.get(language, 'en')
+        full_key = self._cache_key(text, lang_code)
+        
+        audio_bytes = self.audio_cache.get(full_key)
+        if audio_bytes is not None:
+            yield audio_bytes
+            return
+        
+        with self._jobs_lock:
+            futures = self._jobs.pop(full_key, None)
+        if futures is None:
+            futures = self._start_job(text, lang_code)
+        if not futures:
+            # Nothing to speak; an empty clip must not be cached as a hit
+            return
+        
+        parts = []
+        try:
+            for future in futures:
+                part = future.result()
+                parts.append(part)
+                yield part
+        finally:
+            # Drop queued chunks if the caller stops early
+            for future in futures:
+                future.cancel()
+        
+        audio_bytes = b''.join(parts)
+        if audio_bytes:
+            self.audio_cache.put(full_key, audio_bytes)
+    
+    def synthesize(self, text: str, language: str = 'en') -> bytes:
+        """
+        Get speech audio for text, synthesizing only on a cache miss.
+        
+        Args:
+            text: Text to convert
+            language: Language name (english, hindi, sanskrit)
+            
+        Returns:
+            MP3 audio bytes
+        """
+        return b''.join(self.synthesize_chunks(text, language))
+    
     def text_to_speech(self, text: str, language: str = 'en') -> str:
         """
         Convert text to speech.
@@ -35,33 +221,33 @@ class VoiceHandler:
         Returns:
             Path to audio file
         """
-        # Map language codes
-        lang_map = {
-            'english': 'en',
-            'hindi': 'hi',
-            'sanskrit': 'hi'  # Use Hindi for Sanskrit
-        }
-        
-        lang_code = lang_map.get(language, 'en')
-        
-        # Generate speech
-        tts = gTTS(text=text, lang=lang_code, slow=False)
-        
-        # Save to temp file
-        audio_file = self.temp_dir / f"response_{hash(text)}.mp3"
-        tts.save(str(audio_file))
+        audio_bytes = self.synthesize(text, language)
+        lang_code = self.LANG_MAP.get(language, 'en')
+        key = self._cache_key(text, lang_code)
         
-        return str(audio_file)
+        # A hot-tier hit may have no file left on disk; write it back
+        path = self.audio_cache.path_for(key)
+        if not path.exists():
+            path = self.audio_cache.put(key, audio_bytes)
+        return str(path)
     
     def render_audio_player(self, text: str, language: str = 'en'):
-        """Render audio player for text."""
+        """
+        Render audio player for text.
+        
+        The opening sentence becomes playable as soon as it is synthesized;
+        the rest of the answer follows in a second player once ready.
+        """
         try:
-            audio_file = self.text_to_speech(text, language)
-            
-            with open(audio_file, 'rb') as f:
-                audio_bytes = f.read()
+            chunks = self.synthesize_chunks(text, language)
+            first = next(chunks, None)
+            if first is None:
+                return
+            st.audio(first, format=self.backend.mime)
             
-            st.audio(audio_bytes, format='audio/mp3')
+            rest = b''.join(chunks)
+            if rest:
+                st.audio(rest, format=self.backend.mime)
         
         except Exception as e:
             st.error(f"Audio generation failed: {e}")
@@ -0,0 +1,141 @@
+"""Background image pipeline: compact variants served as static files."""
+
+import base64
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+from config.settings import ASSETS_DIR, STATIC_DIR, BACKGROUND_IMAGE, BACKGROUND_WIDTHS
+
+
+STATIC_URL = "app/static"
+
+# (format, file suffix, MIME type, save options), best compression first
+VARIANT_FORMATS = [
+    ('AVIF', '.avif', 'image/avif', {'quality': 55}),
+    ('WEBP', '.webp', 'image/webp', {'quality': 72, 'method': 6}),
+]
+
+
+def build_background_variants(
+    source: Path,
+    out_dir: Path,
+    widths: Tuple[int, ...] = BACKGROUND_WIDTHS
+) -> Dict[int, List[Tuple[str, str]]]:
+    """
+    Resize and re-encode a background once per width and format.
+    
+    Variant names include a digest of the source, so existing files are
+    reused across restarts and a changed source gets new URLs.
+    
+    Args:
+        source: Source image
+        out_dir: Output directory (under STATIC_DIR)
+        widths: Target widths, capped at the source width
+        
+    Returns:
+        Mapping of width to (file name, MIME type) pairs, best format first
+    """
+    from PIL import Image, features
+    
+    digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    variants = {}
+    with Image.open(source) as image:
+        image = image.convert('RGB')
+        for width in sorted(set(min(w, image.width) for w in widths)):
+            resized = None
+            variants[width] = []
+            for fmt, suffix, mime, options in VARIANT_FORMATS:
+                if not features.check(fmt.lower()):
+                    continue
+                name = f"{source.stem}-{digest}-{width}{suffix}"
+                path = out_dir / name
+                if not path.exists():
+                    if resized is None:
+                        height = round(image.height * width / image.width)
+                        resized = image.resize((width, height), Image.LANCZOS)
+                    tmp_path = path.with_name(f"{name}.tmp")
+                    resized.save(tmp_path, format=fmt, **options)
+                    tmp_path.replace(path)
+                variants[width].append((name, mime))
+    
+    return variants
+
+
+def _background_css(image_css: List[str], media: str = '') -> str:
+    """
+    CSS rule for the app background with the divine gradient overlay.
+    
+    One declaration is emitted per image value; browsers keep the last one
+    they understand, so plain fallbacks go first.
+    """
+    declarations = "".join(f"""
+            background: linear-gradient(
+                135deg,
+                rgba(13, 27, 42, 0.85) 0%,
+                rgba(27, 38, 59, 0.82) 50%,
+                rgba(65, 90, 119, 0.80) 100%
+            ),
+            {image} !important;""" for image in image_css)
+    rule = f"""
+        .stApp {{{declarations}
+            background-size: cover !important;
+            background-position: center !important;
+            background-attachment: fixed !important;
+            background-repeat: no-repeat !important;
+        }}
+        """
+    return f"@media {media} {{{rule}}}" if media else rule
+
+
+def _static_background_css(variants: Dict[int, List[Tuple[str, str]]]) -> str:
+    """Responsive background CSS pointing at the static variants."""
+    rules = []
+    widths = sorted(variants)
+    for i, width in enumerate(widths):
+        urls = [(f'url("{STATIC_URL}/backgrounds/{name}")', mime) for name, mime in variants[width]]
+        image_set = ", ".join(f'{url} type("{mime}")' for url, mime in urls)
+        # Last format is the most widely supported one
+        image_css = [urls[-1][0], f"image-set({image_set})"]
+        if i == 0:
+            rules.append(_background_css(image_css))
+        else:
+            # Larger screens swap in the next size up
+            rules.append(_background_css(image_css, f"(min-width: {widths[i - 1] + 1}px)"))
+    return "\n".join(rules)
+
+
+def _inline_background_css(source: Path) -> str:
+    """Fallback: embed the original image when static files cannot be written."""
+    encoded = base64.b64encode(source.read_bytes()).decode()
+    return _background_css([f"url('data:image/png;base64,{encoded}')"])
+
+
+@lru_cache(maxsize=1)
+def get_page_css() -> str:
+    """
+    Build the page CSS once per process.
+    
+    Returns:
+        <style> block with the app styles and background rules
+    """
+    css_file = ASSETS_DIR / "styles.css"
+    bg_image = ASSETS_DIR / "backgrounds" / BACKGROUND_IMAGE
+    
+    parts = []
+    if css_file.exists():
+        parts.append(css_file.read_text(encoding='utf-8'))
+    
+    if bg_image.exists():
+        try:
+            variants = build_background_variants(bg_image, Path(STATIC_DIR) / "backgrounds")
+            if not any(variants.values()):
+                raise RuntimeError("no WebP/AVIF encoder available")
+            parts.append(_static_background_css(variants))
+        except Exception as e:
+            print(f"Note: serving inline background - {e}")
+            parts.append(_inline_background_css(bg_image))
+    
+    return f"<style>{''.join(parts)}</style>"
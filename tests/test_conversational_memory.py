@@ -0,0 +1,72 @@
+"""Tests for migrating single-user memory into the per-user shards."""
+
+import json
+
+import pytest
+
+from src.features import conversational_memory
+from src.features.conversational_memory import ConversationalMemory
+
+
+@pytest.fixture
+def memory_paths(tmp_path, monkeypatch):
+    """Point the memory module at an empty data directory."""
+    monkeypatch.setattr(conversational_memory, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(conversational_memory, 'MEMORY_DIR', str(tmp_path / 'memory'))
+    monkeypatch.setattr(conversational_memory, 'MEMORY_FILE', str(tmp_path / 'memory.json'))
+    monkeypatch.setattr(conversational_memory, 'DEFAULT_MEMORY_USER', 'default')
+    return tmp_path
+
+
+def write_legacy_json(path, queries):
+    legacy = {
+        'conversations': [
+            {'timestamp': f'2025-01-0{i + 1}T10:00:00', 'query': query, 'response': 'answer', 'metadata': {}}
+            for i, query in enumerate(queries)
+        ],
+        'themes_explored': ['Dharma'],
+        'favorite_verses': [],
+        'journey_milestones': []
+    }
+    path.write_text(json.dumps(legacy), encoding='utf-8')
+
+
+def test_legacy_json_migrates_into_default_user(memory_paths):
+    write_legacy_json(memory_paths / 'memory.json', ['What is dharma?', 'What is karma?'])
+    
+    memory = ConversationalMemory.for_user('default')
+    
+    summary = memory.get_journey_summary()
+    assert summary['total_conversations'] == 2
+    assert summary['themes_explored'] == 1
+    assert [c['query'] for c in memory.get_recent_conversations(5)] == ['What is dharma?', 'What is karma?']
+    assert list(ConversationalMemory.all_logs()) == [ConversationalMemory.shard_path('default')]
+
+
+def test_migration_runs_once(memory_paths):
+    write_legacy_json(memory_paths / 'memory.json', ['What is dharma?'])
+    assert ConversationalMemory.migrate_legacy() == ConversationalMemory.shard_path('default')
+    
+    memory = ConversationalMemory(ConversationalMemory.shard_path('default'))
+    memory.add_conversation('Tell me about devotion', 'answer')
+    
+    # A later run must not overwrite conversations added since
+    assert ConversationalMemory.migrate_legacy() is None
+    assert memory.get_journey_summary()['total_conversations'] == 2
+
+
+def test_unsharded_log_is_preferred(memory_paths):
+    write_legacy_json(memory_paths / 'memory.json', ['Old question'])
+    log = ConversationalMemory(memory_paths / 'memory.jsonl')
+    log.add_conversation('Old question', 'answer')
+    log.add_conversation('Newer question', 'answer')
+    
+    ConversationalMemory.migrate_legacy()
+    
+    memory = ConversationalMemory(ConversationalMemory.shard_path('default'))
+    assert [c['query'] for c in memory.get_recent_conversations(5)] == ['Old question', 'Newer question']
+
+
+def test_nothing_to_migrate(memory_paths):
+    assert ConversationalMemory.migrate_legacy() is None
+    assert list(ConversationalMemory.all_logs()) == []